@@ -23,14 +23,9 @@ try:
 except DistributionNotFound:
     # package is not installed
     pass
+import importlib
 import sys
-
-import matplotlib
-from matplotlib import pyplot as plt
-# Guard against iopub rate limiting warnings (https://github.com/DiODeProject/MuMoT/issues/359)
-from notebook.notebookapp import NotebookApp
-NotebookApp.iopub_msg_rate_limit = 10000.0
-from sympy.parsing.latex import parse_latex
+import types
 
 # Import the functions and classes we wish to export i.e. the public API
 from .models import (
@@ -40,29 +35,6 @@ from .models import (
 from .utils import (
     about,
 )
-from .views import (
-    MuMoTSSAView,
-    MuMoTbifurcationView,
-    MuMoTfieldView,
-    MuMoTintegrateView,
-    MuMoTmultiView,
-    MuMoTmultiagentView,
-    MuMoTnoiseCorrelationsView,
-    MuMoTstochasticSimulationView,
-    MuMoTstreamView,
-    MuMoTtimeEvolutionView,
-    MuMoTvectorView,
-    MuMoTview,
-)
-from .controllers import (
-    MuMoTbifurcationController,
-    MuMoTcontroller,
-    MuMoTfieldController,
-    MuMoTmultiController,
-    MuMoTmultiagentController,
-    MuMoTstochasticSimulationController,
-    MuMoTtimeEvolutionController,
-)
 from .consts import (
     NetworkType,
     MAX_RANDOM_SEED,
@@ -74,9 +46,62 @@ from .exceptions import (
     MuMoTWarning,
 )
 
+# Views, controllers and plotting are imported on first access only, so that
+# headless use (e.g. parseModel and simulation engines) does not pay for
+# matplotlib, ipywidgets and PyDSTool at import time
+_LAZY_ATTRIBUTES = {
+    'MuMoTSSAView': '.views',
+    'MuMoTbifurcationView': '.views',
+    'MuMoTfieldView': '.views',
+    'MuMoTintegrateView': '.views',
+    'MuMoTmultiView': '.views',
+    'MuMoTmultiagentView': '.views',
+    'MuMoTnoiseCorrelationsView': '.views',
+    'MuMoTstochasticSimulationView': '.views',
+    'MuMoTstreamView': '.views',
+    'MuMoTtimeEvolutionView': '.views',
+    'MuMoTvectorView': '.views',
+    'MuMoTview': '.views',
+    'MuMoTbifurcationController': '.controllers',
+    'MuMoTcontroller': '.controllers',
+    'MuMoTfieldController': '.controllers',
+    'MuMoTmultiController': '.controllers',
+    'MuMoTmultiagentController': '.controllers',
+    'MuMoTstochasticSimulationController': '.controllers',
+    'MuMoTtimeEvolutionController': '.controllers',
+    'parse_latex': 'sympy.parsing.latex',
+    'matplotlib': None,
+    'plt': None,
+}
+
+
+class _LazyPackage(types.ModuleType):
+    """Package module resolving the names in ``_LAZY_ATTRIBUTES`` on first access."""
+
+    def __getattr__(self, name):
+        if name not in _LAZY_ATTRIBUTES:
+            raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}")
+        if name == 'matplotlib':
+            value = importlib.import_module('matplotlib')
+        elif name == 'plt':
+            value = importlib.import_module('matplotlib.pyplot')
+        else:
+            value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], self.__name__), name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(_LAZY_ATTRIBUTES))
+
+
+sys.modules[__name__].__class__ = _LazyPackage
+
 try:
     # Try to get the currently-running IPython instance
     ipython = get_ipython()
+    # Guard against iopub rate limiting warnings (https://github.com/DiODeProject/MuMoT/issues/359)
+    from notebook.notebookapp import NotebookApp
+    NotebookApp.iopub_msg_rate_limit = 10000.0
     ipython.magic('alias_magic model latex')
     ipython.magic('matplotlib nbagg')
 
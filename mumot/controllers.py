@@ -301,13 +301,14 @@ class MuMoTcontroller:
 
         return Javascript(js_download)
 
-    def _create_download_link(self, text: str, title: str = "Download file",
-                              filename: str = "file.txt") -> str:
-        """Create a download link."""
-        b64 = base64.b64encode(text.encode())
-        payload = b64.decode()
-        html = '<a download="{filename}" href="data:text/text;base64,{payload}" target="_blank">{title}</a>'
-        html = html.format(payload=payload, title=title, filename=filename)
+    def _create_download_link(self, data, title: str = "Download file",
+                              filename: str = "file.txt", mimeType: str = "text/text") -> str:
+        """Create a download link embedding ``data`` (text or bytes)."""
+        if isinstance(data, str):
+            data = data.encode()
+        payload = base64.b64encode(data).decode()
+        html = '<a download="{filename}" href="data:{mimeType};base64,{payload}" target="_blank">{title}</a>'
+        html = html.format(payload=payload, title=title, filename=filename, mimeType=mimeType)
         return html
 
     def _reveal_download_link(self, _includeParams) -> None:
@@ -552,6 +553,11 @@ class MuMoTstochasticSimulationController(MuMoTcontroller):
         self._downloadWidget.on_click(self._download_link_unsupported, remove=True)
         self._downloadWidget.on_click(self._reveal_download_link)
 
+    def _reveal_download_link(self, _includeParams) -> None:
+        """Create the download link of the latest results and make it visible."""
+        self._view._updateDownloadLink()
+        super()._reveal_download_link(_includeParams)
+
     def _createAdvancedWidgets(self, SSParams, continuousReplot=False):
         initialState = SSParams['initialState'][0]
         if not SSParams['initialState'][-1]:
@@ -603,6 +609,32 @@ class MuMoTstochasticSimulationController(MuMoTcontroller):
             )
             self._widgetsExtraParams['randomSeed'] = widget
 
+        # Dropdown for the simulation algorithm (only available in SSA)
+        if SSParams.get('method') is not None and not SSParams['method'][-1]:
+            widget = widgets.Dropdown(
+                options=[('Direct method', 'direct'), ('Next reaction method', 'next-reaction'), ('Tau-leaping', 'tau-leap')],
+                description='Algorithm:',
+                value=SSParams['method'][0],
+                style={'description_width': 'initial'},
+                disabled=False
+            )
+            widget.observe(self._updateMethodWidgets, 'value')
+            self._widgetsExtraParams['method'] = widget
+
+        # Tau-leaping error-control parameter slider
+        if SSParams.get('epsilon') is not None and not SSParams['epsilon'][-1]:
+            epsilon = SSParams['epsilon']
+            widget = widgets.FloatSlider(value=epsilon[0], min=epsilon[1],
+                                         max=epsilon[2], step=epsilon[3],
+                                         readout_format='.' + str(utils._count_sig_decimals(str(epsilon[3]))) + 'f',
+                                         description='Tau-leaping tolerance (epsilon):',
+                                         style={'description_width': 'initial'},
+                                         disabled=False,
+                                         continuous_update=continuousReplot)
+            if SSParams['method'][0] != 'tau-leap':
+                widget.layout.display = 'none'
+            self._widgetsExtraParams['epsilon'] = widget
+
         try:
             # Toggle buttons for plotting style
             if not SSParams['visualisationType'][-1]:
@@ -684,6 +716,17 @@ class MuMoTstochasticSimulationController(MuMoTcontroller):
                                        continuous_update=continuousReplot)
             self._widgetsExtraParams['runs'] = widget
 
+        # Number of parallel worker processes slider
+        if not SSParams['nWorkers'][-1]:
+            nWorkers = SSParams['nWorkers']
+            widget = widgets.IntSlider(value=nWorkers[0], min=nWorkers[1],
+                                       max=nWorkers[2], step=nWorkers[3],
+                                       description='Parallel workers:',
+                                       style={'description_width': 'initial'},
+                                       disabled=False,
+                                       continuous_update=continuousReplot)
+            self._widgetsExtraParams['nWorkers'] = widget
+
         # Checkbox for realtime plot update
         if not SSParams['aggregateResults'][-1]:
             widget = widgets.Checkbox(
@@ -700,18 +743,25 @@ class MuMoTstochasticSimulationController(MuMoTcontroller):
     def _addSpecificWidgets(self, SSParams, continuousReplot):
         pass
 
+    def _updateMethodWidgets(self, change=None) -> None:
+        if self._widgetsExtraParams.get('epsilon'):
+            self._widgetsExtraParams['epsilon'].layout.display = 'flex' if change['new'] == 'tau-leap' else 'none'
+
     def _orderAdvancedWidgets(self, initialState):
         # define the widget order
         for state in sorted(initialState.keys(), key=str):
             self._extraWidgetsOrder.append(f"init{state}")
         self._extraWidgetsOrder.append('maxTime')
         self._extraWidgetsOrder.append('randomSeed')
+        self._extraWidgetsOrder.append('method')
+        self._extraWidgetsOrder.append('epsilon')
         self._extraWidgetsOrder.append('visualisationType')
         self._extraWidgetsOrder.append('final_x')
         self._extraWidgetsOrder.append('final_y')
         self._extraWidgetsOrder.append('plotProportions')
         self._extraWidgetsOrder.append('realtimePlot')
         self._extraWidgetsOrder.append('runs')
+        self._extraWidgetsOrder.append('nWorkers')
         self._extraWidgetsOrder.append('aggregateResults')
 
 
@@ -780,6 +830,15 @@ class MuMoTmultiagentController(MuMoTstochasticSimulationController):
                                          disabled=False)
             self._widgetsExtraParams['motionCorrelatedness'] = widget
 
+        # Arena boundaries checkbox
+        if not MAParams['boundedArena'][-1]:
+            widget = widgets.Checkbox(
+                value=MAParams['boundedArena'][0],
+                description='Bounded arena (no periodic boundaries)',
+                disabled=False
+            )
+            self._widgetsExtraParams['boundedArena'] = widget
+
         # Time scaling slider
         if not MAParams['timestepSize'][-1]:
             timestepSize = MAParams['timestepSize']
@@ -833,6 +892,7 @@ class MuMoTmultiagentController(MuMoTstochasticSimulationController):
         self._extraWidgetsOrder.append('netParam')
         self._extraWidgetsOrder.append('particleSpeed')
         self._extraWidgetsOrder.append('motionCorrelatedness')
+        self._extraWidgetsOrder.append('boundedArena')
         self._extraWidgetsOrder.append('randomSeed')
         self._extraWidgetsOrder.append('visualisationType')
         self._extraWidgetsOrder.append('final_x')
@@ -842,6 +902,7 @@ class MuMoTmultiagentController(MuMoTstochasticSimulationController):
         self._extraWidgetsOrder.append('plotProportions')
         self._extraWidgetsOrder.append('realtimePlot')
         self._extraWidgetsOrder.append('runs')
+        self._extraWidgetsOrder.append('nWorkers')
         self._extraWidgetsOrder.append('aggregateResults')
 
     def _update_net_params(self, _=None):
@@ -1,4 +1,5 @@
-from typing import Tuple
+import os
+from typing import Optional, Tuple
 
 
 class MuMoTdefault:
@@ -65,3 +66,48 @@ class MuMoTdefault:
         MuMoTdefault._plotLimits = initPlotLimits
         MuMoTdefault._plotLimitsLimits = limits
         MuMoTdefault._plotLimitsStep = step
+
+    # generator of the connected Erdos-Renyi networks of multiagent views:
+    # 'fast' (geometric-skip sampling) or 'networkx' (equivalence mode: the same
+    # networks as networkx.erdos_renyi_graph, and as previous versions, for a given random seed)
+    _erdosRenyiGenerator = 'fast'
+
+    @staticmethod
+    def setNetworkDefaults(erdosRenyiGenerator: str = _erdosRenyiGenerator) -> None:
+        MuMoTdefault._erdosRenyiGenerator = erdosRenyiGenerator
+
+    # number of records (time points) in each chunk of the time evolution of stochastic simulations
+    _recordingChunkSize = 8192
+
+    @staticmethod
+    def setRecordingDefaults(chunkSize: int = _recordingChunkSize) -> None:
+        MuMoTdefault._recordingChunkSize = chunkSize
+
+    # maximum number of realtime-plot frames (and progress-bar updates) per second of stochastic simulations (None for no limit)
+    _realtimeMaxFPS = 10
+
+    @staticmethod
+    def setRealtimeDefaults(maxFPS: Optional[float] = _realtimeMaxFPS) -> None:
+        MuMoTdefault._realtimeMaxFPS = maxFPS
+
+    # directory for the persistent cache of derived symbolic results (None, the default unless MUMOT_CACHE_DIR is set, disables caching)
+    _cacheDir = os.environ.get('MUMOT_CACHE_DIR')
+    # size cap of the cache in bytes; least recently used entries are evicted beyond it
+    _cacheMaxBytes = 100 * 1024 ** 2
+
+    @staticmethod
+    def setCacheDefaults(cacheDir: Optional[str] = _cacheDir,
+                         maxBytes: int = _cacheMaxBytes) -> None:
+        MuMoTdefault._cacheDir = cacheDir
+        MuMoTdefault._cacheMaxBytes = maxBytes
+
+    # number of recent parameter combinations whose fixed points (and noise correlation ODE systems) are kept by each view
+    _fixedPointCacheSize = 32
+    # seconds allowed for solving fixed points in closed form before falling back to the numeric solver (None for no limit)
+    _parametricSolveTimeout = 10
+
+    @staticmethod
+    def setFixedPointDefaults(cacheSize: int = _fixedPointCacheSize,
+                              parametricSolveTimeout: Optional[float] = _parametricSolveTimeout) -> None:
+        MuMoTdefault._fixedPointCacheSize = cacheSize
+        MuMoTdefault._parametricSolveTimeout = parametricSolveTimeout
@@ -1,18 +1,20 @@
 """MuMoT model classes."""
 
 import copy
+import itertools
 import sympy
 import os
 import re
 import tempfile
 
 from graphviz import Digraph
-from IPython.display import display, Math
 import numpy as np
+from scipy.integrate import odeint
 from sympy import (
     collect,
     default_sort_key,
     Derivative,
+    factorial,
     lambdify,
     latex,
     linsolve,
@@ -28,14 +30,18 @@ from sympy.parsing.latex import parse_latex
 from warnings import warn
 
 from . import (
-    controllers,
     defaults,
     consts,
     exceptions,
     utils,
-    views,
 )
 
+# views and controllers pull in plotting, widget and bifurcation libraries; load them on first use
+controllers = utils._LazyModule(__package__ + '.controllers')
+views = utils._LazyModule(__package__ + '.views')
+# IPython is only needed for rendering LaTeX in notebooks
+ipythonDisplay = utils._LazyModule('IPython.display')
+
 
 class MuMoTmodel:
     """Model class."""
@@ -67,6 +73,10 @@ class MuMoTmodel:
     _funcs = None
     # tuple of argument symbols for lambdified functions
     _args = None
+    # dictionary (tuple of state variables as key) of compiled ODE right-hand sides and Jacobians used for numerical integration
+    _odeFuncs = None
+    # dictionary (tuple of state variables as key) of compiled equations and Jacobians vectorised over many points, used for fixed points and their stability
+    _jacobianFuncs = None
     # graphviz visualisation of model
     _dot = None
     # image format used for rendering edge labels for model visualisation
@@ -78,6 +88,18 @@ class MuMoTmodel:
     # list of temporary files created
     _tmpfiles = None
 
+    def __getstate__(self):
+        """Return the state used to pickle the model (e.g. to run simulations in worker processes).
+
+        Lambdified functions cannot be pickled and are regenerated on demand.
+
+        """
+        state = self.__dict__.copy()
+        state['_funcs'] = None
+        state['_odeFuncs'] = None
+        state['_jacobianFuncs'] = None
+        return state
+
     def substitute(self, subsString: str):
         """Create a new model with variable substitutions.
 
@@ -287,7 +309,7 @@ class MuMoTmodel:
             for reactant in self._constantReactants:
                 out = self._ratesLaTeX[repr(reactant)]
                 out = utils._doubleUnderscorify(utils._greekPrependify(out))
-                display(Math(out))
+                ipythonDisplay.display(ipythonDisplay.Math(out))
 
     def showReactants(self):
         """Show a sorted LaTeX representation of the model's reactants.
@@ -307,7 +329,7 @@ class MuMoTmodel:
             self._reactantsLaTeX.sort()
         for reactant in self._reactantsLaTeX:
             out = utils._doubleUnderscorify(utils._greekPrependify(reactant))
-            display(Math(out))
+            ipythonDisplay.display(ipythonDisplay.Math(out))
 
     def showRates(self):
         """Show a sorted LaTeX representation of the model's rate parameters.
@@ -322,7 +344,7 @@ class MuMoTmodel:
         for reaction in self._stoichiometry:
             out = latex(self._stoichiometry[reaction]['rate']) + r"\; (" + latex(reaction) + ")"
             out = utils._doubleUnderscorify(utils._greekPrependify(out))
-            display(Math(out))
+            ipythonDisplay.display(ipythonDisplay.Math(out))
 
     def showSingleAgentRules(self):
         """Show the probabilistic transitions of the agents in each possible reactant-state.
@@ -369,6 +391,14 @@ class MuMoTmodel:
         :class:`dict`
             Dictionary of ODE right hand sides with reactant (left hand side) as key
 
+        Notes
+        -----
+        Derived results (here the van Kampen ODEs) can be cached on disk so
+        that they are not derived again in later sessions.  The cache is
+        disabled by default: enable it by setting the ``MUMOT_CACHE_DIR``
+        environment variable to a directory before importing MuMoT, or with
+        ``mumot.defaults.MuMoTdefault.setCacheDefaults(cacheDir)``.
+
         """
         if method == 'massAction':
             return self._equations
@@ -397,13 +427,13 @@ class MuMoTmodel:
             for reactant in self._reactants:
                 out = "\\displaystyle \\frac{\\textrm{d}" + latex(reactant) + "}{\\textrm{d}t} := " + latex(self._equations[reactant])
                 out = utils._doubleUnderscorify(utils._greekPrependify(out))
-                display(Math(out))
+                ipythonDisplay.display(ipythonDisplay.Math(out))
         elif method == 'vanKampen':
             ODEdict = _getODEs_vKE(_get_orderedLists_vKE, self._stoichiometry)
             for ode in ODEdict:
                 out = latex(ode) + " := " + latex(ODEdict[ode])
                 out = utils._doubleUnderscorify(utils._greekPrependify(out))
-                display(Math(out))
+                ipythonDisplay.display(ipythonDisplay.Math(out))
         else:
             print("Invalid input for method. Choose either method = 'massAction' or method = 'vanKampen'. Default is 'massAction'.")
 
@@ -434,7 +464,7 @@ class MuMoTmodel:
         """
         out = latex(self._stoichiometry)
         out = utils._doubleUnderscorify(utils._greekPrependify(out))
-        display(Math(out))
+        ipythonDisplay.display(ipythonDisplay.Math(out))
 
     def getMasterEquation(self):
         """Gets Master Equation expressed with step operators, and substitutions.
@@ -445,6 +475,14 @@ class MuMoTmodel:
             Dictionary showing all terms of the right hand side of the Master Equation
             Dictionary of substitutions used, this defaults to `None` if no substitutions were made
 
+        Notes
+        -----
+        The Master Equation can be cached on disk so that it is not derived
+        again in later sessions.  The cache is disabled by default: enable it
+        by setting the ``MUMOT_CACHE_DIR`` environment variable to a directory
+        before importing MuMoT, or with
+        ``mumot.defaults.MuMoTdefault.setCacheDefaults(cacheDir)``.
+
         """
         t = symbols('t')
         P = Function('P')
@@ -462,7 +500,7 @@ class MuMoTmodel:
 
             return
         # assert (len(nvec)==2 or len(nvec)==3 or len(nvec)==4), 'This module works for 2, 3 or 4 different reactants only'
-        rhs_dict, substring = views._deriveMasterEquation(stoich)
+        rhs_dict, substring = _deriveMasterEquation(stoich)
 
         return rhs_dict, substring
 
@@ -494,7 +532,7 @@ class MuMoTmodel:
 
             return
         # assert (len(nvec)==2 or len(nvec)==3 or len(nvec)==4), 'This module works for 2, 3 or 4 different reactants only'
-        rhs_dict, substring = views._deriveMasterEquation(stoich)
+        rhs_dict, substring = _deriveMasterEquation(stoich)
 
         # rhs_ME = 0
         term_count = 0
@@ -520,13 +558,13 @@ class MuMoTmodel:
         out = latex(lhs_ME) + ":= " + out_rhs
         out = utils._doubleUnderscorify(out)
         out = utils._greekPrependify(out)
-        display(Math(out))
+        ipythonDisplay.display(ipythonDisplay.Math(out))
         # substring is a dictionary
         if substring is not None:
             for subKey, subVal in substring.items():
                 subK = utils._greekPrependify(utils._doubleUnderscorify(str(subKey)))
                 subV = utils._greekPrependify(utils._doubleUnderscorify(str(subVal)))
-                display(Math(r"With \; substitution:\;" + latex(subK) + ":= " + latex(subV)))
+                ipythonDisplay.display(ipythonDisplay.Math(r"With \; substitution:\;" + latex(subK) + ":= " + latex(subV)))
 
     def getVanKampenExpansion(self):
         """Get van Kampen expansion when the operators are expanded up to
@@ -540,7 +578,7 @@ class MuMoTmodel:
             Dictionary of substitutions used, this defaults to `None` if no substitutions were made
         """
 
-        rhs_vke, lhs_vke, substring = views._doVanKampenExpansion(views._deriveMasterEquation, self._stoichiometry)
+        rhs_vke, lhs_vke, substring = _doVanKampenExpansion(_deriveMasterEquation, self._stoichiometry)
 
         return lhs_vke, rhs_vke, substring
 
@@ -555,16 +593,16 @@ class MuMoTmodel:
             `None`
 
         """
-        rhs_vke, lhs_vke, substring = views._doVanKampenExpansion(views._deriveMasterEquation, self._stoichiometry)
+        rhs_vke, lhs_vke, substring = _doVanKampenExpansion(_deriveMasterEquation, self._stoichiometry)
         out = latex(lhs_vke) + " := \n" + latex(rhs_vke)
         out = utils._doubleUnderscorify(utils._greekPrependify(out))
-        display(Math(out))
+        ipythonDisplay.display(ipythonDisplay.Math(out))
         # substring is a dictionary
         if substring is not None:
             for subKey, subVal in substring.items():
                 subK = utils._greekPrependify(utils._doubleUnderscorify(str(subKey)))
                 subV = utils._greekPrependify(utils._doubleUnderscorify(str(subVal)))
-                display(Math(r"With \; substitution:\;" + latex(subK) + ":= " + latex(subV)))
+                ipythonDisplay.display(ipythonDisplay.Math(r"With \; substitution:\;" + latex(subK) + ":= " + latex(subV)))
 
     def getFokkerPlanckEquation(self):
         """Get Fokker-Planck equation derived from term ~ O(1) in van Kampen
@@ -595,13 +633,13 @@ class MuMoTmodel:
         for fpe in FPEdict:
             out = latex(fpe) + " := " + latex(FPEdict[fpe])
             out = utils._doubleUnderscorify(utils._greekPrependify(out))
-            display(Math(out))
+            ipythonDisplay.display(ipythonDisplay.Math(out))
         # substring is a dictionary
         if substring is not None:
             for subKey, subVal in substring.items():
                 subK = utils._greekPrependify(utils._doubleUnderscorify(str(subKey)))
                 subV = utils._greekPrependify(utils._doubleUnderscorify(str(subVal)))
-                display(Math(r"With \; substitution:\;" + latex(subK) + ":= " + latex(subV)))
+                ipythonDisplay.display(ipythonDisplay.Math(r"With \; substitution:\;" + latex(subK) + ":= " + latex(subV)))
 
     def getNoiseEquations(self):
         """Get equations of motion of first and second order moments of noise.
@@ -636,12 +674,12 @@ class MuMoTmodel:
             out = "\\displaystyle \\frac{\\textrm{d}" + latex(eom1.subs(NoiseSubs1stOrder)) + "}{\\textrm{d}t} := " + latex(EOM_1stOrderMom[eom1].subs(NoiseSubs1stOrder))
             out = utils._doubleUnderscorify(out)
             out = utils._greekPrependify(out)
-            display(Math(out))
+            ipythonDisplay.display(ipythonDisplay.Math(out))
         for eom2 in EOM_2ndOrderMom:
             out = "\\displaystyle \\frac{\\textrm{d}" + latex(eom2.subs(NoiseSubs2ndOrder)) + "}{\\textrm{d}t} := " + latex(EOM_2ndOrderMom[eom2].subs(NoiseSubs2ndOrder))
             out = utils._doubleUnderscorify(out)
             out = utils._greekPrependify(out)
-            display(Math(out))
+            ipythonDisplay.display(ipythonDisplay.Math(out))
 
     def getNoiseSolutions(self):
         """Gets noise in the stationary state.
@@ -677,7 +715,7 @@ class MuMoTmodel:
             for sol1 in SOL_1stOrderMom:
                 out = latex(sol1.subs(NoiseSubs1stOrder)) + latex(r'(t \to \infty)') + ":= " + latex(SOL_1stOrderMom[sol1].subs(NoiseSubs1stOrder))
                 out = utils._doubleUnderscorify(utils._greekPrependify(out))
-                display(Math(out))
+                ipythonDisplay.display(ipythonDisplay.Math(out))
         if SOL_2ndOrdMomDict is None:
             print('Noise 2nd-order moments could not be calculated analytically.')
             return None
@@ -685,7 +723,7 @@ class MuMoTmodel:
             for sol2 in SOL_2ndOrdMomDict:
                 out = latex(sol2.subs(NoiseSubs2ndOrder)) + latex(r'(t \to \infty)') + " := " + latex(SOL_2ndOrdMomDict[sol2].subs(NoiseSubs2ndOrder))
                 out = utils._doubleUnderscorify(utils._greekPrependify(out))
-                display(Math(out))
+                ipythonDisplay.display(ipythonDisplay.Math(out))
 
     def show(self):
         """Show a LaTeX representation of the model.
@@ -731,7 +769,7 @@ class MuMoTmodel:
                 out += " + "
             out = out[0:len(out) - 2]  # delete the last ' + '
             out = utils._doubleUnderscorify(utils._greekPrependify(out))
-            display(Math(out))
+            ipythonDisplay.display(ipythonDisplay.Math(out))
 
     def integrate(self, showStateVars=None, initWidgets=None, **kwargs):
         """Construct interactive time evolution plot for state variables.
@@ -849,6 +887,101 @@ class MuMoTmodel:
 
         return viewController
 
+    def integrateEnsemble(self, paramGrid, initialStates, maxTime=3.0, tstep=0.01):
+        """Numerically integrate the ODEs for a batch of parameter sets and initial conditions.
+
+        All combinations of parameter values in ``paramGrid`` and initial
+        conditions in ``initialStates`` are integrated together as a single
+        vectorised ODE system, without constructing any widgets or plots.
+
+        Parameters
+        ----------
+        paramGrid : dict
+            Dictionary where keys are the free parameters (as LaTeX strings,
+            e.g. ``'g_{A}'``) and values are a number or a sequence of
+            numbers.  The batch contains every combination of the given
+            values.  ``systemSize`` defaults to 1 if not given.
+        initialStates : dict or list of dict
+            Initial proportions of the time-dependent reactants, either a
+            single dictionary or a list of dictionaries.
+        maxTime : float, optional
+            Integration time.  Must be strictly positive.  Defaults to 3.0.
+        tstep : float, optional
+            Time step of the returned solution.  Defaults to 0.01.
+
+        Returns
+        -------
+        :class:`dict`
+            Labelled results with keys ``'time'`` (array of time points),
+            ``'stateVariables'`` (list of reactant names), ``'params'`` and
+            ``'initialStates'`` (dictionaries of the values used along the
+            first and second axis respectively) and ``'solution'`` (array of
+            shape ``(nParamSets, nInitialStates, nTimePoints, nStateVariables)``).
+
+        """
+        if maxTime <= 0:
+            raise exceptions.MuMoTValueError("maxTime must be strictly positive")
+        if isinstance(initialStates, dict):
+            initialStates = [initialStates]
+        if len(initialStates) == 0:
+            raise exceptions.MuMoTValueError("At least one initial state must be given")
+
+        stateVariables = sorted(self._equations.keys(), key=str)
+        params, rhs, _ = self._getODEfuncs(stateVariables)
+
+        # parameter grid as one row per parameter set
+        gridSymbols, gridValues = utils._process_params(list(paramGrid.items())) if paramGrid else ([], [])
+        gridSymbols = [Symbol('systemSize') if symbol == 'systemSize' else symbol for symbol in gridSymbols]
+        missing = [param for param in params if param not in gridSymbols and param != self._systemSize]
+        if missing:
+            raise exceptions.MuMoTValueError(f"No values given in paramGrid for parameters: {[latex(param) for param in missing]}")
+        gridValues = [np.atleast_1d(np.asarray(values, dtype=float)) for values in gridValues]
+        empty = [symbol for symbol, values in zip(gridSymbols, gridValues) if len(values) == 0]
+        if empty:
+            raise exceptions.MuMoTValueError(f"Empty sequence of values given in paramGrid for parameters: {[latex(symbol) for symbol in empty]}")
+        if gridSymbols:
+            paramSets = np.array(list(itertools.product(*gridValues)), dtype=float)
+        else:
+            # a single parameter set without free parameters
+            paramSets = np.ones((1, 0))
+        paramColumns = []
+        for param in params:
+            if param in gridSymbols:
+                paramColumns.append(paramSets[:, gridSymbols.index(param)])
+            else:
+                paramColumns.append(np.ones(len(paramSets)))
+
+        # initial conditions as one row per initial state
+        y0 = np.empty((len(initialStates), len(stateVariables)))
+        for idx, initialState in enumerate(initialStates):
+            stateSymbols, stateValues = utils._process_params(list(initialState.items()))
+            for jdx, stateVariable in enumerate(stateVariables):
+                if stateVariable not in stateSymbols:
+                    raise exceptions.MuMoTValueError(f"No initial value given for reactant {latex(stateVariable)}")
+                y0[idx, jdx] = stateValues[stateSymbols.index(stateVariable)]
+
+        nParamSets = len(paramSets)
+        nInitialStates = len(initialStates)
+        batchSize = nParamSets * nInitialStates
+        nStates = len(stateVariables)
+        # state and parameter arrays have the batch along the last axis
+        batchParams = [np.repeat(column, nInitialStates) for column in paramColumns]
+        batchY0 = np.tile(y0, (nParamSets, 1)).T
+
+        def batchRHS(y, t):
+            dydt = rhs(y.reshape(nStates, batchSize), t, batchParams)
+            return np.stack([np.broadcast_to(derivative, (batchSize,)) for derivative in dydt]).ravel()
+
+        time = np.linspace(0, maxTime, int(maxTime / tstep) + 1)
+        solution = odeint(batchRHS, batchY0.ravel(), time)
+        solution = solution.reshape(len(time), nStates, nParamSets, nInitialStates).transpose(2, 3, 0, 1)
+
+        return {'time': time,
+                'stateVariables': [latex(stateVariable) for stateVariable in stateVariables],
+                'params': {latex(symbol): paramSets[:, idx] for idx, symbol in enumerate(gridSymbols)},
+                'initialStates': {latex(stateVariable): y0[:, idx] for idx, stateVariable in enumerate(stateVariables)},
+                'solution': solution}
+
     def noiseCorrelations(self, initWidgets=None, **kwargs):
         """Construct interactive time evolution plot for noise correlations
         around fixed points.
@@ -874,6 +1007,11 @@ class MuMoTmodel:
         tstepDS : float, optional
             Time step of numerical integration of ODE system.  Defaults to
             0.01.
+        fixedPointSolver : str, optional
+            Either 'numeric' (multi-start Newton iteration) or 'symbolic'
+            (exact solution with ``sympy.solve``) search for the fixed points
+            around which noise correlations are computed.  Defaults to
+            'numeric'.
         initialState : dict, optional
             Initial proportions of the reactants.  Must be in range [0, 1].
             Can also be set via ``initWidgets`` argument.
@@ -1024,6 +1162,19 @@ class MuMoTmodel:
         --------
         showFixedPoints : bool, optional
              Plot fixed points.  Defaults to False.
+        fixedPointSolver : str, optional
+             Either 'numeric' (multi-start Newton iteration over the plotted
+             domain), 'symbolic' (exact solution with ``sympy.solve``) or
+             'parametric' (closed-form solution in terms of the parameters,
+             solved once and evaluated for each new parameter value; falls
+             back to 'numeric' where sympy cannot solve the equations).
+             Defaults to 'numeric'.
+        meshRefinement : str, optional
+             Either 'uniform' (regular mesh) or 'adaptive' (same number of
+             points, refined where the field changes quickly, e.g. near
+             nullclines and fixed points).  2D streams always use a regular
+             mesh; 3D streams start from points of the adaptive mesh.
+             Defaults to 'uniform'.
         showNoise : bool, optional
              Plot noise around fixed points.  Defaults to False.
         runs : int, optional
@@ -1162,6 +1313,17 @@ class MuMoTmodel:
         --------
         showFixedPoints : bool, optional
              Plot fixed points.  Defaults to False.
+        fixedPointSolver : str, optional
+             Either 'numeric' (multi-start Newton iteration over the plotted
+             domain), 'symbolic' (exact solution with ``sympy.solve``) or
+             'parametric' (closed-form solution in terms of the parameters,
+             solved once and evaluated for each new parameter value; falls
+             back to 'numeric' where sympy cannot solve the equations).
+             Defaults to 'numeric'.
+        meshRefinement : str, optional
+             Either 'uniform' (regular mesh) or 'adaptive' (same number of
+             arrows, refined where the field changes quickly, e.g. near
+             nullclines and fixed points).  Defaults to 'uniform'.
         showNoise : bool, optional
              Plot noise around fixed points.  Defaults to False.
         runs : int, optional
@@ -1308,6 +1470,12 @@ class MuMoTmodel:
             variables (at time t=0) sum up to 1, or not.  Defaults to False.
         contMaxNumPoints: int, optional
             Maximum number of continuation points.  Defaults to 100.
+        fixedPointSolver : str, optional
+            Either 'numeric' (multi-start Newton iteration), 'symbolic'
+            (exact solution with ``sympy.solve``) or 'parametric' (closed-form
+            solution in terms of the parameters, solved once and evaluated for
+            each new parameter value) search for the initial fixed points.
+            Defaults to 'numeric'.
         fontsize : int, optional
             Font size for axis labels.  If not given, font size is
             automatically derived from length of axis label.
@@ -1437,6 +1605,8 @@ class MuMoTmodel:
            Flag to plot proportions or full populations. Defaults to False.
         realtimePlot : bool, optional
            Flag to plot results in realtime (True = the plot is updated each timestep of the simulation; False = the plot is updated once at the end of the simulation). Defaults to False.
+        maxFPS : float, optional
+           Maximum number of realtime-plot frames (and progress-bar updates) per second: the records of the steps between two frames are drawn together. Must be strictly positive. Defaults to mumot.MuMoTdefault._realtimeMaxFPS (None for an update at every step).
         visualisationType : str, optional
             Type of visualisation (``'evo'``,``'graph'``,``'final'`` or ``'barplot'``). See docs/MuMoTuserManual.ipynb for more details. Defaults to 'evo'.
         final_x : object, optional
@@ -1445,8 +1615,14 @@ class MuMoTmodel:
            Which reactant is shown on y-axis when visualisation type is 'final'. Defaults to the alphabetically second reactant.
         runs : int, optional
            Number of simulation runs to be executed. Must be strictly positive. Defaults to 1.
+        nWorkers : int, optional
+           Number of worker processes used to execute the runs in parallel (results do not depend on this value). Must be strictly positive. Defaults to 1 (runs executed serially).
         aggregateResults : bool, optional
            Flag to aggregate or not the results from several runs. Defaults to True.
+        recordInterval : float, optional
+           Time interval between the records of the time evolution: if given, the populations are recorded at times 0, recordInterval, 2 recordInterval, ... instead of at every step. Must be strictly positive. Defaults to None (every step is recorded).
+        spillDir : str, optional
+           Directory where the records of the time evolution are spilled to temporary memory-mapped files, so that memory use does not grow with the number of steps. Defaults to None (records kept in memory).
         netType : str, optional
            Type of network (``'full'``, ``'erdos-renyi'``, ``'barabasi-albert'`` or ``'dynamic'``. See docs/MuMoTuserManual.ipynb for more details. Defaults to 'full'.
         netParam : float, optional
@@ -1455,12 +1631,18 @@ class MuMoTmodel:
            (active only for netType='dynamic') level of inertia in the random walk, with 0 the reactants do a completely uncorrelated random walk and with 1 they move on straight trajectories. Must be in range [0, 1]. Defaults to 0.5.
         particleSpeed : float, optional
            (active only for netType='dynamic') speed of the moving particle, i.e. displacement in one timestep. Must be in range [0,1]. Defaults to 0.01.
+        boundedArena : bool, optional
+           (active only for netType='dynamic') flag to confine the particles in an arena with walls (True) instead of the default periodic boundary conditions (False). Defaults to False.
         timestepSize : float, optional
            Length of one timestep, the maximum size is automatically determined by the rates. Must be strictly positive. Defaults to the maximum value.
         showTrace : bool, optional
            (active only for netType='dynamic') flag to plot the trajectory of each reactant. Defaults to False.
         showInteractions : bool, optional
            (active only for netType='dynamic') flag to plot the interaction range between particles. Defaults to False.
+        checkpointTo : str, optional
+           Path of a file where the state of the simulation (agents, positions, network, random-number-generator state and time evolution) is saved at the end of the run, or at the beginning of the interrupted timestep if the simulation is interrupted. Requires ``runs = 1``. Defaults to None (no checkpoint).
+        resumeFrom : str, optional
+           Path of a checkpoint file (see ``checkpointTo``) from which the simulation is resumed and continued until ``maxTime``, instead of starting from time 0. Requires ``runs = 1``. Defaults to None.
                 legend_fontsize: int, optional
             Specify fontsize of legend.  Defaults to 14.
         legend_loc : str, optional
@@ -1490,6 +1672,191 @@ class MuMoTmodel:
             showSystemSize=True,
             showPlotLimits=False)
 
+        MAParams = self._getMAParams(initWidgets, kwargs, paramValuesDict["systemSize"][0])
+
+        # Construct controller
+        viewController = controllers.MuMoTmultiagentController(
+            paramValuesDict=paramValuesDict,
+            paramLabelDict=self._ratesLaTeX,
+            continuousReplot=False,
+            advancedOpts=MAParams,
+            showSystemSize=True, **kwargs)
+
+        # Get the default network values assigned from the controller
+        modelView = views.MuMoTmultiagentView(self, viewController, MAParams, **kwargs)
+        viewController._setView(modelView)
+        # viewController._setReplotFunction(modelView._computeAndPlotSimulation(self._reactants, self._rules))
+        viewController._setReplotFunction(modelView._computeAndPlotSimulation,
+                                          modelView._redrawOnly)
+        # viewController._widgetsExtraParams['netType'].value.observe(modelView._update_net_params, 'value') #netType is special
+
+        return viewController
+
+    def SSA(self, initWidgets=None, **kwargs):
+        """Construct interactive Stochastic Simulation Algorithm (SSA) plot (simulation run of the Gillespie algorithm to approximate the Master Equation solution).
+
+        Parameters
+        ----------
+        initWidgets : dict {str,list}, optional
+           Keys are the free-parameter or any other specific parameter, and values are four values as [initial-value, min-value, max-value, step-size]
+
+        Keywords
+        --------
+        params: list [(str,num)], optional
+            List of parameters defined as pairs ('parameter name', value). See 'Partial controllers' in the docs/MuMoTuserManual.ipynb. Rates defaults to mumot.MuMoTdefault._initialRateValue. System size defaults to mumot.MuMoTdefault._systemSize.
+        initialState : dictionary {str:float}, optional
+           Initial proportions of the reactants (type: dictionary with reactants as keys and floats in range [0,1] as values).
+           See the bookmark of and example. Defaults to a dictionary with the (alphabetically) first reactant to 1 and the rest to 0.
+        maxTime : float, optional
+           Simulation time. Must be strictly positive. Defaults to mumot.MuMoTdefault._maxTime.
+        randomSeed : int, optional
+           Random seed. Must be strictly positive in range [0, mumot.MAX_RANDOM_SEED]). Defaults to a random number.
+        method : str, optional
+           Simulation algorithm: ``'direct'`` (Gillespie direct method), ``'next-reaction'`` (Gibson-Bruck next reaction method, which after each event only updates the propensities of the affected reactions and is faster for models with many rules) or ``'tau-leap'`` (approximate tau-leaping with Cao-Gillespie-Petzold step-size selection, which fires many reactions per step and is much faster for large system sizes). Defaults to 'direct'.
+        epsilon : float, optional
+           Error-control parameter of tau-leaping (only used with ``method = 'tau-leap'``): bound on the relative change of the propensities in each leap. Must be in range (0, 1). Defaults to 0.03.
+        plotProportions : bool, optional
+           Flag to plot proportions or full populations. Defaults to False.
+        realtimePlot : bool, optional
+           Flag to plot results in realtime (True = the plot is updated each timestep of the simulation; False = the plot is updated once at the end of the simulation). Defaults to False.
+        maxFPS : float, optional
+           Maximum number of realtime-plot frames (and progress-bar updates) per second: the records of the steps between two frames are drawn together. Must be strictly positive. Defaults to mumot.MuMoTdefault._realtimeMaxFPS (None for an update at every step).
+        visualisationType : str, optional
+            Type of visualisation (``'evo'``,``'final'`` or ``'barplot'``). See docs/MuMoTuserManual.ipynb for more details. Defaults to 'evo'.
+        final_x : object, optional
+           Which reactant is shown on x-axis when visualisation type is 'final'. Defaults to the alphabetically first reactant.
+        final_y : object, optional
+           Which reactant is shown on y-axis when visualisation type is 'final'. Defaults to the alphabetically second reactant.
+        runs : int, optional
+           Number of simulation runs to be executed. Must be strictly positive. Defaults to 1.
+        nWorkers : int, optional
+           Number of worker processes used to execute the runs in parallel (results do not depend on this value). Must be strictly positive. Defaults to 1 (runs executed serially).
+        aggregateResults : bool, optional
+           Flag to aggregate or not the results from several runs. Defaults to True.
+        recordInterval : float, optional
+           Time interval between the records of the time evolution: if given, the populations are recorded at times 0, recordInterval, 2 recordInterval, ... instead of at every step. Must be strictly positive. Defaults to None (every step is recorded).
+        spillDir : str, optional
+           Directory where the records of the time evolution are spilled to temporary memory-mapped files, so that memory use does not grow with the number of steps. Defaults to None (records kept in memory).
+        legend_loc : str, optional
+            Specify legend location: combinations like 'upper left' (default), 'lower right', or 'center center' are allowed (9 options in total).
+        fontsize : integer, optional
+            Specify fontsize for axis-labels.  If not specified, the fontsize is automatically derived from the length of axis label.
+        xlab : str, optional
+            Specify label on x-axis.   Defaults to 'time t'.
+        ylab : str, optional
+            Specify label on y-axis.   Defaults to 'reactants'.
+        choose_xrange : list of float, optional
+            Specify range plotted on x-axis as a two-element iterable of the form [xmin, xmax]. If not given uses data values to set axis limits.
+        silent : bool, optional
+            Switch on/off widgets and plot. Important for use with multicontrollers. Defaults to False.
+
+        Returns
+        -------
+        :class:`MuMoTstochasticSimulationController`
+            A MuMoT controller object
+        """
+        if initWidgets is None:
+            initWidgets = {}
+
+        paramValuesDict = self._create_free_param_dictionary_for_controller(
+            inputParams=kwargs.get('params', []),
+            initWidgets=initWidgets,
+            showSystemSize=True,
+            showPlotLimits=False)
+
+        ssaParams = self._getSSAParams(initWidgets, kwargs)
+
+        # construct controller
+        viewController = controllers.MuMoTstochasticSimulationController(
+            paramValuesDict=paramValuesDict,
+            paramLabelDict=self._ratesLaTeX,
+            continuousReplot=False,
+            advancedOpts=ssaParams,
+            showSystemSize=True,
+            **kwargs)
+
+        modelView = views.MuMoTSSAView(self, viewController, ssaParams, **kwargs)
+        viewController._setView(modelView)
+
+        viewController._setReplotFunction(modelView._computeAndPlotSimulation, modelView._redrawOnly)
+
+        return viewController
+
+    def simulate(self, engine='ssa', params=None, runs=1, seed=None, **kwargs):
+        """Run stochastic simulations of the model without constructing widgets or plots.
+
+        Uses the same simulation engines as :meth:`SSA` and
+        :meth:`multiagent`, but returns the time evolution of each run as
+        NumPy arrays instead of displaying them.
+
+        Parameters
+        ----------
+        engine : str, optional
+           Simulation engine: ``'ssa'`` (Stochastic Simulation Algorithm, see :meth:`SSA`) or ``'multiagent'`` (see :meth:`multiagent`).  Defaults to 'ssa'.
+        params : list [(str,num)], optional
+           List of parameters defined as pairs ('parameter name', value).  Rates defaults to mumot.MuMoTdefault._initialRateValue. System size defaults to mumot.MuMoTdefault._systemSize.
+        runs : int, optional
+           Number of simulation runs to be executed. Must be strictly positive. Defaults to 1.
+        seed : int, optional
+           Random seed of the first run (run ``r`` uses ``seed + r``).  Must be in range [0, mumot.MAX_RANDOM_SEED]. Defaults to a random number.
+
+        Keywords
+        --------
+        initialState, maxTime, nWorkers, recordInterval, spillDir
+           As in :meth:`SSA` and :meth:`multiagent`.
+        method, epsilon
+           As in :meth:`SSA` (only used with ``engine = 'ssa'``).
+        netType, netParam, motionCorrelatedness, particleSpeed, boundedArena, timestepSize, checkpointTo, resumeFrom
+           As in :meth:`multiagent` (only used with ``engine = 'multiagent'``).
+
+        Returns
+        -------
+        :class:`list` of :class:`dict`
+            One dictionary per run, with keys ``'time'`` and the reactant
+            names (as LaTeX strings) and NumPy arrays of the same length as
+            values.
+
+        """
+        if engine not in ('ssa', 'multiagent'):
+            raise exceptions.MuMoTValueError(f"Unknown simulation engine '{engine}': accepted values are 'ssa' and 'multiagent'")
+        kwargs['runs'] = runs
+        if seed is not None:
+            kwargs['randomSeed'] = seed
+        # no plotting: these options are irrelevant but read by the views
+        kwargs['realtimePlot'] = False
+        kwargs['aggregateResults'] = False
+
+        paramValuesDict = self._create_free_param_dictionary_for_controller(
+            inputParams=params if params is not None else [],
+            initWidgets={},
+            showSystemSize=True,
+            showPlotLimits=False)
+        if engine == 'ssa':
+            advancedParams = self._getSSAParams({}, kwargs)
+        else:
+            advancedParams = self._getMAParams({}, kwargs, paramValuesDict["systemSize"][0])
+
+        # collapse the widget specifications [value, (min, max, step,) fixed] into plain values
+        standaloneParams = {key: value[0] for key, value in advancedParams.items()
+                            if key not in ('final_x', 'final_y')}
+        standaloneParams['initialState'] = {state: value[0] for state, value in advancedParams['initialState'][0].items()}
+        fullParams = [(name, value[0]) for name, value in paramValuesDict.items()]
+
+        viewKwargs = {key: kwargs[key] for key in ('recordInterval', 'spillDir') if key in kwargs}
+        if engine == 'ssa':
+            view = views.MuMoTSSAView(self, None, standaloneParams, params=fullParams, silent=True, **viewKwargs)
+        else:
+            viewKwargs.update({key: kwargs[key] for key in ('checkpointTo', 'resumeFrom') if key in kwargs})
+            view = views.MuMoTmultiagentView(self, None, standaloneParams, params=fullParams, silent=True, **viewKwargs)
+        view._progressBar = None
+        view._update_params()
+        results = view._runSimulations()
+
+        return [{(key if key == 'time' else latex(key)): np.asarray(values) for key, values in evo.items()}
+                for evo in results]
+
+    def _getMAParams(self, initWidgets, kwargs, systemSize):
+        """Read and validate the input parameters of :meth:`multiagent` (see its docstring for the keywords)."""
         MAParams = {}
         # Read input parameters
         MAParams['substitutedReactant'] = [[react for react in self._getAllReactants()[0] if react not in self._reactants][0] if self._systemSize is not None else None, True]
@@ -1520,6 +1887,10 @@ class MuMoTmodel:
             optionName='particleSpeed',
             inputValue=kwargs.get('particleSpeed'),
             initValues=initWidgets.get('particleSpeed'))
+        MAParams['boundedArena'] = utils._format_advanced_option(
+            optionName='boundedArena',
+            inputValue=kwargs.get('boundedArena'),
+            initValues=initWidgets.get('boundedArena'))
         MAParams['timestepSize'] = utils._format_advanced_option(
             optionName='timestepSize',
             inputValue=kwargs.get('timestepSize'),
@@ -1528,7 +1899,6 @@ class MuMoTmodel:
             optionName='netType',
             inputValue=kwargs.get('netType'),
             initValues=initWidgets.get('netType'))
-        systemSize = paramValuesDict["systemSize"][0]
         MAParams['netParam'] = utils._format_advanced_option(
             optionName='netParam',
             inputValue=kwargs.get('netParam'),
@@ -1570,6 +1940,10 @@ class MuMoTmodel:
             optionName='runs',
             inputValue=kwargs.get('runs'),
             initValues=initWidgets.get('runs'))
+        MAParams['nWorkers'] = utils._format_advanced_option(
+            optionName='nWorkers',
+            inputValue=kwargs.get('nWorkers'),
+            initValues=initWidgets.get('nWorkers'))
         MAParams['aggregateResults'] = utils._format_advanced_option(
             optionName='aggregateResults',
             inputValue=kwargs.get('aggregateResults'),
@@ -1581,89 +1955,16 @@ class MuMoTmodel:
             if decodedNetType != consts.NetworkType.DYNAMIC:
                 MAParams['motionCorrelatedness'][-1] = True
                 MAParams['particleSpeed'][-1] = True
+                MAParams['boundedArena'][-1] = True
                 MAParams['showTrace'][-1] = True
                 MAParams['showInteractions'][-1] = True
                 if decodedNetType == consts.NetworkType.FULLY_CONNECTED:
                     MAParams['netParam'][-1] = True
 
-        # Construct controller
-        viewController = controllers.MuMoTmultiagentController(
-            paramValuesDict=paramValuesDict,
-            paramLabelDict=self._ratesLaTeX,
-            continuousReplot=False,
-            advancedOpts=MAParams,
-            showSystemSize=True, **kwargs)
-
-        # Get the default network values assigned from the controller
-        modelView = views.MuMoTmultiagentView(self, viewController, MAParams, **kwargs)
-        viewController._setView(modelView)
-        # viewController._setReplotFunction(modelView._computeAndPlotSimulation(self._reactants, self._rules))
-        viewController._setReplotFunction(modelView._computeAndPlotSimulation,
-                                          modelView._redrawOnly)
-        # viewController._widgetsExtraParams['netType'].value.observe(modelView._update_net_params, 'value') #netType is special
-
-        return viewController
-
-    def SSA(self, initWidgets=None, **kwargs):
-        """Construct interactive Stochastic Simulation Algorithm (SSA) plot (simulation run of the Gillespie algorithm to approximate the Master Equation solution).
-
-        Parameters
-        ----------
-        initWidgets : dict {str,list}, optional
-           Keys are the free-parameter or any other specific parameter, and values are four values as [initial-value, min-value, max-value, step-size]
-
-        Keywords
-        --------
-        params: list [(str,num)], optional
-            List of parameters defined as pairs ('parameter name', value). See 'Partial controllers' in the docs/MuMoTuserManual.ipynb. Rates defaults to mumot.MuMoTdefault._initialRateValue. System size defaults to mumot.MuMoTdefault._systemSize.
-        initialState : dictionary {str:float}, optional
-           Initial proportions of the reactants (type: dictionary with reactants as keys and floats in range [0,1] as values).
-           See the bookmark of and example. Defaults to a dictionary with the (alphabetically) first reactant to 1 and the rest to 0.
-        maxTime : float, optional
-           Simulation time. Must be strictly positive. Defaults to mumot.MuMoTdefault._maxTime.
-        randomSeed : int, optional
-           Random seed. Must be strictly positive in range [0, mumot.MAX_RANDOM_SEED]). Defaults to a random number.
-        plotProportions : bool, optional
-           Flag to plot proportions or full populations. Defaults to False.
-        realtimePlot : bool, optional
-           Flag to plot results in realtime (True = the plot is updated each timestep of the simulation; False = the plot is updated once at the end of the simulation). Defaults to False.
-        visualisationType : str, optional
-            Type of visualisation (``'evo'``,``'final'`` or ``'barplot'``). See docs/MuMoTuserManual.ipynb for more details. Defaults to 'evo'.
-        final_x : object, optional
-           Which reactant is shown on x-axis when visualisation type is 'final'. Defaults to the alphabetically first reactant.
-        final_y : object, optional
-           Which reactant is shown on y-axis when visualisation type is 'final'. Defaults to the alphabetically second reactant.
-        runs : int, optional
-           Number of simulation runs to be executed. Must be strictly positive. Defaults to 1.
-        aggregateResults : bool, optional
-           Flag to aggregate or not the results from several runs. Defaults to True.
-        legend_loc : str, optional
-            Specify legend location: combinations like 'upper left' (default), 'lower right', or 'center center' are allowed (9 options in total).
-        fontsize : integer, optional
-            Specify fontsize for axis-labels.  If not specified, the fontsize is automatically derived from the length of axis label.
-        xlab : str, optional
-            Specify label on x-axis.   Defaults to 'time t'.
-        ylab : str, optional
-            Specify label on y-axis.   Defaults to 'reactants'.
-        choose_xrange : list of float, optional
-            Specify range plotted on x-axis as a two-element iterable of the form [xmin, xmax]. If not given uses data values to set axis limits.
-        silent : bool, optional
-            Switch on/off widgets and plot. Important for use with multicontrollers. Defaults to False.
-
-        Returns
-        -------
-        :class:`MuMoTstochasticSimulationController`
-            A MuMoT controller object
-        """
-        if initWidgets is None:
-            initWidgets = {}
-
-        paramValuesDict = self._create_free_param_dictionary_for_controller(
-            inputParams=kwargs.get('params', []),
-            initWidgets=initWidgets,
-            showSystemSize=True,
-            showPlotLimits=False)
+        return MAParams
 
+    def _getSSAParams(self, initWidgets, kwargs):
+        """Read and validate the input parameters of :meth:`SSA` (see its docstring for the keywords)."""
         ssaParams = {}
         # Read input parameters
         ssaParams['substitutedReactant'] = [[react for react in self._getAllReactants()[0] if react not in self._reactants][0] if self._systemSize is not None else None, True]
@@ -1686,6 +1987,14 @@ class MuMoTmodel:
             optionName='randomSeed',
             inputValue=kwargs.get('randomSeed'),
             initValues=initWidgets.get('randomSeed'))
+        ssaParams['method'] = utils._format_advanced_option(
+            optionName='method',
+            inputValue=kwargs.get('method'),
+            initValues=initWidgets.get('method'))
+        ssaParams['epsilon'] = utils._format_advanced_option(
+            optionName='epsilon',
+            inputValue=kwargs.get('epsilon'),
+            initValues=initWidgets.get('epsilon'))
         ssaParams['plotProportions'] = utils._format_advanced_option(
             optionName='plotProportions',
             inputValue=kwargs.get('plotProportions'),
@@ -1713,26 +2022,16 @@ class MuMoTmodel:
             optionName='runs',
             inputValue=kwargs.get('runs'),
             initValues=initWidgets.get('runs'))
+        ssaParams['nWorkers'] = utils._format_advanced_option(
+            optionName='nWorkers',
+            inputValue=kwargs.get('nWorkers'),
+            initValues=initWidgets.get('nWorkers'))
         ssaParams['aggregateResults'] = utils._format_advanced_option(
             optionName='aggregateResults',
             inputValue=kwargs.get('aggregateResults'),
             initValues=initWidgets.get('aggregateResults'))
 
-        # construct controller
-        viewController = controllers.MuMoTstochasticSimulationController(
-            paramValuesDict=paramValuesDict,
-            paramLabelDict=self._ratesLaTeX,
-            continuousReplot=False,
-            advancedOpts=ssaParams,
-            showSystemSize=True,
-            **kwargs)
-
-        modelView = views.MuMoTSSAView(self, viewController, ssaParams, **kwargs)
-        viewController._setView(modelView)
-
-        viewController._setReplotFunction(modelView._computeAndPlotSimulation, modelView._redrawOnly)
-
-        return viewController
+        return ssaParams
 
     def _getAllReactants(self):
         """Get the pair of set (reactants, constantReactants).
@@ -1908,6 +2207,128 @@ class MuMoTmodel:
 
         return self._funcs
 
+    def _getODEfuncs(self, stateVariables):
+        """Compile the ODE system for the given state variables into NumPy functions.
+
+        The right-hand side and its analytic Jacobian are lambdified once per
+        set of state variables and cached on the model.  Both take the
+        signature ``f(y, t, paramValues)`` expected by ``scipy.integrate.odeint``,
+        where ``paramValues`` is a sequence of numbers ordered as the returned
+        parameter symbols.
+
+        Parameters
+        ----------
+        stateVariables : list of sympy.Symbol
+            Time-dependent reactants, in the order used for the state vector.
+
+        Returns
+        -------
+        :class:`tuple`
+            Parameter symbols, right-hand side function and Jacobian function.
+
+        """
+        if self._odeFuncs is None:
+            self._odeFuncs = {}
+        key = tuple(stateVariables)
+        if key not in self._odeFuncs:
+            equations = [self._equations[stateVariable] for stateVariable in stateVariables]
+            freeSymbols = set().union(*[equation.free_symbols for equation in equations])
+            params = sorted(freeSymbols - set(stateVariables), key=str)
+            rhsFunc = lambdify((list(stateVariables), params), equations, "numpy")
+            jacFunc = lambdify((list(stateVariables), params), sympy.Matrix(equations).jacobian(list(stateVariables)), "numpy")
+
+            def rhs(y, _, paramValues):
+                return rhsFunc(y, paramValues)
+
+            def jac(y, _, paramValues):
+                return jacFunc(y, paramValues)
+
+            self._odeFuncs[key] = (params, rhs, jac)
+
+        return self._odeFuncs[key]
+
+    def _getJacobianFuncs(self, stateVariables):
+        """Compile the equations for the given state variables and their Jacobian into NumPy functions vectorised over points.
+
+        The functions are lambdified once per set of state variables and
+        cached on the model, so that all views share them.  Both take the
+        signature ``f(points, paramValues)``, where ``points`` is an array of
+        shape (number of state variables, number of points) and
+        ``paramValues`` is a sequence of numbers ordered as the returned
+        parameter symbols.  The equations are returned with the shape of
+        ``points``, the Jacobians with shape (number of points, number of
+        state variables, number of state variables).
+
+        Parameters
+        ----------
+        stateVariables : list of sympy.Symbol
+            Time-dependent reactants, in the order used for the points.
+
+        Returns
+        -------
+        :class:`tuple`
+            Parameter symbols, equations function and Jacobian function.
+
+        """
+        if self._jacobianFuncs is None:
+            self._jacobianFuncs = {}
+        key = tuple(stateVariables)
+        if key not in self._jacobianFuncs:
+            dimensions = len(stateVariables)
+            equations = sympy.Matrix([self._equations[stateVariable] for stateVariable in stateVariables])
+            params = sorted(equations.free_symbols - set(stateVariables), key=str)
+            equationsFunc = lambdify((list(stateVariables), params), list(equations), "numpy")
+            jacobianFunc = lambdify((list(stateVariables), params), list(equations.jacobian(list(stateVariables))), "numpy")
+
+            def evaluateEquations(points, paramValues):
+                points = np.asarray(points)
+                return np.array([np.broadcast_to(value, points.shape[1:]) for value in equationsFunc(points, paramValues)])
+
+            def evaluateJacobian(points, paramValues):
+                points = np.asarray(points)
+                entries = np.array([np.broadcast_to(value, points.shape[1:]) for value in jacobianFunc(points, paramValues)])
+                return np.moveaxis(entries.reshape(dimensions, dimensions, -1), -1, 0)
+
+            self._jacobianFuncs[key] = (params, evaluateEquations, evaluateJacobian)
+
+        return self._jacobianFuncs[key]
+
+    def _getLinearStability(self, stateVariables, fixedPoints, argDict):
+        """Evaluate the compiled Jacobian at each of the ``fixedPoints`` and classify their linear stability.
+
+        Parameters
+        ----------
+        stateVariables : list of sympy.Symbol
+            Time-dependent reactants.
+        fixedPoints : list of dict
+            Fixed points, with values of the ``stateVariables`` as numbers.
+        argDict : dict
+            Numeric values of the parameters (symbols as keys).
+
+        Returns
+        -------
+        :class:`tuple` or None
+            List of eigenvalue dictionaries (in the format of
+            ``sympy.Matrix.eigenvects``) and list of stability classes (see
+            :func:`utils._classifyStability`), or None if a parameter has no
+            numeric value.
+
+        """
+        if len(fixedPoints) == 0:
+            return [], []
+        params, _, jacobianFunc = self._getJacobianFuncs(stateVariables)
+        if any(param not in argDict for param in params):
+            return None
+        try:
+            points = np.array([[complex(fixedPoint[stateVariable]) for fixedPoint in fixedPoints]
+                               for stateVariable in stateVariables])
+            paramValues = [float(argDict[param]) for param in params]
+        except TypeError:
+            return None
+        jacobians = jacobianFunc(points.real, paramValues).astype(float)
+        eigList = [utils._eigenvalueSets(jacobian) for jacobian in jacobians]
+        return eigList, [utils._classifyStability(evSet) for evSet in eigList]
+
     def _getArgTuple1d(self, argDict, stateVariable1, X):
         """Get tuple to evalute functions returned by _getFuncs with, for 2d field-based plots."""
         argList = []
@@ -2222,7 +2643,7 @@ def parseModel(modelDescription):
     if len(intersect) != 0:
         raise exceptions.MuMoTSyntaxError("Following reactants defined as both constant and variable: {intersect}")
     model._rates = rates
-    model._equations = views._deriveODEsFromRules(model._reactants, model._rules)
+    model._equations = _deriveODEsFromRules(model._reactants, model._rules)
     model._ratesLaTeX = {}
     rates = map(latex, list(model._rates))
     for (rate, latex_str) in zip(model._rates, rates):
@@ -2237,11 +2658,258 @@ def parseModel(modelDescription):
     return model
 
 
+def _deriveODEsFromRules(reactants, rules):
+    # @todo: replace with principled derivation via Master Equation and van Kampen expansion
+    equations = {}
+    terms = []
+    for rule in rules:
+        term = None
+        for reactant in rule.lhsReactants:
+            if term is None:
+                term = reactant
+            else:
+                term = term * reactant
+        term = term * rule.rate
+        terms.append(term)
+    for reactant in reactants:
+        rhs = None
+        for rule, term in zip(rules, terms):
+            # I love Python!
+            factor = rule.rhsReactants.count(reactant) - rule.lhsReactants.count(reactant)
+            if factor != 0:
+                if rhs is None:
+                    rhs = factor * term
+                else:
+                    rhs = rhs + factor * term
+        equations[reactant] = rhs
+
+    return equations
+
+
+@utils._cachedOnDisk
+def _deriveMasterEquation(stoichiometry):
+    """Derive the Master equation
+
+    Returns dictionary used in :method:`MuMoTmodel.showMasterEquation`.
+    """
+    substring = None
+
+    x, y, v, w, t, m = symbols('x y v w t m')
+    E_op = Function('E_op')
+    z = Function('z')
+    P = Function('P')
+    V = Symbol(r'\overline{V}', real=True, constant=True)
+
+    stoich = stoichiometry
+    nvec = []
+    for key1 in stoich:
+        for key2 in stoich[key1]:
+            if key2 != 'rate' and stoich[key1][key2] != 'const':
+                if key2 not in nvec:
+                    nvec.append(key2)
+                if len(stoich[key1][key2]) == 3:
+                    substring = stoich[key1][key2][2]
+    nvec = sorted(nvec, key=default_sort_key)
+
+    if len(nvec) < 1 or len(nvec) > 4:
+        print("Derivation of Master Equation works for 1, 2, 3 or 4 different reactants only")
+
+        return None, None
+
+    # assert (len(nvec)==2 or len(nvec)==3 or len(nvec)==4), 'This module works for 2, 3 or 4 different reactants only'
+
+    rhs = 0
+    sol_dict_rhs = {}
+    f = lambdify(z(y, v - w), z(y, v - w), modules='sympy')
+    g = lambdify((x, y, v), (factorial(x) / factorial(x - y)) / v**y, modules='sympy')
+    for key1 in stoich:
+        prod1 = 1
+        prod2 = 1
+        rate_fact = 1
+        for key2 in stoich[key1]:
+            if key2 != 'rate' and stoich[key1][key2] != 'const':
+                prod1 *= f(E_op(key2, stoich[key1][key2][0] - stoich[key1][key2][1]))
+                prod2 *= g(key2, stoich[key1][key2][0], V)
+            if stoich[key1][key2] == 'const':
+                rate_fact *= key2 / V
+
+        if len(nvec) == 1:
+            sol_dict_rhs[key1] = (prod1, simplify(prod2 * V), P(nvec[0], t), stoich[key1]['rate'] * rate_fact)
+        elif len(nvec) == 2:
+            sol_dict_rhs[key1] = (prod1, simplify(prod2 * V), P(nvec[0], nvec[1], t), stoich[key1]['rate'] * rate_fact)
+        elif len(nvec) == 3:
+            sol_dict_rhs[key1] = (prod1, simplify(prod2 * V), P(nvec[0], nvec[1], nvec[2], t), stoich[key1]['rate'] * rate_fact)
+        else:
+            sol_dict_rhs[key1] = (prod1, simplify(prod2 * V), P(nvec[0], nvec[1], nvec[2], nvec[3], t), stoich[key1]['rate'] * rate_fact)
+
+    return sol_dict_rhs, substring
+
+
+@utils._cachedOnDisk
+def _doVanKampenExpansion(rhs, stoich):
+    """Return the left-hand side and right-hand side of van Kampen expansion."""
+    x, y, v, w, t, m = symbols('x y v w t m')
+    E_op = Function('E_op')
+    P = Function('P')
+    V = Symbol(r'\overline{V}', real=True, constant=True)
+    nvec = []
+    nconstvec = []
+    for key1 in stoich:
+        for key2 in stoich[key1]:
+            if key2 != 'rate' and stoich[key1][key2] != 'const':
+                if key2 not in nvec:
+                    nvec.append(key2)
+            elif key2 != 'rate' and stoich[key1][key2] == 'const':
+                if key2 not in nconstvec:
+                    nconstvec.append(key2)
+
+    nvec = sorted(nvec, key=default_sort_key)
+    if len(nvec) < 1 or len(nvec) > 4:
+        print("van Kampen expansion works for 1, 2, 3 or 4 different reactants only")
+
+        return None, None, None
+    # assert (len(nvec)==2 or len(nvec)==3 or len(nvec)==4), 'This module works for 2, 3 or 4 different reactants only'
+
+    NoiseDict = {}
+    PhiDict = {}
+    PhiConstDict = {}
+
+    for kk in range(len(nvec)):
+        NoiseDict[nvec[kk]] = Symbol(f"eta_{nvec[kk]}")
+        PhiDict[nvec[kk]] = Symbol(f"Phi_{nvec[kk]}")
+
+    for kk in range(len(nconstvec)):
+        PhiConstDict[nconstvec[kk]] = V * Symbol(f"Phi_{nconstvec[kk]}")
+
+    rhs_dict, substring = rhs(stoich)
+    rhs_vKE = 0
+
+    if len(nvec) == 1:
+        lhs_vKE = (Derivative(P(nvec[0], t), t).subs({nvec[0]: NoiseDict[nvec[0]]}) -
+                   sympy.sqrt(V) * Derivative(PhiDict[nvec[0]], t) * Derivative(P(nvec[0], t), nvec[0]).subs({nvec[0]: NoiseDict[nvec[0]]}))
+        for key in rhs_dict:
+            op = rhs_dict[key][0].subs({nvec[0]: NoiseDict[nvec[0]]})
+            func1 = rhs_dict[key][1].subs({nvec[0]: V * PhiDict[nvec[0]] + sympy.sqrt(V) * NoiseDict[nvec[0]]})
+            func2 = rhs_dict[key][2].subs({nvec[0]: NoiseDict[nvec[0]]})
+            func = func1 * func2
+            # if len(op.args[0].args) ==0:
+            term = (op * func).subs({
+                op * func: func + op.args[1] / sympy.sqrt(V) * Derivative(func, op.args[0]) + op.args[1]**2 / (2 * V) * Derivative(func, op.args[0], op.args[0])})
+            # else:
+            #     term = (op.args[1] * func).subs({op.args[1] * func: func + op.args[1].args[1] / sympy.sqrt(V) * Derivative(func, op.args[1].args[0])
+            #                            + op.args[1].args[1]**2 / (2 * V) * Derivative(func, op.args[1].args[0], op.args[1].args[0])})
+            #     term = (op.args[0] * term).subs({op.args[0] * term: term + op.args[0].args[1] / sympy.sqrt(V) * Derivative(term, op.args[0].args[0])
+            #                            + op.args[0].args[1]**2 / (2 * V) * Derivative(term, op.args[0].args[0], op.args[0].args[0])})
+            rhs_vKE += rhs_dict[key][3].subs(PhiConstDict) * (term.doit() - func)
+    elif len(nvec) == 2:
+        lhs_vKE = (Derivative(P(nvec[0], nvec[1], t), t).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]]})
+                   - sympy.sqrt(V) * Derivative(PhiDict[nvec[0]], t) * Derivative(P(nvec[0], nvec[1], t), nvec[0]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]]})
+                   - sympy.sqrt(V) * Derivative(PhiDict[nvec[1]], t) * Derivative(P(nvec[0], nvec[1], t), nvec[1]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]]}))
+
+        for key in rhs_dict:
+            op = rhs_dict[key][0].subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]]})
+            func1 = rhs_dict[key][1].subs({nvec[0]: V * PhiDict[nvec[0]] + sympy.sqrt(V) * NoiseDict[nvec[0]], nvec[1]: V * PhiDict[nvec[1]] + sympy.sqrt(V) * NoiseDict[nvec[1]]})
+            func2 = rhs_dict[key][2].subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]]})
+            func = func1 * func2
+            if len(op.args[0].args) == 0:
+                term = (op * func).subs({op * func: func + op.args[1] / sympy.sqrt(V) * Derivative(func, op.args[0]) + op.args[1]**2 / (2 * V) * Derivative(func, op.args[0], op.args[0])})
+            else:
+                term = (op.args[1] * func).subs({op.args[1] * func: func + op.args[1].args[1] / sympy.sqrt(V) * Derivative(func, op.args[1].args[0])
+                                                 + op.args[1].args[1]**2 / (2 * V) * Derivative(func, op.args[1].args[0], op.args[1].args[0])})
+                term = (op.args[0] * term).subs({op.args[0] * term: term + op.args[0].args[1] / sympy.sqrt(V) * Derivative(term, op.args[0].args[0])
+                                                 + op.args[0].args[1]**2 / (2 * V) * Derivative(term, op.args[0].args[0], op.args[0].args[0])})
+            # term_num, term_denom = term.as_numer_denom()
+            rhs_vKE += rhs_dict[key][3].subs(PhiConstDict) * (term.doit() - func)
+    elif len(nvec) == 3:
+        lhs_vKE = (Derivative(P(nvec[0], nvec[1], nvec[2], t), t).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]]})
+                   - sympy.sqrt(V) * Derivative(PhiDict[nvec[0]], t) * Derivative(P(nvec[0], nvec[1], nvec[2], t), nvec[0]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]]})
+                   - sympy.sqrt(V) * Derivative(PhiDict[nvec[1]], t) * Derivative(P(nvec[0], nvec[1], nvec[2], t), nvec[1]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]]})
+                   - sympy.sqrt(V) * Derivative(PhiDict[nvec[2]], t) * Derivative(P(nvec[0], nvec[1], nvec[2], t), nvec[2]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]]}))
+        rhs_dict, substring = rhs(stoich)
+        rhs_vKE = 0
+        for key in rhs_dict:
+            op = rhs_dict[key][0].subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]]})
+            func1 = rhs_dict[key][1].subs({nvec[0]: V * PhiDict[nvec[0]] + sympy.sqrt(V) * NoiseDict[nvec[0]], nvec[1]: V * PhiDict[nvec[1]] + sympy.sqrt(V) * NoiseDict[nvec[1]], nvec[2]: V * PhiDict[nvec[2]] + sympy.sqrt(V) * NoiseDict[nvec[2]]})
+            func2 = rhs_dict[key][2].subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]]})
+            func = func1 * func2
+            if len(op.args[0].args) == 0:
+                term = (op * func).subs({op * func: func + op.args[1] / sympy.sqrt(V) * Derivative(func, op.args[0]) + op.args[1]**2 / (2 * V) * Derivative(func, op.args[0], op.args[0])})
+
+            elif len(op.args) == 2:
+                term = (op.args[1] * func).subs({op.args[1] * func: func + op.args[1].args[1] / sympy.sqrt(V) * Derivative(func, op.args[1].args[0])
+                                                 + op.args[1].args[1]**2 / (2 * V) * Derivative(func, op.args[1].args[0], op.args[1].args[0])})
+                term = (op.args[0] * term).subs({op.args[0] * term: term + op.args[0].args[1] / sympy.sqrt(V) * Derivative(term, op.args[0].args[0])
+                                                 + op.args[0].args[1]**2 / (2 * V) * Derivative(term, op.args[0].args[0], op.args[0].args[0])})
+            elif len(op.args) == 3:
+                term = (op.args[2] * func).subs({op.args[2] * func: func + op.args[2].args[1] / sympy.sqrt(V) * Derivative(func, op.args[2].args[0])
+                                                 + op.args[2].args[1]**2 / (2 * V) * Derivative(func, op.args[2].args[0], op.args[2].args[0])})
+                term = (op.args[1] * term).subs({op.args[1] * term: term + op.args[1].args[1] / sympy.sqrt(V) * Derivative(term, op.args[1].args[0])
+                                                 + op.args[1].args[1]**2 / (2 * V) * Derivative(term, op.args[1].args[0], op.args[1].args[0])})
+                term = (op.args[0] * term).subs({op.args[0] * term: term + op.args[0].args[1] / sympy.sqrt(V) * Derivative(term, op.args[0].args[0])
+                                                 + op.args[0].args[1]**2 / (2 * V) * Derivative(term, op.args[0].args[0], op.args[0].args[0])})
+            else:
+                print('Something went wrong!')
+            rhs_vKE += rhs_dict[key][3].subs(PhiConstDict) * (term.doit() - func)
+    else:
+        lhs_vKE = (Derivative(P(nvec[0], nvec[1], nvec[2], nvec[3], t), t).subs(
+            {nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]], nvec[3]: NoiseDict[nvec[3]]})
+            - sympy.sqrt(V) * Derivative(PhiDict[nvec[0]], t) * Derivative(P(nvec[0], nvec[1], nvec[2], nvec[3], t), nvec[0]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]], nvec[3]: NoiseDict[nvec[3]]})
+            - sympy.sqrt(V) * Derivative(PhiDict[nvec[1]], t) * Derivative(P(nvec[0], nvec[1], nvec[2], nvec[3], t), nvec[1]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]], nvec[3]: NoiseDict[nvec[3]]})
+            - sympy.sqrt(V) * Derivative(PhiDict[nvec[2]], t) * Derivative(P(nvec[0], nvec[1], nvec[2], nvec[3], t), nvec[2]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]], nvec[3]: NoiseDict[nvec[3]]})
+            - sympy.sqrt(V) * Derivative(PhiDict[nvec[3]], t) * Derivative(P(nvec[0], nvec[1], nvec[2], nvec[3], t), nvec[3]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]], nvec[3]: NoiseDict[nvec[3]]}))
+        rhs_dict, substring = rhs(stoich)
+        rhs_vKE = 0
+        for key in rhs_dict:
+            op = rhs_dict[key][0].subs({nvec[0]: NoiseDict[nvec[0]],
+                                        nvec[1]: NoiseDict[nvec[1]],
+                                        nvec[2]: NoiseDict[nvec[2]],
+                                        nvec[3]: NoiseDict[nvec[3]]})
+            func1 = rhs_dict[key][1].subs({nvec[0]: V * PhiDict[nvec[0]] + sympy.sqrt(V) * NoiseDict[nvec[0]],
+                                           nvec[1]: V * PhiDict[nvec[1]] + sympy.sqrt(V) * NoiseDict[nvec[1]],
+                                           nvec[2]: V * PhiDict[nvec[2]] + sympy.sqrt(V) * NoiseDict[nvec[2]],
+                                           nvec[3]: V * PhiDict[nvec[3]] + sympy.sqrt(V) * NoiseDict[nvec[3]]})
+            func2 = rhs_dict[key][2].subs({nvec[0]: NoiseDict[nvec[0]],
+                                           nvec[1]: NoiseDict[nvec[1]],
+                                           nvec[2]: NoiseDict[nvec[2]],
+                                           nvec[3]: NoiseDict[nvec[3]]})
+            func = func1 * func2
+            if len(op.args[0].args) == 0:
+                term = (op * func).subs({op * func: func + op.args[1] / sympy.sqrt(V) * Derivative(func, op.args[0]) + op.args[1]**2 / (2 * V) * Derivative(func, op.args[0], op.args[0])})
+
+            elif len(op.args) == 2:
+                term = (op.args[1] * func).subs({op.args[1] * func: func + op.args[1].args[1] / sympy.sqrt(V) * Derivative(func, op.args[1].args[0])
+                                                 + op.args[1].args[1]**2 / (2 * V) * Derivative(func, op.args[1].args[0], op.args[1].args[0])})
+                term = (op.args[0] * term).subs({op.args[0] * term: term + op.args[0].args[1] / sympy.sqrt(V) * Derivative(term, op.args[0].args[0])
+                                                 + op.args[0].args[1]**2 / (2 * V) * Derivative(term, op.args[0].args[0], op.args[0].args[0])})
+            elif len(op.args) == 3:
+                term = (op.args[2] * func).subs({op.args[2] * func: func + op.args[2].args[1] / sympy.sqrt(V) * Derivative(func, op.args[2].args[0])
+                                                 + op.args[2].args[1]**2 / (2 * V) * Derivative(func, op.args[2].args[0], op.args[2].args[0])})
+                term = (op.args[1] * term).subs({op.args[1] * term: term + op.args[1].args[1] / sympy.sqrt(V) * Derivative(term, op.args[1].args[0])
+                                                 + op.args[1].args[1]**2 / (2 * V) * Derivative(term, op.args[1].args[0], op.args[1].args[0])})
+                term = (op.args[0] * term).subs({op.args[0] * term: term + op.args[0].args[1] / sympy.sqrt(V) * Derivative(term, op.args[0].args[0])
+                                                 + op.args[0].args[1]**2 / (2 * V) * Derivative(term, op.args[0].args[0], op.args[0].args[0])})
+            elif len(op.args) == 4:
+                term = (op.args[3] * func).subs({op.args[3] * func: func + op.args[3].args[1] / sympy.sqrt(V) * Derivative(func, op.args[3].args[0])
+                                                 + op.args[3].args[1]**2 / (2 * V) * Derivative(func, op.args[3].args[0], op.args[3].args[0])})
+                term = (op.args[2] * term).subs({op.args[2] * term: term + op.args[2].args[1] / sympy.sqrt(V) * Derivative(term, op.args[2].args[0])
+                                                 + op.args[2].args[1]**2 / (2 * V) * Derivative(term, op.args[2].args[0], op.args[2].args[0])})
+                term = (op.args[1] * term).subs({op.args[1] * term: term + op.args[1].args[1] / sympy.sqrt(V) * Derivative(term, op.args[1].args[0])
+                                                 + op.args[1].args[1]**2 / (2 * V) * Derivative(term, op.args[1].args[0], op.args[1].args[0])})
+                term = (op.args[0] * term).subs({op.args[0] * term: term + op.args[0].args[1] / sympy.sqrt(V) * Derivative(term, op.args[0].args[0])
+                                                 + op.args[0].args[1]**2 / (2 * V) * Derivative(term, op.args[0].args[0], op.args[0].args[0])})
+            else:
+                print('Something went wrong!')
+            rhs_vKE += rhs_dict[key][3].subs(PhiConstDict) * (term.doit() - func)
+
+    return rhs_vKE.expand(), lhs_vKE, substring
+
+
+@utils._cachedOnDisk
 def _get_orderedLists_vKE(stoich):
     """Create list of dictionaries where the key is the system size order."""
     V = Symbol(r'\overline{V}', real=True, constant=True)
     stoichiometry = stoich
-    rhs_vke, lhs_vke, substring = views._doVanKampenExpansion(views._deriveMasterEquation, stoichiometry)
+    rhs_vke, lhs_vke, substring = _doVanKampenExpansion(_deriveMasterEquation, stoichiometry)
     Vlist_lhs = []
     Vlist_rhs = []
     for jj in range(len(rhs_vke.args)):
@@ -2268,6 +2936,7 @@ def _get_orderedLists_vKE(stoich):
     return Vlist_lhs, Vlist_rhs, substring
 
 
+@utils._cachedOnDisk
 def _getFokkerPlanckEquation(_get_orderedLists_vKE, stoich):
     """Return the Fokker-Planck equation."""
     t = symbols('t')
@@ -2318,6 +2987,7 @@ def _getFokkerPlanckEquation(_get_orderedLists_vKE, stoich):
     return SOL_FPE, substring
 
 
+@utils._cachedOnDisk
 def _getNoiseEOM(_getFokkerPlanckEquation, _get_orderedLists_vKE, stoich):
     """Calculates noise in the system.
 
@@ -2500,6 +3170,7 @@ def _getNoiseEOM(_getFokkerPlanckEquation, _get_orderedLists_vKE, stoich):
     return EQsys1stOrdMom, EOM_1stOrderMom, NoiseSubs1stOrder, EQsys2ndOrdMom, EOM_2ndOrderMom, NoiseSubs2ndOrder
 
 
+@utils._cachedOnDisk
 def _getNoiseStationarySol(_getNoiseEOM, _getFokkerPlanckEquation, _get_orderedLists_vKE, stoich):
     """Calculate noise in the system.
 
@@ -2629,6 +3300,7 @@ def _getNoiseStationarySol(_getNoiseEOM, _getFokkerPlanckEquation, _get_orderedL
     return SOL_1stOrderMom[0], NoiseSubs1stOrder, SOL_2ndOrdMomDict, NoiseSubs2ndOrder
 
 
+@utils._cachedOnDisk
 def _getODEs_vKE(_get_orderedLists_vKE, stoich):
     """Return the ODE system derived from Master equation."""
     t = symbols('t')
@@ -1,8 +1,22 @@
+import ast
+from collections.abc import Mapping
+import functools
+import hashlib
+import heapq
+import importlib
+import itertools
+import json
 import math
+import multiprocessing
 import numbers
+import os
+import tempfile
+import time
 from typing import Optional, List
 
 import numpy as np
+from scipy.sparse import csgraph, csr_matrix
+import sympy
 from sympy.parsing.latex import parse_latex
 from warnings import warn
 
@@ -23,6 +37,32 @@ def about() -> None:
     print("Documentation: https://mumot.readthedocs.io/")
 
 
+class _LazyModule:
+    """Stand-in for module ``name`` that imports it on first attribute access.
+
+    Used for modules that are expensive to import but not needed by every
+    code path (e.g. plotting and widget code for headless use).
+
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+def _importOptional(name: str, feature: str):
+    """Import and return the optional dependency ``name``, required by ``feature``, raising a :class:`MuMoTValueError` if it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        raise exceptions.MuMoTValueError(f"{feature} requires the optional package '{name.split('.')[0]}'") from None
+
+
 def _greekPrependify(s: str) -> str:
     """Prepend two backslash symbols in front of Greek letters to enable proper LaTeX rendering."""
     for i, letter in enumerate(consts.GREEK_LETT_LIST_1):
@@ -308,6 +348,12 @@ def _format_advanced_option(optionName: str, inputValue, initValues, extraParam=
             defaultValue=False,
             initValue=initValues,
             paramNameForErrorMsg=optionName)
+    if optionName == 'boundedArena':
+        return _parse_input_keyword_for_boolean_widgets(
+            inputValue=inputValue,
+            defaultValue=False,
+            initValue=initValues,
+            paramNameForErrorMsg=optionName)
     if optionName == 'showInteractions':
         return _parse_input_keyword_for_boolean_widgets(
             inputValue=inputValue,
@@ -367,6 +413,13 @@ def _format_advanced_option(optionName: str, inputValue, initValues, extraParam=
             initValueRangeStep=initValues,
             validRange=(1, float("inf")))
 
+    if optionName == 'nWorkers':
+        return _parse_input_keyword_for_numeric_widgets(
+            inputValue=inputValue,
+            defaultValueRangeStep=[1, 1, max(multiprocessing.cpu_count(), 1), 1],
+            initValueRangeStep=initValues,
+            validRange=(1, float("inf")))
+
     if optionName == 'aggregateResults':
         return _parse_input_keyword_for_boolean_widgets(
             inputValue=inputValue,
@@ -374,6 +427,27 @@ def _format_advanced_option(optionName: str, inputValue, initValues, extraParam=
             initValue=initValues,
             paramNameForErrorMsg=optionName)
 
+    if optionName == 'method':
+        validMethods = ['direct', 'next-reaction', 'tau-leap']
+        if inputValue is not None:
+            if inputValue not in validMethods:  # terminating the process if the input argument is wrong
+                errorMsg = (f"The specified value for method = {inputValue} is not valid.\n"
+                            f"Valid values are: {validMethods}. Please correct it and retry.")
+                raise exceptions.MuMoTValueError(errorMsg)
+            return [inputValue, True]
+        else:
+            if initValues in validMethods:
+                return [initValues, False]
+            else:
+                return ['direct', False]  # as default method is the Gillespie direct method
+
+    if optionName == 'epsilon':
+        return _parse_input_keyword_for_numeric_widgets(
+            inputValue=inputValue,
+            defaultValueRangeStep=[0.03, 0.01, 0.2, 0.01],
+            initValueRangeStep=initValues,
+            validRange=(0, 1))
+
     if optionName == 'initBifParam':
         return _parse_input_keyword_for_numeric_widgets(
             inputValue=inputValue,
@@ -572,3 +646,697 @@ def _make_autopct(values):
         val = int(round(pct * total / 100.0))
         return '{p:.2f}%  ({v:d})'.format(p=pct, v=val)
     return my_autopct
+
+
+class _IndexedPriorityQueue:
+    """Binary min-heap of putative reaction times, indexed by reaction.
+
+    Used by the next-reaction method (Gibson and Bruck, 2000) to retrieve the
+    next reaction in O(1) and to update the time of any reaction in O(log R).
+
+    """
+    # heap of reaction indices ordered by their putative time
+    _heap = None
+    # position of each reaction index in _heap
+    _position = None
+    # putative time of each reaction index
+    _times = None
+
+    def __init__(self, times) -> None:
+        self._times = list(times)
+        self._heap = sorted(range(len(self._times)), key=lambda idx: self._times[idx])
+        self._position = [0] * len(self._times)
+        for pos, idx in enumerate(self._heap):
+            self._position[idx] = pos
+
+    def top(self):
+        """Return the pair (reaction index, time) of the earliest reaction."""
+        idx = self._heap[0]
+        return (idx, self._times[idx])
+
+    def time(self, idx: int) -> float:
+        """Return the putative time of reaction ``idx``."""
+        return self._times[idx]
+
+    def update(self, idx: int, newTime: float) -> None:
+        """Set the putative time of reaction ``idx`` to ``newTime`` and restore the heap order."""
+        oldTime = self._times[idx]
+        self._times[idx] = newTime
+        if newTime < oldTime:
+            self._siftUp(self._position[idx])
+        else:
+            self._siftDown(self._position[idx])
+
+    def _swap(self, pos1: int, pos2: int) -> None:
+        self._heap[pos1], self._heap[pos2] = self._heap[pos2], self._heap[pos1]
+        self._position[self._heap[pos1]] = pos1
+        self._position[self._heap[pos2]] = pos2
+
+    def _siftUp(self, pos: int) -> None:
+        while pos > 0:
+            parent = (pos - 1) // 2
+            if self._times[self._heap[pos]] >= self._times[self._heap[parent]]:
+                break
+            self._swap(pos, parent)
+            pos = parent
+
+    def _siftDown(self, pos: int) -> None:
+        size = len(self._heap)
+        while True:
+            smallest = pos
+            for child in (2 * pos + 1, 2 * pos + 2):
+                if child < size and self._times[self._heap[child]] < self._times[self._heap[smallest]]:
+                    smallest = child
+            if smallest == pos:
+                break
+            self._swap(pos, smallest)
+            pos = smallest
+
+
+class _TrajectoryRecorder(Mapping):
+    """Time evolution of the populations of a stochastic simulation, recorded in chunked NumPy arrays.
+
+    Maps ``'time'`` and each state to the array of its recorded values (the
+    constant reactants map to their initial value only).  Records are
+    written in preallocated chunks of ``chunkSize`` rows; full chunks are
+    kept in memory or, if ``spillDir`` is given, appended to anonymous files
+    in that directory and memory-mapped when read, so that the memory used
+    is bounded by the chunk size.  If ``samplingInterval`` is given, the
+    (piecewise-constant) trajectory is recorded at times 0, Δt, 2Δt, ...
+    (up to ``endTime``, if given) rather than at every step.
+
+    """
+    # states in the order of the recorded populations
+    _states = None
+    # initial value of the constant reactants (not recorded over time)
+    _constants = None
+    # number of rows of each chunk
+    _chunkSize = None
+    # time interval between records (None to record every step)
+    _samplingInterval = None
+    # latest sampling time (None for no limit; only when resampling)
+    _endTime = None
+    # full chunks kept in memory as (times, populations) arrays
+    _chunks = None
+    # files where full chunks are spilled as (times, populations) (None to keep them in memory)
+    _spillFiles = None
+    # number of rows written to the spill files
+    _spilledRows = 0
+    # times of the current chunk
+    _times = None
+    # populations of the current chunk (one row per record)
+    _populations = None
+    # number of rows filled in the current chunk
+    _size = 0
+    # populations at the latest step (only when resampling)
+    _lastPopulations = None
+    # index of the next sampling time (only when resampling)
+    _nextSample = 0
+    # (times, populations) arrays of all the records, cached until the next record
+    _arraysCache = None
+
+    def __init__(self, states, constants=None, chunkSize: int = 8192, samplingInterval: Optional[float] = None,
+                 spillDir: Optional[str] = None, endTime: Optional[float] = None) -> None:
+        self._states = list(states)
+        self._constants = dict(constants) if constants is not None else {}
+        self._chunkSize = chunkSize
+        self._samplingInterval = samplingInterval
+        self._endTime = endTime
+        self._chunks = []
+        if spillDir is not None:
+            self._spillFiles = (tempfile.TemporaryFile(dir=spillDir), tempfile.TemporaryFile(dir=spillDir))
+        self._newChunk()
+
+    def __getstate__(self):
+        """Return the state used to pickle the recorder, with the spilled records loaded in memory."""
+        state = self.__dict__.copy()
+        times, populations = self._arrays()
+        state.update(_chunks=[(np.array(times), np.array(populations))], _spillFiles=None, _spilledRows=0,
+                     _times=np.empty(0), _populations=np.empty((0, len(self._states)), dtype=np.int64),
+                     _size=0, _arraysCache=None)
+        return state
+
+    def __getitem__(self, key):
+        if key in self._constants:
+            return np.array([self._constants[key]])
+        times, populations = self._arrays()
+        if key == 'time':
+            return times
+        return populations[:, self._states.index(key)]
+
+    def __iter__(self):
+        return iter(['time'] + self._states)
+
+    def __len__(self) -> int:
+        return len(self._states) + 1
+
+    def numRecords(self) -> int:
+        """Return the number of records (time points)."""
+        return self._spilledRows + sum(len(times) for times, _ in self._chunks) + self._size
+
+    def record(self, t: float, populations) -> None:
+        """Record the ``populations`` of the states (in the recorder order) reached at time ``t``."""
+        if self._samplingInterval is None:
+            self._append(t, populations)
+            return
+        if self._lastPopulations is not None:
+            # the sampling times before t are in the state reached at the latest step
+            while self._nextSample * self._samplingInterval < t and self._beforeEndTime(self._nextSample * self._samplingInterval):
+                self._append(self._nextSample * self._samplingInterval, self._lastPopulations)
+                self._nextSample += 1
+        self._lastPopulations = np.array(populations, dtype=np.int64)
+
+    def _beforeEndTime(self, t: float) -> bool:
+        """Return True if a sample can be recorded at time ``t``, i.e. ``t`` is not later than ``_endTime``."""
+        return self._endTime is None or t < self._endTime or _almostEqual(t, self._endTime)
+
+    def restore(self, times, populations, lastPopulations) -> None:
+        """Restore previously recorded ``times`` and ``populations`` (as returned by :meth:`arrays`), with the ``lastPopulations`` of the latest step."""
+        for t, rowPopulations in zip(times, populations):
+            self._append(t, rowPopulations)
+        if self._samplingInterval is not None:
+            self._nextSample = len(times)
+            self._lastPopulations = np.array(lastPopulations, dtype=np.int64)
+
+    def finalise(self, endTime: float):
+        """Complete the records up to ``endTime`` and return the time evolution as a dictionary of arrays."""
+        if self._samplingInterval is not None and self._lastPopulations is not None:
+            while (self._nextSample * self._samplingInterval < endTime or
+                   _almostEqual(self._nextSample * self._samplingInterval, endTime)):
+                self._append(self._nextSample * self._samplingInterval, self._lastPopulations)
+                self._nextSample += 1
+        if self._spillFiles is not None:
+            # spill the last chunk too, so that all records are memory-mapped rather than copied
+            self._spill()
+        return dict(self.items())
+
+    def arrays(self):
+        """Return the times and the populations (one row per time, one column per state) of all the records."""
+        return self._arrays()
+
+    def _arrays(self):
+        if self._arraysCache is None:
+            timesParts = [times for times, _ in self._chunks]
+            populationsParts = [populations for _, populations in self._chunks]
+            if self._spilledRows > 0:
+                for spillFile in self._spillFiles:
+                    spillFile.flush()
+                timesParts.insert(0, np.memmap(self._spillFiles[0], dtype=np.float64, mode='r',
+                                               shape=(self._spilledRows,)))
+                populationsParts.insert(0, np.memmap(self._spillFiles[1], dtype=np.int64, mode='r',
+                                                     shape=(self._spilledRows, len(self._states))))
+            if self._size > 0 or not timesParts:
+                timesParts.append(self._times[:self._size])
+                populationsParts.append(self._populations[:self._size])
+            if len(timesParts) == 1 and self._size == 0:
+                self._arraysCache = (timesParts[0], populationsParts[0])
+            else:
+                self._arraysCache = (np.concatenate(timesParts), np.concatenate(populationsParts))
+        return self._arraysCache
+
+    def _append(self, t: float, populations) -> None:
+        if self._size == self._chunkSize:
+            if self._spillFiles is not None:
+                self._spill()
+            else:
+                self._chunks.append((self._times, self._populations))
+                self._newChunk()
+        self._times[self._size] = t
+        self._populations[self._size] = populations
+        self._size += 1
+        self._arraysCache = None
+
+    def _spill(self) -> None:
+        """Append the current chunk to the spill files and empty it."""
+        self._spillFiles[0].write(self._times[:self._size].tobytes())
+        self._spillFiles[1].write(self._populations[:self._size].tobytes())
+        self._spilledRows += self._size
+        self._size = 0
+        self._arraysCache = None
+
+    def _newChunk(self) -> None:
+        self._times = np.empty(self._chunkSize)
+        self._populations = np.empty((self._chunkSize, len(self._states)), dtype=np.int64)
+        self._size = 0
+
+
+class _FrameLimiter:
+    """Wall-clock limiter of the rate of (expensive) updates, such as redrawing a figure."""
+    # minimum wall-clock time between two updates (in seconds)
+    _interval = None
+    # wall-clock time of the last update
+    _lastUpdate = None
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._lastUpdate = -math.inf
+
+    def ready(self) -> bool:
+        """Return True (and start a new interval) if at least the minimum interval has elapsed since the last update."""
+        now = time.perf_counter()
+        if now - self._lastUpdate < self._interval:
+            return False
+        self._lastUpdate = now
+        return True
+
+
+def _latticePoints(dimensions: int, pointsPerAxis: int, upper: float = 1.0, simplex: bool = True):
+    """Return the points of a regular lattice on the box [0, ``upper``]^``dimensions`` as an array of shape (points, dimensions).
+
+    If ``simplex``, only the points with coordinates summing up to at most ``upper`` are returned.
+
+    """
+    axis = np.linspace(0, upper, pointsPerAxis)
+    points = np.stack(np.meshgrid(*([axis] * dimensions), indexing='ij'), axis=-1).reshape(-1, dimensions)
+    if simplex:
+        points = points[points.sum(axis=1) <= upper * (1 + 1e-12)]
+    return points
+
+
+def _uniformSimplexPoints(numPoints: int, dimensions: int, upper: float = 1.0, simplex: bool = True, rng=np.random):
+    """Return ``numPoints`` points drawn uniformly from [0, ``upper``]^``dimensions`` as an array of shape (numPoints, dimensions).
+
+    If ``simplex``, the points are drawn uniformly from the part of the box
+    with coordinates summing up to at most ``upper`` instead, as the first
+    ``dimensions`` coordinates of normalised exponential variates (uniform
+    on the standard simplex of one more dimension), so that no point is
+    rejected.
+
+    """
+    if not simplex:
+        return rng.uniform(0, upper, size=(numPoints, dimensions))
+    variates = rng.exponential(size=(numPoints, dimensions + 1))
+    return upper * variates[:, :dimensions] / variates.sum(axis=1, keepdims=True)
+
+
+def _adaptiveMeshPoints(func, dimensions: int, axisPoints: int, numPoints: int, upper: float = 1.0, coarseMask=None,
+                        maskFunc=None, maxLevels: int = 16):
+    """Return ``numPoints`` points in [0, ``upper``]^``dimensions`` and the values of the vector field ``func`` in them.
+
+    The points start from a regular coarse lattice of ``axisPoints`` points
+    per axis; the cells of the lattice in which the field changes most
+    relative to its magnitude (e.g. close to nullclines and fixed points) are
+    then bisected, most varying cells first, until the point budget is spent
+    (or no cell can be bisected further).  ``func`` maps an array of shape
+    (dimensions, points) to the field values of the same shape.
+
+    ``coarseMask`` is a boolean array of shape (``axisPoints``,) *
+    ``dimensions``, indexed as ``np.meshgrid(..., indexing='ij')``, marking
+    coarse points outside the domain; ``maskFunc`` maps refined points of
+    shape (points, dimensions) to the same marks.  Cells with all corners
+    outside the domain are not refined.  Returns the points and field values
+    as arrays of shape (points, dimensions) and the mask of the points.
+
+    """
+    # points are kept as integer coordinates in units of the finest refinement level
+    unit = 2 ** maxLevels
+    scale = upper / ((axisPoints - 1) * unit)
+    corners = np.array(list(itertools.product((0, 1), repeat=dimensions)))
+    subdivision = np.array(list(itertools.product((0, 1, 2), repeat=dimensions)))
+    coarseKeys = np.stack(np.meshgrid(*([np.arange(axisPoints) * unit] * dimensions), indexing='ij'), axis=-1).reshape(-1, dimensions)
+    index = {tuple(key): row for row, key in enumerate(coarseKeys)}
+    points = [coarseKeys * scale]
+    with np.errstate(all='ignore'):
+        values = [np.asarray(func(points[0].T), dtype=float).T]
+    masks = [np.zeros(len(coarseKeys), dtype=bool) if coarseMask is None else np.asarray(coarseMask, dtype=bool).ravel()]
+    allValues, allMasks = values[0], masks[0]
+    heap = []
+
+    def pushCell(lower, size):
+        rows = [index.get(tuple(lower + size * corner)) for corner in corners]
+        if None in rows or np.all(allMasks[rows]):
+            return
+        cornerValues = allValues[rows]
+        score = (np.max(np.linalg.norm(cornerValues - cornerValues.mean(axis=0), axis=1)) /
+                 (np.linalg.norm(cornerValues, axis=1).mean() + 1e-12))
+        if np.isfinite(score) and size >= 2:
+            heapq.heappush(heap, (-score, len(heap), size, tuple(lower)))
+
+    for lower in coarseKeys[np.all(coarseKeys < (axisPoints - 1) * unit, axis=1)]:
+        pushCell(lower, unit)
+    newPerCell = 3 ** dimensions - 2 ** dimensions
+    while heap and len(index) < numPoints:
+        remaining = numPoints - len(index)
+        cells = [heapq.heappop(heap)[2:] for _ in range(min(len(heap), max(1, remaining // newPerCell)))]
+        newKeys = {}
+        for size, lower in cells:
+            for key in np.array(lower) + size // 2 * subdivision:
+                if tuple(key) not in index:
+                    newKeys.setdefault(tuple(key), key)
+        newKeys = np.array(list(newKeys.values())[:remaining], dtype=np.int64).reshape(-1, dimensions)
+        if len(newKeys) > 0:
+            for row, key in enumerate(newKeys, start=len(index)):
+                index[tuple(key)] = row
+            points.append(newKeys * scale)
+            with np.errstate(all='ignore'):
+                values.append(np.asarray(func(points[-1].T), dtype=float).T)
+            masks.append(np.zeros(len(newKeys), dtype=bool) if maskFunc is None else np.asarray(maskFunc(points[-1]), dtype=bool))
+            allValues, allMasks = np.concatenate(values), np.concatenate(masks)
+        for size, lower in cells:
+            for corner in corners:
+                pushCell(np.array(lower) + size // 2 * corner, size // 2)
+    return np.concatenate(points), allValues, allMasks
+
+
+def _multiStartNewton(func, jac, starts, tolerance: float = 1e-10, maxIterations: int = 50):
+    """Return the roots of ``func`` reached by Newton iterations from each of the ``starts``.
+
+    ``func`` maps an array of shape (dimensions, points) to the array of the
+    function values of the same shape, ``jac`` maps it to the array of the
+    Jacobian matrices of shape (points, dimensions, dimensions).  All starts
+    are iterated together; those that diverge or do not converge to a root
+    (to within ``tolerance``) are discarded.  The returned array of shape
+    (roots, dimensions) can contain the same root more than once.
+
+    """
+    points = np.array(starts, dtype=float).T
+    with np.errstate(all='ignore'):
+        for _ in range(maxIterations):
+            points = points[:, np.all(np.isfinite(points), axis=0)]
+            if points.shape[1] == 0:
+                break
+            # pseudo-inverse, so that singular Jacobians do not stop the iterations of the other starts
+            step = np.einsum('nij,jn->in', np.linalg.pinv(jac(points)), func(points))
+            points = points - step
+            if np.all(np.abs(step) <= tolerance):
+                break
+        points = points[:, np.all(np.isfinite(points), axis=0)]
+        residuals = np.max(np.abs(func(points)), axis=0) if points.shape[1] > 0 else np.zeros(0)
+    return points[:, residuals <= np.sqrt(tolerance)].T
+
+
+def _classifyStability(eigenvalues, eps: float = 1e-8) -> str:
+    """Classify the linear stability of a fixed point from the ``eigenvalues`` of the Jacobian in it.
+
+    Returns 'stable' if all real parts are negative, 'unstable' if all are
+    positive, 'saddle' if there are both and 'marginal' if any real part is
+    zero (to within ``eps``).
+
+    """
+    realParts = [float(sympy.re(eigenvalue)) for eigenvalue in eigenvalues]
+    if any(abs(realPart) <= eps for realPart in realParts):
+        return 'marginal'
+    if all(realPart < 0 for realPart in realParts):
+        return 'stable'
+    if all(realPart > 0 for realPart in realParts):
+        return 'unstable'
+    return 'saddle'
+
+
+def _solveWithTimeout(equations, unknowns, timeout: Optional[float] = None) -> Optional[list]:
+    """Return ``sympy.solve(equations, unknowns, dict=True)``, or None if it takes longer than ``timeout`` seconds or cannot solve the equations.
+
+    With a ``timeout`` the equations are solved in a worker process, which is
+    terminated when the time is up.
+
+    """
+    if timeout is None:
+        try:
+            return sympy.solve(equations, unknowns, dict=True)
+        except NotImplementedError:
+            return None
+    pool = multiprocessing.Pool(1)
+    try:
+        return pool.apply_async(_solveWithTimeout, (equations, unknowns)).get(timeout)
+    except multiprocessing.TimeoutError:
+        return None
+    finally:
+        pool.terminate()
+
+
+def _eigenvalueSets(jacobian, eps: float = 1e-8) -> dict:
+    """Return the eigenvalues of the numeric matrix ``jacobian`` in the format of ``sympy.Matrix.eigenvects``.
+
+    Keys are the eigenvalues as sympy numbers, values are their
+    multiplicities and lists of eigenvectors; eigenvalues closer than
+    ``eps`` are grouped together.
+
+    """
+    def sympyNumber(value):
+        value = complex(value)
+        real = sympy.Float(value.real) if abs(value.real) > eps else sympy.Integer(0)
+        return real + sympy.I * sympy.Float(value.imag) if abs(value.imag) > eps else real
+
+    eigenvalues, eigenvectors = np.linalg.eig(np.asarray(jacobian))
+    evSet = {}
+    grouped = np.zeros(len(eigenvalues), dtype=bool)
+    for kk in range(len(eigenvalues)):
+        if grouped[kk]:
+            continue
+        same = np.flatnonzero(~grouped & (np.abs(eigenvalues - eigenvalues[kk]) <= eps))
+        grouped[same] = True
+        evSet[sympyNumber(eigenvalues[kk])] = (len(same), [sympy.Matrix([sympyNumber(value) for value in eigenvectors[:, jj]])
+                                                           for jj in same])
+    return evSet
+
+
+def _toroidalNeighbourLists(xs, ys, distanceRange: float, width: float, height: float, periodic: bool = True) -> List[List[int]]:
+    """Return, for each point, the sorted indices of the other points closer than ``distanceRange`` on the torus ``width`` x ``height``.
+
+    Points are binned in a periodic cell list with cells no smaller than
+    ``distanceRange``, so that only the points in the 3x3 block of cells
+    around each cell need to be compared.  Distances are computed as in
+    :meth:`MuMoTmultiagentView._distance_on_torus` (or as plain Euclidean
+    distances in the rectangle if ``periodic`` is False) and the result is
+    the same as comparing all pairs.
+
+    """
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    numPoints = len(xs)
+    neighbours = [[] for _ in range(numPoints)]
+    if numPoints < 2 or distanceRange <= 0:
+        return neighbours
+    numCellsX = max(1, int(width // distanceRange))
+    numCellsY = max(1, int(height // distanceRange))
+    cellX = np.floor(xs * (numCellsX / width)).astype(int) % numCellsX
+    cellY = np.floor(ys * (numCellsY / height)).astype(int) % numCellsY
+    cellIds = cellX * numCellsY + cellY
+    order = np.argsort(cellIds, kind='stable')
+    cellStarts = np.searchsorted(cellIds[order], np.arange(numCellsX * numCellsY + 1))
+    # with fewer than three cells along an axis, the neighbouring cells wrap onto the same cell
+    offsetsX = sorted({dx % numCellsX for dx in (-1, 0, 1)})
+    offsetsY = sorted({dy % numCellsY for dy in (-1, 0, 1)})
+
+    for cell in np.unique(cellIds):
+        cx, cy = divmod(int(cell), numCellsY)
+        members = order[cellStarts[cell]:cellStarts[cell + 1]]
+        candidates = np.concatenate([order[cellStarts[nc]:cellStarts[nc + 1]]
+                                     for nc in {((cx + dx) % numCellsX) * numCellsY + (cy + dy) % numCellsY
+                                                for dx in offsetsX for dy in offsetsY}])
+        candidates.sort()
+        dx = np.abs(xs[members, None] - xs[None, candidates])
+        dy = np.abs(ys[members, None] - ys[None, candidates])
+        if periodic:
+            dx = np.minimum(dx, width - dx)
+            dy = np.minimum(dy, height - dy)
+        distances = np.sqrt(dx**2 + dy**2)
+        close = (distances < distanceRange) & (members[:, None] != candidates[None, :])
+        for row, member in enumerate(members):
+            neighbours[member] = candidates[close[row]].tolist()
+    return neighbours
+
+
+def _csrFromGraph(graph):
+    """Return the adjacency of a networkx graph with nodes ``0, ..., n-1`` as CSR ``(indptr, indices)`` arrays.
+
+    The neighbours of each node are listed in the same order as in ``graph``.
+
+    """
+    numNodes = graph.number_of_nodes()
+    indptr = np.zeros(numNodes + 1, dtype=int)
+    indptr[1:] = np.cumsum([len(graph.adj[node]) for node in range(numNodes)])
+    indices = np.fromiter((neigh for node in range(numNodes) for neigh in graph.adj[node]), dtype=int, count=indptr[-1])
+    return indptr, indices
+
+
+def _erdosRenyiCSR(numNodes: int, linkProbability: float):
+    """Sample a G(n,p) random graph and return its adjacency as CSR ``(indptr, indices)`` arrays (with sorted neighbours).
+
+    The node pairs are enumerated in a fixed order and the links are found by
+    drawing the geometrically distributed gaps between consecutive linked
+    pairs, so that the cost is proportional to the number of links rather
+    than to the number of pairs.
+
+    """
+    numPairs = numNodes * (numNodes - 1) // 2
+    if linkProbability >= 1:
+        pairs = np.arange(numPairs, dtype=np.int64)
+    else:
+        meanLinks = numPairs * linkProbability
+        chunkSize = int(meanLinks + 5 * math.sqrt(meanLinks) + 10)
+        chunks = []
+        lastPair = -1
+        while lastPair < numPairs:
+            chunks.append(lastPair + np.cumsum(np.random.geometric(linkProbability, size=chunkSize)))
+            lastPair = chunks[-1][-1]
+        pairs = np.concatenate(chunks)
+        pairs = pairs[pairs < numPairs]
+    # pair k is the link (u, v) with v < u and k = u (u - 1) / 2 + v
+    us = ((1 + np.sqrt(1 + 8 * pairs.astype(float))) // 2).astype(np.int64)
+    us -= us * (us - 1) // 2 > pairs  # correct floating-point rounding
+    us += (us + 1) * us // 2 <= pairs
+    vs = pairs - us * (us - 1) // 2
+    rows = np.concatenate((us, vs))
+    cols = np.concatenate((vs, us))
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(numNodes + 1, dtype=int)
+    indptr[1:] = np.cumsum(np.bincount(rows, minlength=numNodes))
+    return indptr, cols[order].astype(int)
+
+
+def _isConnectedCSR(indptr, indices) -> bool:
+    """Return True if the undirected graph with CSR adjacency ``(indptr, indices)`` is connected."""
+    numNodes = len(indptr) - 1
+    if numNodes <= 1:
+        return True
+    if np.diff(indptr).min() == 0:  # isolated node
+        return False
+    adjacency = csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(numNodes, numNodes))
+    return csgraph.connected_components(adjacency, directed=False, return_labels=False) == 1
+
+
+def _encodeSymbolic(obj, canonical=False):
+    """Convert nested containers of sympy objects into plain Python structures.
+
+    Sympy objects are stored by their ``srepr``, which (unlike pickling)
+    also supports undefined functions.  With ``canonical`` set, dictionary
+    items are sorted so that the encoding can be hashed.
+
+    """
+    if isinstance(obj, sympy.Basic):
+        return ('sympy', sympy.srepr(obj))
+    if isinstance(obj, dict):
+        items = [(_encodeSymbolic(key, canonical), _encodeSymbolic(value, canonical)) for key, value in obj.items()]
+        if canonical:
+            items = sorted(items, key=repr)
+        return ('dict', items)
+    if isinstance(obj, (list, tuple)):
+        return (type(obj).__name__, [_encodeSymbolic(item, canonical) for item in obj])
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return ('py', obj)
+    raise TypeError(f"Cannot encode object of type {type(obj)}")
+
+
+@functools.lru_cache(maxsize=None)
+def _sreprNamespace() -> dict:
+    """Return the names allowed in ``srepr`` text: sympy classes and singletons (e.g. ``pi``)."""
+    namespace = {name: obj for name, obj in vars(sympy).items()
+                 if not name.startswith('_') and (isinstance(obj, type) or isinstance(obj, sympy.Basic))}
+    namespace.update({'True': True, 'False': False, 'None': None})
+    return namespace
+
+
+# classes whose ``srepr`` takes a string (a name or a decimal number) as first argument
+_SREPR_STRING_CALLS = ('Symbol', 'Dummy', 'Wild', 'Function', 'Float')
+
+
+def _evalSrepr(node, allowString=False):
+    """Build the sympy object described by the ``srepr`` syntax tree ``node``.
+
+    Only calls, sympy names, literals (and lists and tuples of them) are
+    accepted.  String literals are accepted only as the first argument of
+    the classes in ``_SREPR_STRING_CALLS``, as sympy converts strings passed
+    to other classes with :func:`sympy.sympify`, which evaluates them.
+
+    """
+    if isinstance(node, ast.Constant) and (allowString or not isinstance(node.value, str)):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant) \
+            and isinstance(node.operand.value, (int, float)):
+        return -node.operand.value
+    if isinstance(node, ast.Name) and node.id in _sreprNamespace():
+        return _sreprNamespace()[node.id]
+    if isinstance(node, (ast.List, ast.Tuple)):
+        items = [_evalSrepr(item) for item in node.elts]
+        return items if isinstance(node, ast.List) else tuple(items)
+    if isinstance(node, ast.Call) and all(keyword.arg is not None for keyword in node.keywords):
+        func = _evalSrepr(node.func)
+        stringArgument = isinstance(node.func, ast.Name) and node.func.id in _SREPR_STRING_CALLS
+        args = [_evalSrepr(arg, allowString=stringArgument and idx == 0) for idx, arg in enumerate(node.args)]
+        kwargs = {keyword.arg: _evalSrepr(keyword.value) for keyword in node.keywords}
+        return func(*args, **kwargs)
+    raise ValueError(f"Unsupported expression in srepr text: {ast.dump(node)}")
+
+
+def _decodeSymbolic(encoded):
+    """Rebuild the object encoded by :func:`_encodeSymbolic`."""
+    kind, value = encoded
+    if kind == 'sympy':
+        return _evalSrepr(ast.parse(value, mode='eval').body)
+    if kind == 'dict':
+        return {_decodeSymbolic(key): _decodeSymbolic(item) for key, item in value}
+    if kind == 'list':
+        return [_decodeSymbolic(item) for item in value]
+    if kind == 'tuple':
+        return tuple(_decodeSymbolic(item) for item in value)
+    return value
+
+
+def _evictSymbolicCache(cacheDir, maxBytes):
+    """Remove least recently used cache entries until the cache fits in ``maxBytes``."""
+    entries = []
+    for entry in os.scandir(cacheDir):
+        if entry.name.endswith('.json'):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    totalBytes = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if totalBytes <= maxBytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        totalBytes -= size
+
+
+def _cachedOnDisk(func):
+    """Cache the result of a symbolic derivation on disk across sessions.
+
+    The decorated function must take the model stoichiometry as its last
+    positional argument.  Results are content-addressed by a hash of the
+    function name, the MuMoT and sympy versions and the canonicalised
+    stoichiometry, and stored as JSON text in ``MuMoTdefault._cacheDir``
+    (caching is disabled if it is None), which is kept below
+    ``MuMoTdefault._cacheMaxBytes`` by evicting the least recently used
+    entries.
+
+    """
+    @functools.wraps(func)
+    def wrapper(*args):
+        cacheDir = defaults.MuMoTdefault._cacheDir
+        if cacheDir is None:
+            return func(*args)
+        try:
+            keyData = (func.__name__, __version__, sympy.__version__, _encodeSymbolic(args[-1], canonical=True))
+        except TypeError:
+            return func(*args)
+        cachePath = os.path.join(cacheDir, hashlib.sha256(repr(keyData).encode()).hexdigest() + '.json')
+
+        try:
+            with open(cachePath, 'r') as cacheFile:
+                result = _decodeSymbolic(json.load(cacheFile))
+            # mark entry as recently used
+            os.utime(cachePath)
+            return result
+        except Exception:
+            # missing or unreadable entry: compute and (re)write it
+            pass
+
+        result = func(*args)
+        if result is None:
+            return result
+        try:
+            encoded = _encodeSymbolic(result)
+            os.makedirs(cacheDir, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', dir=cacheDir, suffix='.tmp', delete=False) as tmpFile:
+                json.dump(encoded, tmpFile)
+            os.replace(tmpFile.name, cachePath)
+            _evictSymbolicCache(cacheDir, defaults.MuMoTdefault._cacheMaxBytes)
+        except (OSError, TypeError):
+            pass
+
+        return result
+
+    return wrapper
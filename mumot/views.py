@@ -1,10 +1,18 @@
 """MuMoT view classes"""
 import bisect
+from collections import OrderedDict
+from concurrent.futures import as_completed, ProcessPoolExecutor
+import contextlib
 import copy
 import datetime
+from io import BytesIO
 import math
+import os
 import sys
+import tempfile
+import time
 from typing import Dict, Optional, Tuple, Union
+import zipfile
 
 from IPython.display import display, Math
 from IPython.utils import io
@@ -17,17 +25,12 @@ import matplotlib.ticker as ticker
 from mpl_toolkits.mplot3d import proj3d
 import numpy as np
 import networkx as nx
-import PyDSTool as dst
 from scipy.integrate import odeint
 import sympy
 from sympy import (
-    default_sort_key,
-    Derivative,
-    factorial,
     Function,
     lambdify,
     latex,
-    simplify,
     Symbol,
     symbols,
 )
@@ -36,10 +39,14 @@ from warnings import warn, catch_warnings, simplefilter
 
 from . import (
     consts,
+    defaults,
     exceptions,
     utils,
 )
 
+# PyDSTool is slow to import and only used for bifurcation analysis
+dst = utils._LazyModule('PyDSTool')
+
 
 figureCounter = 1  # global figure counter for model views
 
@@ -87,9 +94,20 @@ class MuMoTview:
     _chooseXrange = None
     # displayed range for horizontal axis
     _chooseYrange = None
+    # solver of the fixed points: 'numeric' (multi-start Newton iterations), 'symbolic' (sympy.solve) or 'parametric' (closed forms in the parameters)
+    _fixedPointSolver = None
+    # least recently used fixed points and eigenvalues, keyed on state variables and parameter values
+    _fixedPointCache = None
+    # lambdified closed-form fixed points and Jacobian for each tuple of state variables (None where sympy cannot solve them)
+    _parametricFixedPoints = None
 
     def __init__(self, model, controller, figure=None, params=None, **kwargs):
         self._silent = kwargs.get('silent', False)
+        self._fixedPointSolver = kwargs.get('fixedPointSolver', 'numeric')
+        if self._fixedPointSolver not in ('numeric', 'symbolic', 'parametric'):
+            raise exceptions.MuMoTValueError(f"Unknown fixedPointSolver '{self._fixedPointSolver}': accepted values are 'numeric', 'symbolic' and 'parametric'")
+        self._fixedPointCache = OrderedDict()
+        self._parametricFixedPoints = {}
         self._mumotModel = model
         self._controller = controller
         self._logs = []
@@ -299,8 +317,147 @@ class MuMoTview:
 
         return argDict
 
+    def _get_fixedPointsNumeric(self, stateVariables):
+        """Calculate stationary states by Newton iterations from a lattice of starting points in the domain of the ``stateVariables``.
+
+        The domain is the simplex of the proportions for constant system size, and the box [0, plotLimits] otherwise.
+        Returns the fixed points and the eigenvalues (with multiplicities and eigenvectors) of the Jacobian in them in the format of the symbolic solver,
+        or ``(None, None)`` if the equations depend on parameters without numeric values or if a fixed point is not isolated
+        (the Jacobian in it is singular, e.g. on a line of equilibria of a system with a conservation law among the ``stateVariables``),
+        which Newton iterations cannot resolve.
+
+        """
+        argDict = self._get_argDict()
+        params, equationsFunc, jacobianFunc = self._mumotModel._getJacobianFuncs(stateVariables)
+        try:
+            paramValues = [float(argDict[param]) for param in params]
+        except (KeyError, TypeError):
+            return None, None
+        dimensions = len(stateVariables)
+
+        def func(points):
+            return equationsFunc(points, paramValues).astype(float)
+
+        def jac(points):
+            return jacobianFunc(points, paramValues).astype(float)
+
+        simplex = bool(self._mumotModel._constantSystemSize)
+        upper = 1.0 if simplex else float(self._getPlotLimits())
+        starts = utils._latticePoints(dimensions, {1: 41, 2: 21, 3: 11}.get(dimensions, 7), upper, simplex)
+        eps = 1e-8
+        fixedPoints = []
+        for root in sorted(map(tuple, utils._multiStartNewton(func, jac, starts))):
+            root = np.array(root)
+            if np.any(root < -eps) or np.any(root > upper + eps) or (simplex and root.sum() > upper + eps):
+                continue
+            if all(np.max(np.abs(root - fixedPoint)) > 1e-6 for fixedPoint in fixedPoints):
+                fixedPoints.append(np.clip(root, 0, upper))
+        jacobians = jac(np.reshape(fixedPoints, (-1, dimensions)).T)
+        if len(fixedPoints) > 0 and np.min(np.linalg.svd(jacobians, compute_uv=False)[:, -1]) <= eps * max(np.max(np.abs(jacobians)), 1.0):
+            return None, None
+
+        realEQsol = [{stateVariable: sympy.Float(value) for stateVariable, value in zip(stateVariables, fixedPoint)}
+                     for fixedPoint in fixedPoints]
+        eigList = [utils._eigenvalueSets(jacobian) for jacobian in jacobians]
+        return realEQsol, eigList  # returns two lists of dictionaries
+
+    def _get_fixedPointsParametric(self, stateVariables):
+        """Calculate stationary states by evaluating closed forms of the fixed points and of the Jacobian in terms of the free parameters.
+
+        The closed forms are solved for once per view and lambdified, so that later parameter values only cost a numeric evaluation.
+        Returns the real fixed points and the eigenvalues of the Jacobian in them in the format of the symbolic solver,
+        or ``(None, None)`` if sympy cannot solve the equations in closed form within ``MuMoTdefault._parametricSolveTimeout`` seconds
+        or a parameter has no numeric value.
+
+        """
+        key = tuple(stateVariables)
+        if key not in self._parametricFixedPoints:
+            self._parametricFixedPoints[key] = None
+            equations = sympy.Matrix([self._mumotModel._equations[stateVariable] for stateVariable in stateVariables])
+            parameters = sorted(equations.free_symbols - set(stateVariables), key=str)
+            EQsol = utils._solveWithTimeout(list(equations), stateVariables, defaults.MuMoTdefault._parametricSolveTimeout) or []
+            EQsol = [solution for solution in EQsol
+                     if len(solution) == len(stateVariables) and
+                     not any(solution[stateVariable].free_symbols & set(stateVariables) for stateVariable in stateVariables)]
+            if EQsol:
+                numSolutions = lambdify(parameters, [[solution[stateVariable] for stateVariable in stateVariables] for solution in EQsol], 'numpy')
+                self._parametricFixedPoints[key] = (parameters, numSolutions)
+        if self._parametricFixedPoints[key] is None:
+            return None, None
+        parameters, numSolutions = self._parametricFixedPoints[key]
+        argDict = self._get_argDict()
+        if any(parameter not in argDict for parameter in parameters):
+            return None, None
+        eps = 1e-8
+        with np.errstate(all='ignore'):
+            fixedPoints = np.array(numSolutions(*[complex(argDict[parameter]) for parameter in parameters]), dtype=complex).reshape(-1, len(stateVariables))
+        fixedPoints = fixedPoints[np.all(np.isfinite(fixedPoints), axis=1) & np.all(np.abs(fixedPoints.imag) <= eps, axis=1)].real
+        realEQsol = [{stateVariable: sympy.Float(value) for stateVariable, value in zip(stateVariables, fixedPoint)}
+                     for fixedPoint in fixedPoints]
+        eigList, _ = self._mumotModel._getLinearStability(stateVariables, realEQsol, argDict)
+        return realEQsol, eigList  # returns two lists of dictionaries
+
+    def _get_fixedPoints(self, stateVariables, symbolicSolver):
+        """Return stationary states and eigenvalues of the Jacobian in them with the selected fixed-point solver.
+
+        Results are kept in a least recently used cache keyed on the parameter values, so that returning to recent slider positions does not solve again.
+        ``symbolicSolver`` is used for the 'symbolic' solver and where the 'numeric' or 'parametric' solvers cannot be applied.
+
+        """
+        argDict = self._get_argDict()
+        key = (tuple(stateVariables), self._getPlotLimits(),
+               tuple(sorted((str(symbol), value) for symbol, value in argDict.items())))
+        try:
+            hash(key)
+        except TypeError:
+            # parameters that are not plain values (e.g. initial states) are not cached
+            key = None
+        if key in self._fixedPointCache:
+            self._fixedPointCache.move_to_end(key)
+            return self._fixedPointCache[key]
+        realEQsol = None
+        if self._fixedPointSolver == 'parametric':
+            realEQsol, eigList = self._get_fixedPointsParametric(stateVariables)
+        if realEQsol is None and self._fixedPointSolver != 'symbolic':
+            realEQsol, eigList = self._get_fixedPointsNumeric(stateVariables)
+        if realEQsol is None:
+            realEQsol, eigList = symbolicSolver()
+        if realEQsol is not None and key is not None:
+            self._fixedPointCache[key] = (realEQsol, eigList)
+            while len(self._fixedPointCache) > max(defaults.MuMoTdefault._fixedPointCacheSize, 0):
+                self._fixedPointCache.popitem(last=False)
+        return realEQsol, eigList
+
     def _get_fixedPoints1d(self):
         """Calculate stationary states of 1D system."""
+        return self._get_fixedPoints([self._stateVariable1], self._solveFixedPoints1d)
+
+    def _get_fixedPoints2d(self):
+        """Calculate stationary states of 2d system."""
+        return self._get_fixedPoints([self._stateVariable1, self._stateVariable2], self._solveFixedPoints2d)
+
+    def _get_fixedPoints3d(self):
+        """Calculate stationary states of 3d system."""
+        return self._get_fixedPoints([self._stateVariable1, self._stateVariable2, self._stateVariable3], self._solveFixedPoints3d)
+
+    def _get_eigenvalueSets(self, stateVariables, realEQsol, JAC, argDict):
+        """Return the eigenvalues and eigenvectors of the Jacobian in each of the fixed points ``realEQsol``.
+
+        The model's compiled Jacobian is evaluated numerically where the fixed points and parameters have numeric values,
+        otherwise the eigenvectors of the symbolic Jacobian ``JAC`` are computed with sympy.
+
+        """
+        stability = self._mumotModel._getLinearStability(stateVariables, realEQsol, argDict)
+        if stability is not None:
+            return stability[0]
+        eigList = []
+        for fixedPoint in realEQsol:
+            eigVects = JAC.subs(list(fixedPoint.items())).eigenvects()
+            eigList.append({eigVect[0]: (eigVect[1], eigVect[2]) for eigVect in eigVects})
+        return eigList
+
+    def _solveFixedPoints1d(self):
+        """Calculate stationary states of 1D system with ``sympy.solve``."""
         argDict = self._get_argDict()
 
         EQ1 = self._mumotModel._equations[self._stateVariable1].subs(argDict)
@@ -315,20 +472,11 @@ class MuMoTview:
         MAT = sympy.Matrix([EQ1])
         JAC = MAT.jacobian([self._stateVariable1])
 
-        eigList = []
-        for nn in range(len(realEQsol)):
-            evSet = {}
-            JACsub = JAC.subs([(self._stateVariable1, realEQsol[nn][self._stateVariable1])])
-            # evSet = JACsub.eigenvals()
-            eigVects = JACsub.eigenvects()
-            for kk in range(len(eigVects)):
-                evSet[eigVects[kk][0]] = (eigVects[kk][1], eigVects[kk][2])
-            eigList.append(evSet)
+        eigList = self._get_eigenvalueSets([self._stateVariable1], realEQsol, JAC, argDict)
         return realEQsol, eigList  # returns two lists of dictionaries
 
-    def _get_fixedPoints2d(self):
-        """Calculate stationary states of 2d system."""
-
+    def _solveFixedPoints2d(self):
+        """Calculate stationary states of 2d system with ``sympy.solve``."""
         argDict = self._get_argDict()
 
         EQ1 = self._mumotModel._equations[self._stateVariable1].subs(argDict)
@@ -368,20 +516,11 @@ class MuMoTview:
         MAT = sympy.Matrix([EQ1, EQ2])
         JAC = MAT.jacobian([self._stateVariable1, self._stateVariable2])
 
-        eigList = []
-        for nn in range(len(realEQsol)):
-            evSet = {}
-            JACsub = JAC.subs([(self._stateVariable1, realEQsol[nn][self._stateVariable1]),
-                               (self._stateVariable2, realEQsol[nn][self._stateVariable2])])
-            # evSet = JACsub.eigenvals()
-            eigVects = JACsub.eigenvects()
-            for kk in range(len(eigVects)):
-                evSet[eigVects[kk][0]] = (eigVects[kk][1], eigVects[kk][2])
-            eigList.append(evSet)
+        eigList = self._get_eigenvalueSets([self._stateVariable1, self._stateVariable2], realEQsol, JAC, argDict)
         return realEQsol, eigList  # returns two lists of dictionaries
 
-    def _get_fixedPoints3d(self):
-        """Calculate stationary states of 3d system."""
+    def _solveFixedPoints3d(self):
+        """Calculate stationary states of 3d system with ``sympy.solve``."""
         argDict = self._get_argDict()
 
         EQ1 = self._mumotModel._equations[self._stateVariable1].subs(argDict)
@@ -425,17 +564,7 @@ class MuMoTview:
         MAT = sympy.Matrix([EQ1, EQ2, EQ3])
         JAC = MAT.jacobian([self._stateVariable1, self._stateVariable2, self._stateVariable3])
 
-        eigList = []
-        for nn in range(len(realEQsol)):
-            evSet = {}
-            JACsub = JAC.subs([(self._stateVariable1, realEQsol[nn][self._stateVariable1]),
-                               (self._stateVariable2, realEQsol[nn][self._stateVariable2]),
-                               (self._stateVariable3, realEQsol[nn][self._stateVariable3])])
-            # evSet = JACsub.eigenvals()
-            eigVects = JACsub.eigenvects()
-            for kk in range(len(eigVects)):
-                evSet[eigVects[kk][0]] = (eigVects[kk][1], eigVects[kk][2])
-            eigList.append(evSet)
+        eigList = self._get_eigenvalueSets([self._stateVariable1, self._stateVariable2, self._stateVariable3], realEQsol, JAC, argDict)
 
         return realEQsol, eigList  # returns two lists of dictionaries
 
@@ -753,21 +882,19 @@ class MuMoTtimeEvolutionView(MuMoTview):
         if not self._silent:
             self._plot_NumSolODE()
 
-    def _get_eqsODE(self, y_old, time):
-        """ Calculates right-hand side of ODE system."""
-        SVsub = {}
+    def _integrateODE(self, y0, time):
+        """Numerically integrate the ODE system from ``y0`` over ``time``.
 
-        for kk in range(len(self._stateVarList)):
-            SVsub[self._stateVarList[kk]] = y_old[kk]
+        Uses the model's compiled right-hand side and analytic Jacobian, with
+        parameter values passed as a numeric vector rather than substituted
+        symbolically.
 
+        """
+        params, rhs, jac = self._mumotModel._getODEfuncs(self._stateVarList)
         argDict = self._get_argDict()
-        ode_sys = []
-        for kk in range(len(self._stateVarList)):
-            EQ = self._mumotModel._equations[self._stateVarList[kk]].subs(argDict)
-            EQ = EQ.subs(SVsub)
-            ode_sys.append(EQ)
+        paramValues = [float(argDict[param]) for param in params]
 
-        return ode_sys
+        return odeint(rhs, y0, time, args=(paramValues,), Dfun=jac)
 
     def _plot_NumSolODE(self):
         if not self._silent:  # @todo is this necessary?
@@ -865,7 +992,7 @@ class MuMoTintegrateView(MuMoTtimeEvolutionView):
 
         self._y0 = y0
 
-        sol_ODE = odeint(self._get_eqsODE, y0, time)
+        sol_ODE = self._integrateODE(y0, time)
 
         sol_ODE_dict = {}
         for nn in range(len(self._stateVarList)):
@@ -1041,6 +1168,8 @@ class MuMoTnoiseCorrelationsView(MuMoTtimeEvolutionView):
     _maxTimeDS = None
     # time step of simulation for dynamical system to reach equilibrium (can be set via keyword)
     _tstepDS = None
+    # least recently used compiled noise correlation ODE systems and their initial values, keyed on steady state and parameter values
+    _noiseCorrODEsysCache = None
 
     def _constructorSpecificParams(self, _):
         if self._controller is not None:
@@ -1096,7 +1225,7 @@ class MuMoTnoiseCorrelationsView(MuMoTtimeEvolutionView):
             SV3_0 = initDict[sympy.Symbol(str(self._stateVariable3))]
             y0.append(SV3_0)
 
-        sol_ODE = odeint(self._get_eqsODE, y0, time)
+        sol_ODE = self._integrateODE(y0, time)
 
         if self._stateVariable3:
             realEQsol, eigList = self._get_fixedPoints3d()
@@ -1112,7 +1241,7 @@ class MuMoTnoiseCorrelationsView(MuMoTtimeEvolutionView):
             for kk in range(len(realEQsol)):
                 if self._stateVariable3:
                     if abs(realEQsol[kk][self._stateVariable1] - y_stationary[0]) <= eps and abs(realEQsol[kk][self._stateVariable2] - y_stationary[1]) <= eps and abs(realEQsol[kk][self._stateVariable3] - y_stationary[2]) <= eps:
-                        if all(sympy.sign(sympy.re(lam)) < 0 for lam in eigList[kk]):
+                        if utils._classifyStability(eigList[kk]) == 'stable':
                             steadyStateReached = True
                             steadyStateDict = {self._stateVariable1: realEQsol[kk][self._stateVariable1],
                                                self._stateVariable2: realEQsol[kk][self._stateVariable2],
@@ -1120,13 +1249,13 @@ class MuMoTnoiseCorrelationsView(MuMoTtimeEvolutionView):
 
                 elif self._stateVariable2:
                     if abs(realEQsol[kk][self._stateVariable1] - y_stationary[0]) <= eps and abs(realEQsol[kk][self._stateVariable2] - y_stationary[1]) <= eps:
-                        if all(sympy.sign(sympy.re(lam)) < 0 for lam in eigList[kk]):
+                        if utils._classifyStability(eigList[kk]) == 'stable':
                             steadyStateReached = True
                             steadyStateDict = {self._stateVariable1: realEQsol[kk][self._stateVariable1],
                                                self._stateVariable2: realEQsol[kk][self._stateVariable2]}
                 else:
                     if abs(realEQsol[kk][self._stateVariable1] - y_stationary[0]) <= eps:
-                        if all(sympy.sign(sympy.re(lam)) < 0 for lam in eigList[kk]):
+                        if utils._classifyStability(eigList[kk]) == 'stable':
                             steadyStateReached = True
                             steadyStateDict = {self._stateVariable1: realEQsol[kk][self._stateVariable1]}
 
@@ -1175,6 +1304,95 @@ class MuMoTnoiseCorrelationsView(MuMoTtimeEvolutionView):
             key_phi = sympy.Symbol(f"Phi_{key}") if key in self._mumotModel._reactants else key
             steadyStateDictPhi[key_phi] = val
         
+        noiseODEsys = self._getNoiseCorrODEsys(steadyStateDictPhi, argDict)
+        if noiseODEsys is None:
+            self._showErrorMessage('Could not compute Second Order Moments. '
+                                   'Could not generate figure. '
+                                   'Try different initial conditions in the Advanced options tab! ')
+            return None
+        noiseODEsys, y0 = noiseODEsys
+
+        eta_SV1 = sympy.Symbol(f"eta_{self._stateVariable1}")
+        if self._stateVariable2:
+            eta_SV2 = sympy.Symbol(f"eta_{self._stateVariable2}")
+        if self._stateVariable3:
+            eta_SV3 = sympy.Symbol(f"eta_{self._stateVariable3}")
+
+        NrDP = int(self._maxTime / self._tstep) + 1
+        time = np.linspace(0, self._maxTime, NrDP)
+
+        sol_ODE = odeint(noiseODEsys, y0, time)  # sol_ODE overwritten
+
+        x_data = [time for kk in range(len(y0))]
+        y_data = [sol_ODE[:, kk] for kk in range(len(y0))]
+        noiseNorm = systemSize.subs(argDict)
+        noiseNorm = sympy.N(noiseNorm)
+        for nn in range(len(y_data)):
+            y_temp = np.copy(y_data[nn])
+            for kk in range(len(y_temp)):
+                y_temp[kk] = y_temp[kk] / noiseNorm
+            y_data[nn] = y_temp
+
+        if self._stateVariable3:
+            c_labels = [r'$<' + latex(eta_SV1) + '(t)' + latex(eta_SV1) + '(0)' + '>$',
+                        r'$<' + latex(eta_SV2) + '(t)' + latex(eta_SV2) + '(0)' + '>$',
+                        r'$<' + latex(eta_SV3) + '(t)' + latex(eta_SV3) + '(0)' + '>$',
+                        r'$<' + latex(eta_SV2) + '(t)' + latex(eta_SV1) + '(0)' + '>$',
+                        r'$<' + latex(eta_SV1) + '(t)' + latex(eta_SV2) + '(0)' + '>$',
+                        r'$<' + latex(eta_SV3) + '(t)' + latex(eta_SV1) + '(0)' + '>$',
+                        r'$<' + latex(eta_SV1) + '(t)' + latex(eta_SV3) + '(0)' + '>$',
+                        r'$<' + latex(eta_SV3) + '(t)' + latex(eta_SV2) + '(0)' + '>$',
+                        r'$<' + latex(eta_SV2) + '(t)' + latex(eta_SV3) + '(0)' + '>$']
+
+        elif self._stateVariable2:
+            c_labels = [r'$<' + latex(eta_SV1) + '(t)' + latex(eta_SV1) + '(0)' + '>$',
+                        r'$<' + latex(eta_SV2) + '(t)' + latex(eta_SV2) + '(0)' + '>$',
+                        r'$<' + latex(eta_SV2) + '(t)' + latex(eta_SV1) + '(0)' + '>$',
+                        r'$<' + latex(eta_SV1) + '(t)' + latex(eta_SV2) + '(0)' + '>$']
+        else:
+            c_labels = [r'$<' + latex(eta_SV1) + '(t)' + latex(eta_SV1) + '(0)' + '>$']
+
+        c_labels = [utils._doubleUnderscorify(utils._greekPrependify(c_labels[jj]))
+                    for jj in range(len(c_labels))]
+
+        if self._chooseXrange:
+            choose_xrange = self._chooseXrange
+        else:
+            choose_xrange = [0, self._maxTime]
+        _fig_formatting_2D(xdata=x_data, ydata=y_data, xlab=self._xlab,
+                           ylab=self._ylab, choose_xrange=choose_xrange,
+                           choose_yrange=self._chooseYrange,
+                           fontsize=self._axes_font_size, curvelab=c_labels,
+                           legend_loc=self._legend_loc, grid=True,
+                           legend_fontsize=self._legend_fontsize)
+
+        self._show_computation_stop()
+
+    def _getNoiseCorrODEsys(self, steadyStateDictPhi, argDict):
+        """Compile the equations of motion of the noise correlations around a steady state.
+
+        The correlation EOM and the initial (stationary) second order moments
+        are derived symbolically once and lambdified into a numeric vector
+        function, cached on the view keyed on the substituted steady state and
+        parameter values so that redraws with unchanged values skip the
+        symbolic work (the ``MuMoTdefault._fixedPointCacheSize`` most recently
+        used systems are kept).
+
+        Returns
+        -------
+        :class:`tuple` or None
+            Right-hand side of the correlation ODE system and its initial
+            values, or ``None`` if the second order moments could not be computed.
+
+        """
+        cacheKey = (tuple(sorted((str(key), str(val)) for key, val in steadyStateDictPhi.items())),
+                    tuple(sorted((str(key), str(val)) for key, val in argDict.items())))
+        if self._noiseCorrODEsysCache is None:
+            self._noiseCorrODEsysCache = OrderedDict()
+        if cacheKey in self._noiseCorrODEsysCache:
+            self._noiseCorrODEsysCache.move_to_end(cacheKey)
+            return self._noiseCorrODEsysCache[cacheKey]
+
         EOM_1stOrdMomDict = copy.deepcopy(self._EOM_1stOrdMomDict)
         for sol in EOM_1stOrdMomDict:
             EOM_1stOrdMomDict[sol] = EOM_1stOrdMomDict[sol].subs(steadyStateDictPhi)
@@ -1249,22 +1467,6 @@ class MuMoTnoiseCorrelationsView(MuMoTtimeEvolutionView):
         for kk in range(len(noiseCorrEOM)):
             noiseCorrEOM[kk] = noiseCorrEOM[kk].subs(cVarSubdict)
 
-        def noiseODEsys(yin, t):
-            dydt = copy.deepcopy(noiseCorrEOM)
-            for kk in range(len(dydt)):
-                if self._stateVariable3:
-                    dydt[kk] = dydt[kk].subs({cVar1: yin[0], cVar2: yin[1], cVar3: yin[2], cVar4: yin[3],
-                                              cVar5: yin[4], cVar6: yin[5], cVar7: yin[6], cVar8: yin[7], cVar9: yin[8]})
-                elif self._stateVariable2:
-                    dydt[kk] = dydt[kk].subs({cVar1: yin[0], cVar2: yin[1], cVar3: yin[2], cVar4: yin[3]})
-                else:
-                    dydt[kk] = dydt[kk].subs({cVar1: yin[0]})
-                dydt[kk] = dydt[kk].evalf()
-            return dydt
-
-        NrDP = int(self._maxTime / self._tstep) + 1
-        time = np.linspace(0, self._maxTime, NrDP)
-
         if len(SOL_2ndOrdMomDict) > 0:
             if self._stateVariable3:
                 y0 = [SOL_2ndOrdMomDict[M_2(eta_SV1**2)], SOL_2ndOrdMomDict[M_2(eta_SV2**2)], SOL_2ndOrdMomDict[M_2(eta_SV3**2)],
@@ -1277,57 +1479,20 @@ class MuMoTnoiseCorrelationsView(MuMoTtimeEvolutionView):
             else:
                 y0 = [SOL_2ndOrdMomDict[M_2(eta_SV1**2)]]
         else:
-            self._showErrorMessage('Could not compute Second Order Moments. '
-                                   'Could not generate figure. '
-                                   'Try different initial conditions in the Advanced options tab! ')
             return None
 
-        sol_ODE = odeint(noiseODEsys, y0, time)  # sol_ODE overwritten
+        cVars = list(sympy.symbols(f"cVar1:{len(noiseCorrEOM) + 1}"))
+        noiseCorrFunc = lambdify([cVars], noiseCorrEOM, "numpy")
 
-        x_data = [time for kk in range(len(y0))]
-        y_data = [sol_ODE[:, kk] for kk in range(len(y0))]
-        noiseNorm = systemSize.subs(argDict)
-        noiseNorm = sympy.N(noiseNorm)
-        for nn in range(len(y_data)):
-            y_temp = np.copy(y_data[nn])
-            for kk in range(len(y_temp)):
-                y_temp[kk] = y_temp[kk] / noiseNorm
-            y_data[nn] = y_temp
+        def noiseODEsys(yin, _):
+            return noiseCorrFunc(yin)
 
-        if self._stateVariable3:
-            c_labels = [r'$<' + latex(eta_SV1) + '(t)' + latex(eta_SV1) + '(0)' + '>$',
-                        r'$<' + latex(eta_SV2) + '(t)' + latex(eta_SV2) + '(0)' + '>$',
-                        r'$<' + latex(eta_SV3) + '(t)' + latex(eta_SV3) + '(0)' + '>$',
-                        r'$<' + latex(eta_SV2) + '(t)' + latex(eta_SV1) + '(0)' + '>$',
-                        r'$<' + latex(eta_SV1) + '(t)' + latex(eta_SV2) + '(0)' + '>$',
-                        r'$<' + latex(eta_SV3) + '(t)' + latex(eta_SV1) + '(0)' + '>$',
-                        r'$<' + latex(eta_SV1) + '(t)' + latex(eta_SV3) + '(0)' + '>$',
-                        r'$<' + latex(eta_SV3) + '(t)' + latex(eta_SV2) + '(0)' + '>$',
-                        r'$<' + latex(eta_SV2) + '(t)' + latex(eta_SV3) + '(0)' + '>$']
+        noiseCorrODEsys = (noiseODEsys, [float(val) for val in y0])
+        self._noiseCorrODEsysCache[cacheKey] = noiseCorrODEsys
+        while len(self._noiseCorrODEsysCache) > max(defaults.MuMoTdefault._fixedPointCacheSize, 0):
+            self._noiseCorrODEsysCache.popitem(last=False)
 
-        elif self._stateVariable2:
-            c_labels = [r'$<' + latex(eta_SV1) + '(t)' + latex(eta_SV1) + '(0)' + '>$',
-                        r'$<' + latex(eta_SV2) + '(t)' + latex(eta_SV2) + '(0)' + '>$',
-                        r'$<' + latex(eta_SV2) + '(t)' + latex(eta_SV1) + '(0)' + '>$',
-                        r'$<' + latex(eta_SV1) + '(t)' + latex(eta_SV2) + '(0)' + '>$']
-        else:
-            c_labels = [r'$<' + latex(eta_SV1) + '(t)' + latex(eta_SV1) + '(0)' + '>$']
-
-        c_labels = [utils._doubleUnderscorify(utils._greekPrependify(c_labels[jj]))
-                    for jj in range(len(c_labels))]
-
-        if self._chooseXrange:
-            choose_xrange = self._chooseXrange
-        else:
-            choose_xrange = [0, self._maxTime]
-        _fig_formatting_2D(xdata=x_data, ydata=y_data, xlab=self._xlab,
-                           ylab=self._ylab, choose_xrange=choose_xrange,
-                           choose_yrange=self._chooseYrange,
-                           fontsize=self._axes_font_size, curvelab=c_labels,
-                           legend_loc=self._legend_loc, grid=True,
-                           legend_fontsize=self._legend_fontsize)
-
-        self._show_computation_stop()
+        return noiseCorrODEsys
 
     def _numericSol2ndOrdMoment(self, EOM_2ndOrdMomDict, steadyStateDict, argDict):
         for sol in EOM_2ndOrdMomDict:
@@ -1464,6 +1629,8 @@ class MuMoTfieldView(MuMoTview):
     _speed = None
     # class-global dictionary of memoised masks with (mesh size, dimension) as key
     _mask = {}
+    # sampling of the field: 'uniform' (regular mesh) or 'adaptive' (mesh refined where the field changes quickly)
+    _meshRefinement = None
     # z-label
     _zlab = None
     # flag to run SSA simulations to compute noise ellipse
@@ -1498,6 +1665,9 @@ class MuMoTfieldView(MuMoTview):
 
         self._silent = kwargs.get('silent', False)
         super().__init__(model=model, controller=controller, figure=figure, params=params, **kwargs)
+        self._meshRefinement = kwargs.get('meshRefinement', 'uniform')
+        if self._meshRefinement not in ('uniform', 'adaptive'):
+            raise exceptions.MuMoTValueError(f"Unknown meshRefinement '{self._meshRefinement}': accepted values are 'uniform' and 'adaptive'")
 
         with io.capture_output() as log:
             self._showFixedPoints = kwargs.get('showFixedPoints', False)
@@ -1513,7 +1683,6 @@ class MuMoTfieldView(MuMoTview):
             if stateVariable3 is not None:
                 self._axes3d = True
                 self._stateVariable3 = parse_latex(stateVariable3)
-            _mask = {}
 
             self._SOL_2ndOrdMomDict = SOL_2ndOrd
 
@@ -1616,6 +1785,8 @@ class MuMoTfieldView(MuMoTview):
         log_str = log_str.replace('\\', '\\\\')
         log_str += "showNoise = " + str(self._showNoise)
         log_str += ", showFixedPoints = " + str(self._showFixedPoints)
+        log_str += ", fixedPointSolver = '" + self._fixedPointSolver + "'"
+        log_str += ", meshRefinement = '" + self._meshRefinement + "'"
         log_str += ", runs = " + str(self._runs)
         log_str += ", maxTime = " + str(self._maxTime)
         log_str += ", randomSeed = " + str(self._randomSeed)
@@ -1853,9 +2024,10 @@ class MuMoTfieldView(MuMoTview):
                 for kk in range(len(ells)):
                     ax.add_artist(ells[kk])
                     ells[kk].set_alpha(0.5)
-                    if sympy.re(EVplot[kk][0]) < 0 and sympy.re(EVplot[kk][1]) < 0:
+                    stability = utils._classifyStability(EVplot[kk])
+                    if stability == 'stable':
                         Fcolor = consts.LINE_COLOR_LIST[1]
-                    elif sympy.re(EVplot[kk][0]) > 0 and sympy.re(EVplot[kk][1]) > 0:
+                    elif stability == 'unstable':
                         Fcolor = consts.LINE_COLOR_LIST[2]
                     else:
                         Fcolor = consts.LINE_COLOR_LIST[0]
@@ -2010,19 +2182,36 @@ class MuMoTfieldView(MuMoTview):
 
         return (funcs, argDict, plotLimits)
 
+    def _get_simplexMask(self, meshPoints, dimensions, plotLimits=1):
+        """Get memoised mask of the points of a regular mesh on [0, plotLimits]^dimensions outside the simplex of proportions."""
+        mask = self._mask.get((meshPoints, dimensions))
+        if mask is None:
+            if dimensions == 1:
+                mask = np.zeros(meshPoints, dtype=bool)
+                upperright = np.triu_indices(meshPoints, m=1)  # @todo: allow user to set mesh points with keyword
+                mask[upperright[0]] = True
+                mask = np.flipud(mask)
+            elif dimensions == 2:
+                mask = np.zeros((meshPoints, meshPoints), dtype=bool)
+                upperright = np.triu_indices(meshPoints)  # @todo: allow user to set mesh points with keyword
+                mask[upperright] = True
+                np.fill_diagonal(mask, False)
+                mask = np.flipud(mask)
+            else:
+                Z, Y, X = np.mgrid[0:plotLimits:complex(0, meshPoints),
+                                   0:plotLimits:complex(0, meshPoints),
+                                   0:plotLimits:complex(0, meshPoints)]
+                mask = X + Y + Z >= 1
+            self._mask[(meshPoints, dimensions)] = mask
+        return mask
+
     def _get_field1d(self, kind, meshPoints, plotLimits=1):
         """Get 1-dimensional field for plotting."""
 
         (funcs, argDict, plotLimits) = self._get_field()
         self._X = np.mgrid[0:plotLimits:complex(0, meshPoints)]
         if self._mumotModel._constantSystemSize:
-            mask = self._mask.get((meshPoints, 2))
-            if mask is None:
-                mask = np.zeros(self._X.shape, dtype=bool)
-                upperright = np.triu_indices(meshPoints, m=1)  # @todo: allow user to set mesh points with keyword
-                mask[upperright[0]] = True
-                mask = np.flipud(mask)
-                self._mask[(meshPoints, 2)] = mask
+            mask = self._get_simplexMask(meshPoints, 1)
         self._Xdot = funcs[self._stateVariable1](*self._mumotModel._getArgTuple1d(argDict, self._stateVariable1, self._X))
         try:
             # self._speed = np.log(self._Xdot)
@@ -2040,14 +2229,7 @@ class MuMoTfieldView(MuMoTview):
             (funcs, argDict, plotLimits) = self._get_field()
             self._Y, self._X = np.mgrid[0:plotLimits:complex(0, meshPoints), 0:plotLimits:complex(0, meshPoints)]
             if self._mumotModel._constantSystemSize:
-                mask = self._mask.get((meshPoints, 2))
-                if mask is None:
-                    mask = np.zeros(self._X.shape, dtype=bool)
-                    upperright = np.triu_indices(meshPoints)  # @todo: allow user to set mesh points with keyword
-                    mask[upperright] = True
-                    np.fill_diagonal(mask, False)
-                    mask = np.flipud(mask)
-                    self._mask[(meshPoints, 2)] = mask
+                mask = self._get_simplexMask(meshPoints, 2)
             self._Xdot = funcs[self._stateVariable1](*self._mumotModel._getArgTuple2d(argDict, self._stateVariable1, self._stateVariable2, self._X, self._Y))
             self._Ydot = funcs[self._stateVariable2](*self._mumotModel._getArgTuple2d(argDict, self._stateVariable1, self._stateVariable2, self._X, self._Y))
             try:
@@ -2074,16 +2256,7 @@ class MuMoTfieldView(MuMoTview):
                                                  0:plotLimits:complex(0, meshPoints),
                                                  0:plotLimits:complex(0, meshPoints)]
             if self._mumotModel._constantSystemSize:
-                mask = self._mask.get((meshPoints, 3))
-                if mask is None:
-                    # mask = np.zeros(self._X.shape, dtype=bool)
-                    # upperright = np.triu_indices(meshPoints)  # @todo: allow user to set mesh points with keyword
-                    # mask[upperright] = True
-                    # np.fill_diagonal(mask, False)
-                    # mask = np.flipud(mask)
-                    mask = self._X + self._Y + self._Z >= 1
-                    # mask = mask.astype(int)
-                    self._mask[(meshPoints, 3)] = mask
+                mask = self._get_simplexMask(meshPoints, 3, plotLimits)
             self._Xdot = funcs[self._stateVariable1](*self._mumotModel._getArgTuple3d(argDict, self._stateVariable1, self._stateVariable2, self._stateVariable3, self._X, self._Y, self._Z))
             self._Ydot = funcs[self._stateVariable2](*self._mumotModel._getArgTuple3d(argDict, self._stateVariable1, self._stateVariable2, self._stateVariable3, self._X, self._Y, self._Z))
             self._Zdot = funcs[self._stateVariable3](*self._mumotModel._getArgTuple3d(argDict, self._stateVariable1, self._stateVariable2, self._stateVariable3, self._X, self._Y, self._Z))
@@ -2103,6 +2276,54 @@ class MuMoTfieldView(MuMoTview):
         # else:
         self._logs.append(log)
 
+    def _get_fieldAdaptive(self, kind, meshPoints):
+        """Get 2- or 3-dimensional field for plotting at points refined where the field changes quickly.
+
+        Uses the point budget of a regular mesh with ``meshPoints`` per axis: half of it for a coarse regular mesh
+        (masked with the memoised simplex masks), the rest for bisecting the cells in which the field varies most.
+        The ordinates and derivatives are stored as flat arrays.
+
+        """
+        with io.capture_output() as log:
+            self._log(kind)
+            (funcs, argDict, plotLimits) = self._get_field()
+            stateVariables = [stateVariable for stateVariable in (self._stateVariable1, self._stateVariable2, self._stateVariable3)
+                              if stateVariable is not None]
+            dimensions = len(stateVariables)
+
+            def field(points):
+                if dimensions == 2:
+                    args = self._mumotModel._getArgTuple2d(argDict, self._stateVariable1, self._stateVariable2, *points)
+                else:
+                    args = self._mumotModel._getArgTuple3d(argDict, self._stateVariable1, self._stateVariable2, self._stateVariable3, *points)
+                return np.array([np.broadcast_to(funcs[stateVariable](*args), points.shape[1:]) for stateVariable in stateVariables])
+
+            axisPoints = max(2, int(round(meshPoints / 2 ** (1 / dimensions))))
+            coarseMask = None
+            maskFunc = None
+            if self._mumotModel._constantSystemSize:
+                # memoised masks are indexed in reverse order of the axes
+                coarseMask = np.transpose(self._get_simplexMask(axisPoints, dimensions, plotLimits))
+                if dimensions == 2:
+                    def maskFunc(points):
+                        return points.sum(axis=1) > 1 + 1e-9
+                else:
+                    def maskFunc(points):
+                        return points.sum(axis=1) >= 1
+            points, values, mask = utils._adaptiveMeshPoints(field, dimensions, axisPoints, meshPoints ** dimensions, plotLimits,
+                                                             coarseMask=coarseMask, maskFunc=maskFunc)
+            ordinates = [np.ma.array(points[:, kk], mask=mask) for kk in range(dimensions)]
+            derivatives = [np.ma.array(values[:, kk], mask=mask) for kk in range(dimensions)]
+            with np.errstate(all='ignore'):
+                self._speed = np.log(np.sqrt(np.sum(values ** 2, axis=1)))
+            if dimensions == 2:
+                self._X, self._Y = ordinates
+                self._Xdot, self._Ydot = derivatives
+            else:
+                self._X, self._Y, self._Z = ordinates
+                self._Xdot, self._Ydot, self._Zdot = derivatives
+        self._logs.append(log)
+
     def _appendFixedPointsToLogs(self, realEQsol, EV, Evects):
         if realEQsol is not None:
             for kk in range(len(realEQsol)):
@@ -2156,7 +2377,10 @@ class MuMoTvectorView(MuMoTfieldView):
         super()._plot_field()
 
         if self._stateVariable3 is None:
-            self._get_field2d("2d vector plot", 10)  # @todo: allow user to set mesh points with keyword
+            if self._meshRefinement == 'adaptive':
+                self._get_fieldAdaptive("2d vector plot", 10)
+            else:
+                self._get_field2d("2d vector plot", 10)  # @todo: allow user to set mesh points with keyword
             fig_vector = plt.quiver(self._X, self._Y, self._Xdot, self._Ydot, units='width', color='black')  # @todo: define colormap by user keyword
 
             if self._mumotModel._constantSystemSize:
@@ -2190,8 +2414,11 @@ class MuMoTvectorView(MuMoTfieldView):
                                choose_xrange=choose_xrange,
                                choose_yrange=choose_yrange)
         else:
-            self._get_field3d("3d vector plot", 10)
-            ax = self._figure.gca(projection='3d')
+            if self._meshRefinement == 'adaptive':
+                self._get_fieldAdaptive("3d vector plot", 10)
+            else:
+                self._get_field3d("3d vector plot", 10)
+            ax = self._figure.add_subplot(projection='3d')
             # @todo: define colormap by user keyword; normalise off maximum value
             # in self._speed, and meshpoints?
             fig_vec3d = ax.quiver(self._X, self._Y, self._Z, self._Xdot,
@@ -2426,78 +2653,49 @@ class MuMoTstreamView(MuMoTfieldView):
                                               self._Evects)
             self._logs.append(log)
         else:
-            self._get_field3d("3d stream plot", 10)
-            ax = self._figure.gca(projection='3d')
+            if self._meshRefinement == 'adaptive':
+                self._get_fieldAdaptive("3d stream plot", 10)
+            else:
+                self._get_field3d("3d stream plot", 10)
+            ax = self._figure.add_subplot(projection='3d')
 
             argDict = self._get_argDict()
+            stateVariables = [self._stateVariable1, self._stateVariable2, self._stateVariable3]
+            params, equationsFunc, _ = self._mumotModel._getJacobianFuncs(stateVariables)
+            paramValues = [argDict[param] for param in params]
 
-            # Derived model equations stored with parameter values substituted
-            # in from widgets
-            eqA = self._mumotModel._equations[self._stateVariable1].subs(argDict)
-            eqB = self._mumotModel._equations[self._stateVariable2].subs(argDict)
-            eqC = self._mumotModel._equations[self._stateVariable3].subs(argDict)
-
-            # Model of ODEs from model equations
-            # Needed for odeint() method to integrate streams from start points
-            # N is needed for the equations
-            def modelODEs(states, t, eqA, eqB, eqC):
-                A = states[0]
-                B = states[1]
-                C = states[2]
-
-                # eval is needed to run the derived equation as a mathematical
-                # formula rather than a string
-                dAdt = eval(str(eqA))
-                dBdt = eval(str(eqB))
-                dCdt = eval(str(eqC))
-
-                return [dAdt, dBdt, dCdt]
+            # All streams are integrated together as one ODE system of the
+            # stacked state vectors [A_1, B_1, C_1, A_2, ...]
+            def batchedODEs(states, _):
+                return equationsFunc(states.reshape(-1, 3).T, paramValues).T.ravel()
 
             # Time over which streams are integrated, longer time gives a longer stream.
             t = np.linspace(0, self._integrationTime, 20)
 
-            # This empty array will store start points of streams
-            start_points = np.empty([0, 3])
-            # This is used to calculate speed value at each randomly selected point.
-            # Each column and row in self._X contains the same values so we only need 1.
-            # Used to find corresponding speed value for each starting point.
-            speed_points = self._X[0, 0, :]
+            # Start points of streams, drawn in one call from the simplex (or
+            # the box for models without constant system size)
+            # _numPoints is a keyword for the number of start points (number of streams)
+            if self._meshRefinement == 'adaptive':
+                # drawn from the adaptively refined mesh instead, so that more
+                # streams start where the field changes quickly
+                inside = ~np.ma.getmaskarray(self._Xdot)
+                candidates = np.stack([np.ma.getdata(ordinates)[inside] for ordinates in (self._X, self._Y, self._Z)], axis=1)
+                start_points = candidates[np.random.choice(len(candidates), self._numPoints, replace=self._numPoints > len(candidates))]
+            else:
+                start_points = utils._uniformSimplexPoints(self._numPoints, 3, float(self._getPlotLimits()),
+                                                           simplex=bool(self._mumotModel._constantSystemSize))
 
-            j = 0
+            # Speed of the streams at their start points, used for their colour
+            with np.errstate(all='ignore'):
+                speeds = np.absolute(np.log(np.linalg.norm(equationsFunc(start_points.T, paramValues), axis=0)))
+            speeds[~np.isfinite(speeds)] = 0
 
-            # Builds array start_points of starting points for streams
-            # _numPoints is a keyword for the number of start points (number of streams)
-            while j < self._numPoints:
-                # Randomly choose points to start streams from
-                p = np.random.choice(self._X[0, 0, :])
-                q = np.random.choice(self._Y[0, :, 0])
-                r = np.random.choice(self._Z[:, 0, 0])
-                # Use selected point as start point if they meet following criteria
-                # If not, then reselect start point
-                # Method is ineffecient for high number of start points
-                if (p + q + r <= 1):
-                    temp = np.array([[p, q, r]])
-                    start_points = np.concatenate((start_points, temp), axis=0)
-                    j += 1
+            # The Jacobian of the stacked system is block-diagonal, so odeint
+            # is told it is banded with 3x3 blocks
+            states = odeint(batchedODEs, start_points.ravel(), t, ml=2, mu=2).reshape(t.shape[0], -1, 3)
 
             # Plot streams from each start point
-            for i in range(start_points[:, 0].shape[0]):
-                x = start_points[i, 0]
-                y = start_points[i, 1]
-                z = start_points[i, 2]
-
-                # Finds the speed of stream at each start point
-                # Finds index of each start point in speed_points
-                # Uses indexes to find corresponding speed for start point in self._speed
-                speed_x = np.where(speed_points == x)[0]
-                speed_y = np.where(speed_points == y)[0]
-                speed_z = np.where(speed_points == z)[0]
-                speed = np.absolute(self._speed[speed_x, speed_y, speed_z])[0]
-
-                # Initial conditions for integrations
-                state0 = [x, y, z]
-                state = odeint(modelODEs, state0, t, args=(eqA, eqB, eqC))
-
+            for state, speed in zip(np.moveaxis(states, 1, 0), speeds):
                 fig_stream3d = ax.plot(state[:, 0],
                                        state[:, 1],
                                        state[:, 2],
@@ -2773,7 +2971,7 @@ class MuMoTbifurcationView(MuMoTview):
 
             if realEQsol != [] and realEQsol is not None:
                 for kk in range(len(realEQsol)):
-                    if all(sympy.sign(sympy.re(lam)) < 0 for lam in eigList[kk]):
+                    if utils._classifyStability(eigList[kk]) == 'stable':
                         initDictList.append(realEQsol[kk])
                 # self._showErrorMessage('Stationary state(s) detected and continuated.'
                 #                        'Initial conditions for state variables specified on sliders in Advanced options tab were not used.'
@@ -3249,16 +3447,26 @@ class MuMoTstochasticSimulationView(MuMoTview):
     _latestResults = None
     # number of runs to execute
     _runs = None
+    # number of worker processes used to execute the runs in parallel (1 = serial execution)
+    _nWorkers = None
     # flag to set if the results from multimple runs must be aggregated or not
     _aggregateResults = None
     # variable to store simulation time during simulation
     _t = 0
     # variable to store the current simulation state
     _currentState = 0
-    # variable to store the time evolution of the simulation
+    # variable to store the time evolution of the simulation (recorder of the current run)
     _evo = None
+    # time interval between the records of the time evolution (None to record every step)
+    _recordInterval = None
+    # directory where the records of the time evolution are spilled to memory-mapped files (None to keep them in memory)
+    _spillDir = None
     # progress bar
     _progressBar = None
+    # maximum number of realtime-plot frames and progress-bar updates per second (None for an update at every step)
+    _maxFPS = None
+    # number of records of the current run already drawn in the realtime plot
+    _plottedRecords = 0
     # variable that is set to False only by the multiController managing this view (when shareAxes == True and not first view to be run)
     _allowRealtimePlotting = True
 
@@ -3276,6 +3484,13 @@ class MuMoTstochasticSimulationView(MuMoTview):
         self._silent = kwargs.get('silent', False)
         self._xlab = kwargs.get('xlab', 'time t')
         self._ylab = kwargs.get('ylab', 'reactants')
+        self._recordInterval = kwargs.get('recordInterval')
+        if self._recordInterval is not None and not self._recordInterval > 0:
+            raise exceptions.MuMoTValueError("Keyword recordInterval must be strictly positive")
+        self._spillDir = kwargs.get('spillDir')
+        self._maxFPS = kwargs.get('maxFPS', defaults.MuMoTdefault._realtimeMaxFPS)
+        if self._maxFPS is not None and not self._maxFPS > 0:
+            raise exceptions.MuMoTValueError("Keyword maxFPS must be strictly positive")
         if not self._silent:
             display(self._progressBar)
 
@@ -3306,6 +3521,7 @@ class MuMoTstochasticSimulationView(MuMoTview):
                 self._plotProportions = SSParams["plotProportions"]
                 self._realtimePlot = SSParams.get('realtimePlot', False)
                 self._runs = SSParams.get('runs', 1)
+                self._nWorkers = SSParams.get('nWorkers', 1)
                 self._aggregateResults = SSParams.get('aggregateResults', True)
 
             else:
@@ -3358,22 +3574,34 @@ class MuMoTstochasticSimulationView(MuMoTview):
             # Clearing the plot and setting the axes
             self._initFigure()
 
-            self._latestResults = []
-            for r in range(self._runs):
-                runID = f"[{r + 1}/{self._runs}] " if self._runs > 1 else ''
-                self._latestResults.append(self._runSingleSimulation(self._randomSeed + r,
-                                                                     runID=runID))
+            self._runSimulations()
 
-            # Final plot
-            if not self._realtimePlot or self._aggregateResults:
-                # for results in self._latestResults:
-                #     self._updateSimultationFigure(results, fullPlot=True)
-                self._updateSimultationFigure(self._latestResults, fullPlot=True)
+            # Final plot (replacing the realtime frames, so that it is the same as without realtime plotting)
+            if self._realtimePlot:
+                self._initFigure()
+            self._updateSimultationFigure(self._latestResults, fullPlot=True)
 
             self._show_computation_stop()
         self._logs.append(log)
         if self._controller is not None:
-            self._updateDownloadLink()
+            # the download link is created (from the new results) only when requested
+            self._controller._downloadWidgetLink.layout.visibility = 'hidden'
+
+    def _runSimulations(self):
+        """Execute ``_runs`` simulation runs (in parallel if ``_nWorkers`` > 1) and return their results in run order.
+
+        The results are also stored in ``_latestResults``.
+
+        """
+        if self._nWorkers > 1 and self._runs > 1 and not self._realtimePlot:
+            self._latestResults = self._runParallelSimulations()
+        else:
+            self._latestResults = []
+            for r in range(self._runs):
+                runID = f"[{r + 1}/{self._runs}] " if self._runs > 1 else ''
+                self._latestResults.append(self._runSingleSimulation(self._randomSeed + r,
+                                                                     runID=runID))
+        return self._latestResults
 
     def _update_view_specific_params(self, freeParamDict: Optional[Dict[object, object]] = None) -> None:
         """Get other parameters specific to SSA."""
@@ -3403,10 +3631,12 @@ class MuMoTstochasticSimulationView(MuMoTview):
             self._maxTime = self._getWidgetParamValue('maxTime', self._controller._widgetsExtraParams)  # self._fixedParams['maxTime'] if self._fixedParams.get('maxTime') is not None else self._controller._widgetsExtraParams['maxTime'].value
             self._realtimePlot = self._getWidgetParamValue('realtimePlot', self._controller._widgetsExtraParams)  # self._fixedParams['realtimePlot'] if self._fixedParams.get('realtimePlot') is not None else self._controller._widgetsExtraParams['realtimePlot'].value
             self._runs = self._getWidgetParamValue('runs', self._controller._widgetsExtraParams)  # self._fixedParams['runs'] if self._fixedParams.get('runs') is not None else self._controller._widgetsExtraParams['runs'].value
+            self._nWorkers = self._getWidgetParamValue('nWorkers', self._controller._widgetsExtraParams)
             self._aggregateResults = self._getWidgetParamValue('aggregateResults', self._controller._widgetsPlotOnly)  # self._fixedParams['aggregateResults'] if self._fixedParams.get('aggregateResults') is not None else self._controller._widgetsPlotOnly['aggregateResults'].value
 
     def _initSingleSimulation(self) -> None:
-        self._progressBar.max = self._maxTime
+        if self._progressBar is not None:
+            self._progressBar.max = self._maxTime
 
         # Initialise populations by multiplying proportion with _systemSize
         # currentState = copy.deepcopy(self._initialState)
@@ -3432,47 +3662,105 @@ class MuMoTstochasticSimulationView(MuMoTview):
                 bottom += prob
 
         # Create logging structs
-        self._evo = {}
-        self._evo['time'] = [0]
-        for state, pop in self._currentState.items():
-            self._evo[state] = []
-            self._evo[state].append(pop)
+        self._evo = self._newRecorder()
+        self._evo.record(0, list(self._currentState.values()))
 
         # initialise time
         self._t = 0
 
+    def _runParallelSimulations(self):
+        """Execute the runs in ``_nWorkers`` worker processes and return their results in run order.
+
+        Each run is seeded with ``_randomSeed`` plus its index, as in the serial
+        execution, hence the results do not depend on the number of workers.
+        The final state of the last run is copied back to the view (as
+        after a serial execution).
+
+        """
+        if self._progressBar is not None:
+            self._progressBar.max = self._runs
+            self._progressBar.value = 0
+            self._progressBar.description = f"Loading [0/{self._runs}]:"
+        with ProcessPoolExecutor(max_workers=min(self._nWorkers, self._runs)) as executor:
+            futures = [executor.submit(_runSimulationInWorker, self, self._randomSeed + r)
+                       for r in range(self._runs)]
+            for completedRuns, _ in enumerate(as_completed(futures), 1):
+                if self._progressBar is not None:
+                    self._progressBar.value = completedRuns
+                    self._progressBar.description = f"Loading [{completedRuns}/{self._runs}]:"
+            results = [future.result() for future in futures]
+        self.__dict__.update(results[-1][1])
+        self._completeProgressBar()
+        return [evo for evo, _ in results]
+
+    def _updateProgressBar(self, runID='') -> None:
+        """Show the simulated time of the current run in the progress bar (if any)."""
+        if self._progressBar is None:
+            return
+        self._progressBar.value = self._t
+        self._progressBar.description = f"Loading {runID}{round(self._t / self._maxTime*100)}%:"
+
+    def _completeProgressBar(self) -> None:
+        if self._progressBar is None:
+            return
+        self._progressBar.value = self._progressBar.max
+        self._progressBar.description = "Completed 100%:"
+
+    def __getstate__(self):
+        """Return the state used to pickle the view, without the user-interface objects (widgets, figure and controller)."""
+        state = self.__dict__.copy()
+        for attribute in ('_controller', '_figure', '_progressBar', '_logs', '_latestResults'):
+            state.pop(attribute, None)
+        return state
+
+    def _newRecorder(self) -> utils._TrajectoryRecorder:
+        """Return an empty recorder of the time evolution of the states in ``_currentState``."""
+        return utils._TrajectoryRecorder(self._currentState.keys(),
+                                         constants={state: pop for state, pop in self._currentState.items()
+                                                    if state in self._mumotModel._constantReactants},
+                                         chunkSize=defaults.MuMoTdefault._recordingChunkSize,
+                                         samplingInterval=self._recordInterval,
+                                         spillDir=self._spillDir,
+                                         endTime=self._maxTime)
+
     def _runSingleSimulation(self, randomSeed, runID=''):
         # init the random seed
         np.random.seed(randomSeed)
 
         self._initSingleSimulation()
+        return self._simulateUntilMaxTime(runID)
 
+    def _simulateUntilMaxTime(self, runID=''):
+        """Advance the initialised simulation from time ``_t`` to ``_maxTime`` and return the time evolution."""
+        frameLimiter = self._newFrameLimiter()
         while self._t < self._maxTime:
-            # Update progress bar
-            self._progressBar.value = self._t
-            self._progressBar.description = f"Loading {runID}{round(self._t / self._maxTime*100)}%:"
-
             timeInterval, self._currentState = self._simulationStep()
             # increment time
             self._t += timeInterval
             # log step
-            for state, pop in self._currentState.items():
-                if state in self._mumotModel._constantReactants:
-                    continue
-                self._evo[state].append(pop)
-            self._evo['time'].append(self._t)
-
-            # Print (self._evo)
-            # Plotting each timestep
-            if self._realtimePlot:
-                self._updateSimultationFigure(allResults=self._latestResults,
-                                              fullPlot=False,
-                                              currentEvo=self._evo)
-
-        self._progressBar.value = self._progressBar.max
-        self._progressBar.description = "Completed 100%:"
-        # print("Temporal evolution per state: " + str(self._evo))
-        return self._evo
+            self._evo.record(self._t, list(self._currentState.values()))
+
+            # update progress bar and realtime plot (at most maxFPS times per second)
+            if frameLimiter.ready():
+                self._updateRealtimeOutput(runID)
+
+        self._updateRealtimeOutput(runID)
+        self._completeProgressBar()
+        return self._evo.finalise(self._maxTime)
+
+    def _newFrameLimiter(self) -> utils._FrameLimiter:
+        """Return the limiter of the realtime-output updates of a new run."""
+        self._plottedRecords = 0
+        return utils._FrameLimiter(1.0 / self._maxFPS if self._maxFPS is not None else 0.0)
+
+    def _updateRealtimeOutput(self, runID='') -> None:
+        """Update the progress bar and, if realtime plotting, draw the records of the current run not drawn yet."""
+        self._updateProgressBar(runID)
+        if self._realtimePlot and self._evo.numRecords() > self._plottedRecords:
+            self._updateSimultationFigure(allResults=self._latestResults,
+                                          fullPlot=False,
+                                          currentEvo=self._evo)
+            self._plottedRecords = self._evo.numRecords()
 
     def _updateSimultationFigure(self, allResults, fullPlot: bool = True, currentEvo: Optional[Dict] = None) -> None:
         if (self._visualisationType == "evo"):
@@ -3482,7 +3770,7 @@ class MuMoTstochasticSimulationView(MuMoTview):
             #     fullPlot = True
 
             # If fullPlot, plot all time-evolution
-            if fullPlot or len(currentEvo['time']) <= 2:
+            if fullPlot or self._plottedRecords == 0:
                 y_max = 1.0 if self._plotProportions else self._systemSize
 
                 # plot in aggregate mode only if there's enough data
@@ -3593,18 +3881,19 @@ class MuMoTstochasticSimulationView(MuMoTview):
                                    fontsize=self._axes_font_size, 
                                    aspectRatioEqual=False, grid=True)
 
-            if not fullPlot:  # If realtime-plot mode, draw only the last timestep rather than overlay all
+            if not fullPlot:  # If realtime-plot mode, draw only the records since the last frame rather than overlay all
                 xdata = []
                 ydata = []
                 y_max = 1.0 if self._plotProportions else self._systemSize
+                newRecords = slice(max(0, self._plottedRecords - 1), None)
                 for state in sorted(self._initialState.keys(), key=str):
                     if (state == 'time') or self._mumotModel._constantReactants:
                         continue
-                    xdata.append(currentEvo['time'][-2:])
+                    xdata.append(currentEvo['time'][newRecords])
                     # modify if plotProportions
                     ytmp = ([y / self._systemSize
-                             for y in currentEvo[state][-2:]]
-                            if self._plotProportions else currentEvo[state][-2:])
+                             for y in currentEvo[state][newRecords]]
+                            if self._plotProportions else currentEvo[state][newRecords])
                     y_max = max(y_max, max(ytmp))
                     ydata.append(ytmp)
                 xrange = (0, self._maxTime) if self._chooseXrange is None else self._chooseXrange 
@@ -3802,39 +4091,123 @@ class MuMoTstochasticSimulationView(MuMoTview):
             # plt.axes().set_aspect('auto') # for barchart
             pass
 
-    def _convertLatestDataIntoCSV(self):
-        """Formatting of the latest simulation data in the CSV format"""
-        csv_results = ""
-        line = 'runID' + ',' + 'time'
+    def saveResults(self, path, format: str = 'npz') -> None:
+        """Save the latest simulation results to a file, writing them run by run.
+
+        Parameters
+        ----------
+        path : str or file-like object
+            Path (or binary file-like object) where the results are written.
+        format : str, optional
+            ``'npz'`` (NumPy archive with arrays ``run<r>/time`` and
+            ``run<r>/<state>`` for each run ``r``), ``'parquet'`` (table
+            with columns ``runID``, ``time`` and one per state, one row group
+            per run; requires pyarrow), ``'hdf5'`` (group ``run<r>`` with
+            datasets ``time`` and one per state for each run; requires h5py)
+            or ``'csv'`` (same columns as ``'parquet'``).  Defaults to
+            'npz'.
+
+        """
+        writers = {'npz': self._saveResultsNPZ,
+                   'parquet': self._saveResultsParquet,
+                   'hdf5': self._saveResultsHDF5,
+                   'csv': self._saveResultsCSV}
+        if format not in writers:
+            raise exceptions.MuMoTValueError(f"Unknown results format '{format}': accepted values are "
+                                             + ", ".join(f"'{name}'" for name in writers))
+        if not self._latestResults:
+            raise exceptions.MuMoTValueError("No results to save: run the simulation first")
+        writers[format](path)
+
+    def _resultsColumns(self, runData):
+        """Return the (name, array) columns of the results of one run: time and the population of each non-constant state."""
+        columns = [('time', np.asarray(runData['time']))]
         for state in sorted(self._initialState.keys(), key=str):
-            line += ',' + str(state)
-        line += '\n'
-        csv_results += line
-        for runID, runData in enumerate(self._latestResults):
-            for t, timestep in enumerate(runData['time']):
-                line = str(runID) + ',' + str(timestep)
-                for state in sorted(self._initialState.keys(), key=str):
-                    if state in self._mumotModel._constantReactants:
-                        continue
-                    line += ',' + str(runData[state][t])
-                line += '\n'
-                csv_results += line
-        return csv_results
+            if state not in self._mumotModel._constantReactants:
+                columns.append((str(state), np.asarray(runData[state])))
+        return columns
+
+    def _saveResultsNPZ(self, path) -> None:
+        with zipfile.ZipFile(path, mode='w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+            for runID, runData in enumerate(self._latestResults):
+                for name, values in self._resultsColumns(runData):
+                    with archive.open(f"run{runID}/{name}.npy", mode='w', force_zip64=True) as member:
+                        np.lib.format.write_array(member, values, allow_pickle=False)
+
+    def _saveResultsParquet(self, path) -> None:
+        pa = utils._importOptional('pyarrow', "Saving results in the 'parquet' format")
+        pq = utils._importOptional('pyarrow.parquet', "Saving results in the 'parquet' format")
+        writer = None
+        try:
+            for runID, runData in enumerate(self._latestResults):
+                columns = self._resultsColumns(runData)
+                table = pa.table({'runID': np.full(len(columns[0][1]), runID), **dict(columns)})
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def _saveResultsHDF5(self, path) -> None:
+        h5py = utils._importOptional('h5py', "Saving results in the 'hdf5' format")
+        with h5py.File(path, 'w') as h5File:
+            for runID, runData in enumerate(self._latestResults):
+                group = h5File.create_group(f"run{runID}")
+                for name, values in self._resultsColumns(runData):
+                    group.create_dataset(name, data=values, compression='gzip')
+
+    def _saveResultsCSV(self, path) -> None:
+        with contextlib.ExitStack() as stack:
+            csvFile = stack.enter_context(open(path, 'wb')) if isinstance(path, (str, os.PathLike)) else path
+            names = [name for name, _ in self._resultsColumns(self._latestResults[0])]
+            csvFile.write((','.join(['runID'] + names) + '\n').encode())
+            for runID, runData in enumerate(self._latestResults):
+                columns = [values for _, values in self._resultsColumns(runData)]
+                np.savetxt(csvFile, np.column_stack([np.full(len(columns[0]), runID)] + columns),
+                           fmt=['%d', '%s'] + ['%d'] * (len(columns) - 1), delimiter=',')
 
     def _updateDownloadLink(self):
         """Update the link with the latest results"""
-        self._controller._downloadWidgetLink.value = self._controller._create_download_link(self._convertLatestDataIntoCSV(), title="Download results", filename="simulationData.txt")
+        self._controller._downloadWidgetLink.value = self._createResultsDownloadLink()
 
-    def downloadResults(self):
-        """Create a download link to access the latest results."""
-        return HTML(self._controller._create_download_link(self._convertLatestDataIntoCSV(), title="Download results", filename="simulationData.txt"))
+    def _createResultsDownloadLink(self, format: str = 'npz') -> str:
+        extensions = {'npz': 'npz', 'parquet': 'parquet', 'hdf5': 'h5', 'csv': 'csv'}
+        resultsBuffer = BytesIO()
+        self.saveResults(resultsBuffer, format)
+        return self._controller._create_download_link(resultsBuffer.getvalue(), title="Download results",
+                                                      filename=f"simulationData.{extensions[format]}",
+                                                      mimeType='application/octet-stream')
+
+    def downloadResults(self, format: str = 'npz'):
+        """Create a download link to access the latest results.
+
+        Parameters
+        ----------
+        format : str, optional
+            File format of the results (see :meth:`saveResults`). Defaults to 'npz'.
+
+        """
+        return HTML(self._createResultsDownloadLink(format))
 
 
 class MuMoTmultiagentView(MuMoTstochasticSimulationView):
     """Agent on networks view on model."""
 
-    # structure to store the communication network
-    _graph = None
+    # generator of the Erdos-Renyi networks (see MuMoTdefault.setNetworkDefaults)
+    _erdosRenyiGenerator = None
+    # checkpoint file the simulation is resumed from (None to start from t=0)
+    _resumeFrom = None
+    # checkpoint file where the simulation state is saved at the end of the run (and when it is interrupted)
+    _checkpointTo = None
+    # state of the random number generator at the end of the last run
+    _rngState = None
+    # simulation state at the beginning of the current timestep (saved if the simulation is interrupted)
+    _stepStartState = None
+    # communication network as CSR adjacency (indptr, indices) arrays (None for the fully-connected network, where all agents are neighbours)
+    _adjacency = None
+    # number of nodes, number of resamplings and generation time (in seconds) of the last connected Erdos-Renyi network (None for other network types)
+    _netGenerationStats = None
     # type of network used in the M-A simulation
     _netType = None
     # network parameter which varies with respect to each type of network
@@ -3844,9 +4217,19 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
     _particleSpeed = None
     # corelatedness in the random walk motion (only for dynamic netType)
     _motionCorrelatedness = None
-    # list of agents involved in the simulation
+    # flag to confine the particles within the arena walls instead of using periodic boundaries (only for dynamic netType)
+    _boundedArena = False
+    # array of the (integer-coded) states of the agents involved in the simulation
     _agents = None
-    # list of agents' positions
+    # code of each state (including the empty set) in the ``_agents`` array
+    _stateCodes = None
+    # state of each code (inverse of ``_stateCodes``)
+    _codeStates = None
+    # reactions of each (coded) agent state as tuples (scaled rate, reagents, reagent multiplicities, products, reagent products), with integer-coded states
+    _reactionTables = None
+    # spontaneous births as tuples (scaled rate, products), with integer-coded states
+    _birthTable = None
+    # array of agents' positions (one row (x, y, orientation) per agent)
     _positions = None
     _positionHistory = None
     # Arena size: width
@@ -3863,6 +4246,9 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
     _showInteractions = None
 
     def _constructorSpecificParams(self, MAParams):
+        self._erdosRenyiGenerator = defaults.MuMoTdefault._erdosRenyiGenerator
+        self._resumeFrom = self._generatingKwargs.get('resumeFrom')
+        self._checkpointTo = self._generatingKwargs.get('checkpointTo')
         if self._controller is None:
             self._timestepSize = MAParams.get('timestepSize', 1)
             self._netType = utils._decodeNetworkTypeFromString(MAParams['netType'])
@@ -3871,6 +4257,7 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
                 if self._netType == consts.NetworkType.DYNAMIC:
                     self._motionCorrelatedness = MAParams['motionCorrelatedness']
                     self._particleSpeed = MAParams['particleSpeed']
+                    self._boundedArena = MAParams.get('boundedArena', False)
                     self._showTrace = MAParams.get('showTrace', False)
                     self._showInteractions = MAParams.get('showInteractions', False)
         else:
@@ -3942,6 +4329,7 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
         if self._netType == consts.NetworkType.DYNAMIC:
             log_str += ", motionCorrelatedness = " + str(self._motionCorrelatedness)
             log_str += ", particleSpeed = " + str(self._particleSpeed)
+            log_str += ", boundedArena = " + str(self._boundedArena)
             log_str += ", showTrace = " + str(self._showTrace)
             log_str += ", showInteractions = " + str(self._showInteractions)
         log_str += ", visualisationType = '" + str(self._visualisationType) + "'"
@@ -3959,6 +4347,14 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
         log_str += ", realtimePlot = " + str(self._realtimePlot)
         log_str += ", runs = " + str(self._runs)
         log_str += ", aggregateResults = " + str(self._aggregateResults)
+        if self._recordInterval is not None:
+            log_str += ", recordInterval = " + str(self._recordInterval)
+        if self._spillDir is not None:
+            log_str += ", spillDir = " + repr(self._spillDir)
+        if self._resumeFrom is not None:
+            log_str += ", resumeFrom = " + repr(self._resumeFrom)
+        if self._checkpointTo is not None:
+            log_str += ", checkpointTo = " + repr(self._checkpointTo)
         log_str += ", silent = " + str(self._silent)
         log_str += ", bookmark = False"
         # if len(self._generatingKwargs) > 0:
@@ -3985,6 +4381,7 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
         if self._netType == consts.NetworkType.DYNAMIC:
             MAParams['motionCorrelatedness'] = self._motionCorrelatedness
             MAParams['particleSpeed'] = self._particleSpeed
+            MAParams['boundedArena'] = self._boundedArena
             MAParams['showTrace'] = self._showTrace
             MAParams['showInteractions'] = self._showInteractions
         MAParams["visualisationType"] = self._visualisationType
@@ -4023,6 +4420,7 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
                 if self._netType is None or self._netType == consts.NetworkType.DYNAMIC:  # this used to refer only to value in self._fixedParams; possible bug?
                     self._motionCorrelatedness = self._getWidgetParamValue('motionCorrelatedness', self._controller._widgetsExtraParams)  # self._fixedParams['motionCorrelatedness'] if self._fixedParams.get('motionCorrelatedness') is not None else self._controller._widgetsExtraParams['motionCorrelatedness'].value
                     self._particleSpeed = self._getWidgetParamValue('particleSpeed', self._controller._widgetsExtraParams)  # self._fixedParams['particleSpeed'] if self._fixedParams.get('particleSpeed') is not None else self._controller._widgetsExtraParams['particleSpeed'].value
+                    self._boundedArena = self._getWidgetParamValue('boundedArena', self._controller._widgetsExtraParams)
                     self._showTrace = self._getWidgetParamValue('showTrace', self._controller._widgetsPlotOnly)  # self._fixedParams['showTrace'] if self._fixedParams.get('showTrace') is not None else self._controller._widgetsPlotOnly['showTrace'].value
                     self._showInteractions = self._getWidgetParamValue('showInteractions', self._controller._widgetsPlotOnly)  # self._fixedParams['showInteractions'] if self._fixedParams.get('showInteractions') is not None else self._controller._widgetsPlotOnly['showInteractions'].value
             self._timestepSize = self._getWidgetParamValue('timestepSize', self._controller._widgetsExtraParams)  # self._fixedParams['timestepSize'] if self._fixedParams.get('timestepSize') is not None else self._controller._widgetsExtraParams['timestepSize'].value
@@ -4061,13 +4459,15 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
                 for state in self._initialState.keys():
                     xs[state] = []
                     ys[state] = []
+                if self._showInteractions:
+                    neighbourLists = self._getNeighbourLists(self._positions, self._netParam)
                 for a in np.arange(len(self._positions)):
-                    xs[self._agents[a]].append(self._positions[a][0])
-                    ys[self._agents[a]].append(self._positions[a][1])
+                    xs[self._codeStates[self._agents[a]]].append(self._positions[a][0])
+                    ys[self._codeStates[self._agents[a]]].append(self._positions[a][1])
 
                     if self._showInteractions:
                         agent_p = [self._positions[a][0], self._positions[a][1]]
-                        for n in self._getNeighbours(a, self._positions, self._netParam):
+                        for n in neighbourLists[a]:
                             neigh_p = [self._positions[n][0], self._positions[n][1]]
                             jump_boudaries = False
                             if abs(agent_p[0] - neigh_p[0]) > self._netParam:
@@ -4123,10 +4523,11 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
                 for state in self._initialState.keys():
                     plt.plot(xs.get(state, []), ys.get(state, []), 'o', c=self._colors[state])
             else:
+                graph = self._getGraph()
                 stateColors = []
-                for n in self._graph.nodes():
-                    stateColors.append(self._colors.get(self._agents[n], 'w'))
-                nx.draw_networkx(self._graph, self._positionHistory, node_color=stateColors, with_labels=True)
+                for n in graph.nodes():
+                    stateColors.append(self._colors.get(self._codeStates[self._agents[n]], 'w'))
+                nx.draw_networkx(graph, self._positionHistory, node_color=stateColors, with_labels=True)
                 plt.axis('off')
             # plot legend
             stateNamesLabel = [r'$' + utils._doubleUnderscorify(utils._greekPrependify(str(sympy.Symbol(str(state))))) + '$' for state in sorted(self._initialState.keys(), key=str) if state not in self._mumotModel._constantReactants]
@@ -4165,10 +4566,14 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
         self._maxTimeSteps = math.ceil(self._maxTime / self._timestepSize)
         if self._controller is not None and self._controller._widgetsExtraParams.get('timestepSize'):
             self._update_timestepSize_widget(self._timestepSize, maxTimestepSize, self._maxTimeSteps)
-        else:
+        elif self._controller is not None:
+            # the time step size is fixed (no widget): notify the user of its reduction in the controller
             if self._fixedParams.get('timestepSize') != self._timestepSize:
                 self._showErrorMessage(f"Time step size was fixed to {self._fixedParams.get('timestepSize')} but needs to be updated to {self._timestepSize}")
                 self._fixedParams['timestepSize'] = self._timestepSize
+        else:
+            # without a controller (headless simulations) the time step size is reduced silently, as in the widget
+            pass
 
     def _update_timestepSize_widget(self, timestepSize, maxTimestepSize, maxTimeSteps):
         if not self._controller._widgetsExtraParams['timestepSize'].value == timestepSize:
@@ -4195,15 +4600,26 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
 
     def _initGraph(self):
         numNodes = sum(self._currentState.values())
+        self._adjacency = None
         if (self._netType == consts.NetworkType.FULLY_CONNECTED):
-            # print("Generating full graph")
-            self._graph = nx.complete_graph(numNodes)  # np.repeat(0, self.numNodes)
+            # the complete graph is implicit (see _getNeighbourNodes)
+            return
         elif (self._netType == consts.NetworkType.ERSOS_RENYI):
             # print("Generating Erdos-Renyi graph (connected)")
             if self._netParam is not None and self._netParam > 0 and self._netParam <= 1:
-                self._graph = nx.erdos_renyi_graph(numNodes, self._netParam, np.random.randint(consts.MAX_RANDOM_SEED))
+                if self._erdosRenyiGenerator == 'networkx':
+                    # equivalence mode: same networks as previous versions for a given seed
+                    def sampleGraph():
+                        return utils._csrFromGraph(nx.erdos_renyi_graph(numNodes, self._netParam, np.random.randint(consts.MAX_RANDOM_SEED)))
+                elif self._erdosRenyiGenerator == 'fast':
+                    def sampleGraph():
+                        return utils._erdosRenyiCSR(numNodes, self._netParam)
+                else:
+                    raise exceptions.MuMoTValueError(f"Unknown Erdos-Renyi network generator '{self._erdosRenyiGenerator}': accepted values are 'fast' and 'networkx'")
+                startTime = time.perf_counter()
+                self._adjacency = sampleGraph()
                 i = 0
-                while (not nx.is_connected(self._graph)):
+                while (not utils._isConnectedCSR(*self._adjacency)):
                     if i > 100000:
                         errorMsg = (f"ERROR! Invalid network parameter (link probability={self._netParam} for E-R networks."
                                     f"After {i} attempts of network initialisation, the network is never connected.\n"
@@ -4212,7 +4628,8 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
                         raise exceptions.MuMoTValueError(errorMsg)
                     # print("Graph was not connected; Resampling!")
                     i = i + 1
-                    self._graph = nx.erdos_renyi_graph(numNodes, self._netParam, np.random.randint(consts.MAX_RANDOM_SEED))
+                    self._adjacency = sampleGraph()
+                self._netGenerationStats = (numNodes, i, time.perf_counter() - startTime)
             else:
                 errorMsg = ("ERROR! Invalid network parameter (link probability) for E-R networks. "
                             f"It must be between 0 and 1; input is {self._netParam}")
@@ -4221,7 +4638,7 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
             # print("Generating Barabasi-Albert graph")
             netParam = int(self._netParam)
             if netParam is not None and netParam > 0 and netParam <= numNodes:
-                self._graph = nx.barabasi_albert_graph(numNodes, netParam, np.random.randint(consts.MAX_RANDOM_SEED))
+                self._adjacency = utils._csrFromGraph(nx.barabasi_albert_graph(numNodes, netParam, np.random.randint(consts.MAX_RANDOM_SEED)))
             else:
                 errorMsg = ("ERROR! Invalid network parameter (number of edges per new node) for B-A networks."
                             f"It must be an integer between 1 and {numNodes}; input is {self._netParam}")
@@ -4231,67 +4648,200 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
             errorMsg = "ERROR: Graphs of type SPACE are not implemented yet."
             raise exceptions.MuMoTValueError(errorMsg)
         elif (self._netType == consts.NetworkType.DYNAMIC):
-            self._positions = []
-            for _ in range(numNodes):
-                x = np.random.rand() * self._arena_width
-                y = np.random.rand() * self._arena_height
-                o = np.random.rand() * np.pi * 2.0
-                self._positions.append((x, y, o))
+            self._positions = np.random.rand(numNodes, 3) * [self._arena_width, self._arena_height, np.pi * 2.0]
             return
 
+    def _getGraph(self):
+        """Return the communication network (of a static network type) as a networkx graph, e.g. for drawing."""
+        if self._adjacency is None:
+            return nx.complete_graph(len(self._agents))
+        indptr, indices = self._adjacency
+        graph = nx.Graph()
+        graph.add_nodes_from(range(len(indptr) - 1))
+        graph.add_edges_from((node, neigh) for node in range(len(indptr) - 1) for neigh in indices[indptr[node]:indptr[node + 1]].tolist())
+        return graph
+
+    def _getNeighbourNodes(self, node):
+        """Return the neighbours of ``node`` in the (static) communication network in random order."""
+        if self._adjacency is None:
+            # fully-connected network: all the other agents, shuffled as the sorted list of their indices would be
+            neighNodes = np.random.permutation(len(self._agents) - 1)
+            neighNodes[neighNodes >= node] += 1
+            return neighNodes
+        indptr, indices = self._adjacency
+        return np.random.permutation(indices[indptr[node]:indptr[node + 1]])
+
+    def _computeAndPlotSimulation(self, _=None) -> None:
+        self._netGenerationStats = None
+        super()._computeAndPlotSimulation(_)
+        if self._netGenerationStats is not None:
+            numNodes, resamplings, seconds = self._netGenerationStats
+            with io.capture_output() as log:
+                print(f"Connected Erdos-Renyi network of {numNodes} nodes generated in {seconds:.3f} s "
+                      f"({resamplings} resampling(s) of disconnected networks)")
+            self._logs.append(log)
+
+    def _runSimulations(self):
+        if self._resumeFrom is not None and self._runs > 1:
+            raise exceptions.MuMoTValueError("A simulation can be resumed from a checkpoint only with runs = 1")
+        if self._checkpointTo is not None and self._runs > 1:
+            raise exceptions.MuMoTValueError("A simulation can be checkpointed only with runs = 1")
+        results = super()._runSimulations()
+        if self._checkpointTo is not None:
+            self._saveCheckpoint(self._checkpointTo, self._getCheckpointState(self._rngState))
+        return results
+
+    def _runSingleSimulation(self, randomSeed, runID=''):
+        self._stepStartState = None
+        if self._resumeFrom is not None:
+            self._loadCheckpoint(self._resumeFrom)
+        else:
+            # init the random seed
+            np.random.seed(randomSeed)
+            self._initSingleSimulation()
+        try:
+            evo = self._simulateUntilMaxTime(runID)
+        except KeyboardInterrupt:
+            if self._checkpointTo is not None and self._stepStartState is not None:
+                self._saveCheckpoint(self._checkpointTo, self._stepStartState)
+            raise
+        self._rngState = np.random.get_state()
+        return evo
+
+    def _getCheckpointState(self, rngState=None) -> Dict:
+        """Return a copy of the time, agents, positions and random-number-generator state of the simulation, with the length of its time evolution."""
+        return {'t': self._t,
+                'agents': self._agents.copy(),
+                'positions': None if self._positions is None else self._positions.copy(),
+                'rngState': np.random.get_state() if rngState is None else rngState,
+                'evoLength': self._evo.numRecords()}
+
+    def _saveCheckpoint(self, path: str, state: Dict) -> None:
+        """Save a simulation ``state`` (see :meth:`_getCheckpointState`), with the network and the time evolution up to it, as a compressed NumPy archive."""
+        evoTimes, evoPopulations = self._evo.arrays()
+        arrays = {'netType': utils._encodeNetworkTypeToString(self._netType),
+                  'codeStates': [str(codeState) for codeState in self._codeStates],
+                  't': state['t'],
+                  'agents': state['agents'],
+                  'rngKeys': state['rngState'][1],
+                  'rngPos': state['rngState'][2],
+                  'rngGauss': state['rngState'][3:],
+                  'evoTimes': evoTimes[:state['evoLength']],
+                  'evoPopulations': evoPopulations[:state['evoLength']],
+                  'evoStates': [str(evoState) for evoState in self._evo if evoState != 'time']}
+        if state['positions'] is not None:
+            arrays['positions'] = state['positions']
+        if self._adjacency is not None:
+            arrays['indptr'], arrays['indices'] = self._adjacency
+        # write to a temporary file first, so that an existing checkpoint is only ever replaced by a complete one
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(path)), suffix='.npz', delete=False) as checkpointFile:
+            np.savez_compressed(checkpointFile, **arrays)
+        os.replace(checkpointFile.name, path)
+
+    def _loadCheckpoint(self, path: str) -> None:
+        """Restore a simulation saved by :meth:`_saveCheckpoint`, to continue it from the saved time.
+
+        The trajectories of the moving particles before the checkpoint are not restored.
+        """
+        self._initStateCodes()
+        with np.load(path, allow_pickle=False) as checkpoint:
+            if str(checkpoint['netType']) != utils._encodeNetworkTypeToString(self._netType):
+                raise exceptions.MuMoTValueError(f"Checkpoint {path} is of a simulation with netType '{checkpoint['netType']}'")
+            if checkpoint['codeStates'].tolist() != [str(codeState) for codeState in self._codeStates]:
+                raise exceptions.MuMoTValueError(f"Checkpoint {path} is of a simulation with different reactants")
+            self._t = float(checkpoint['t'])
+            self._agents = checkpoint['agents']
+            self._positions = checkpoint['positions'] if 'positions' in checkpoint else None
+            self._adjacency = (checkpoint['indptr'], checkpoint['indices']) if 'indptr' in checkpoint else None
+            evoTimes, evoPopulations, evoStates = checkpoint['evoTimes'], checkpoint['evoPopulations'], checkpoint['evoStates'].tolist()
+            rngGauss = checkpoint['rngGauss']
+            np.random.set_state(('MT19937', checkpoint['rngKeys'], int(checkpoint['rngPos']), int(rngGauss[0]), float(rngGauss[1])))
+        stateCounts = np.bincount(self._agents, minlength=len(self._codeStates)).tolist()
+        self._currentState = {state: stateCounts[self._stateCodes[state]] for state in self._initialState.keys()}
+        self._evo = self._newRecorder()
+        self._evo.restore(evoTimes, evoPopulations[:, [evoStates.index(str(state)) for state in self._currentState]],
+                          list(self._currentState.values()))
+        if self._netType == consts.NetworkType.DYNAMIC:
+            self._positionHistory = [[] for _ in range(len(self._agents))]
+        else:  # store the graph layout (only for 'graph' visualisation)
+            self._positionHistory = nx.circular_layout(range(len(self._agents)))
+        if self._progressBar is not None:
+            self._progressBar.max = self._maxTime
+
+    def _initStateCodes(self) -> None:
+        """Code the states as integers and build the reaction tables for the current parameter values."""
+        self._codeStates = sorted(set(self._mumotModel._agentProbabilities.keys()) | set(self._initialState.keys()), key=str)
+        self._stateCodes = {state: code for code, state in enumerate(self._codeStates)}
+        self._buildReactionTables()
+
     def _initMultiagent(self):
-        # init the agents list
-        self._agents = []
+        self._initStateCodes()
+        # init the agents array
+        agents = []
         for state, pop in self._currentState.items():
-            self._agents.extend([state] * pop)
-        self._agents = np.random.permutation(self._agents).tolist()  # random shuffling of elements (useful to avoid initial clusters in networks)
+            agents.extend([self._stateCodes[state]] * pop)
+        self._agents = np.random.permutation(np.array(agents, dtype=int))  # random shuffling of elements (useful to avoid initial clusters in networks)
 
         # init the positionHistory lists
         dynamicNetwork = self._netType == consts.NetworkType.DYNAMIC
         if dynamicNetwork:
             self._positionHistory = []
-            for _ in np.arange(sum(self._currentState.values())):
+            for _ in np.arange(len(self._agents)):
                 self._positionHistory.append([])
         else:  # store the graph layout (only for 'graph' visualisation)
-            self._positionHistory = nx.circular_layout(self._graph)
+            self._positionHistory = nx.circular_layout(range(len(self._agents)))
+
+    def _buildReactionTables(self) -> None:
+        """Precompute, for the current parameter values, the reactions of each agent state with numeric rates (scaled by the timestep size) and integer-coded states."""
+        self._reactionTables = []
+        for state in self._codeStates:
+            table = []
+            for reaction in self._mumotModel._agentProbabilities.get(state, []):
+                rate = float(self._ratesDict[str(reaction[1])]) * self._timestepSize  # scaling the rate by the timeStep size
+                table.append((rate,
+                              tuple(self._stateCodes[reagent] for reagent in reaction[0]),
+                              tuple(reaction[0].count(reagent) for reagent in reaction[0]),
+                              [self._stateCodes[product] for product in reaction[2]],
+                              tuple(self._stateCodes[product] for product in reaction[3])))
+            self._reactionTables.append(tuple(table))
+        self._birthTable = [(float(self._ratesDict[str(birth[1])]) * self._timestepSize,
+                             [self._stateCodes[newborn] for newborn in birth[2]])
+                            for birth in self._mumotModel._agentProbabilities[consts.EMPTYSET_SYMBOL]]
 
     def _simulationStep(self):
-        tmp_agents = copy.deepcopy(self._agents)
+        if self._checkpointTo is not None:
+            self._stepStartState = self._getCheckpointState()
+        # agents interact with the states (and positions) at the beginning of the timestep
+        tmp_agents = self._agents.copy()
         dynamic = self._netType == consts.NetworkType.DYNAMIC
         if dynamic:
-            tmp_positions = copy.deepcopy(self._positions)
-            communication_range = self._netParam
+            tmp_positions = self._positions.copy()
+            neighbourLists = self._getNeighbourLists(tmp_positions, self._netParam)
             # store the position history
-            for idx, _ in enumerate(self._agents):  # second element _ is the agent (unused)
-                self._positionHistory[idx].append(self._positions[idx])
+            for history, position in zip(self._positionHistory, tmp_positions.tolist()):
+                history.append(position)
+            # all the moving-particles move at once
+            self._positions = self._updatePositions(self._positions)
         children = []
-        activeAgents = [True] * len(self._agents)
+        activeAgents = np.ones(len(self._agents), dtype=bool)
         # for idx, a in enumerate(self._agents):
         # to execute in random order the agents I just create a shuffled list of idx and I follow that
         indexes = np.arange(0, len(self._agents))
         indexes = np.random.permutation(indexes).tolist()  # shuffle the indexes
         for idx in indexes:
             a = self._agents[idx]
-            # if moving-particles the agent moves
-            if dynamic:
-                # print("Agent " + str(idx) + " moved from " + str(self._positions[idx]) )
-                self._positions[idx] = self._updatePosition(self._positions[idx][0], self._positions[idx][1], self._positions[idx][2], self._particleSpeed, self._motionCorrelatedness)
-                # print("to position " + str(self._positions[idx]) )
-
             # the step is executed only if the agent is active
             if not activeAgents[idx]:
                 continue
 
-            # computing the list of neighbours for the given agent
+            # computing the array of neighbours for the given agent, in random order (to randomise interactions)
             if dynamic:
-                neighNodes = self._getNeighbours(idx, tmp_positions, communication_range)
+                neighNodes = np.random.permutation(np.array(neighbourLists[idx], dtype=int))
             else:
-                neighNodes = list(nx.all_neighbors(self._graph, idx))
-            neighNodes = np.random.permutation(neighNodes).tolist()  # random shuffling of neighNodes (to randomise interactions)
-            neighAgents = [tmp_agents[x] for x in neighNodes]  # creating the list of neighbours' states
-            neighActive = [activeAgents[x] for x in neighNodes]  # creating the list of neighbour' activity-status
+                neighNodes = self._getNeighbourNodes(idx)
+            neighAgents = tmp_agents[neighNodes]  # creating the array of neighbours' states
+            neighActive = activeAgents[neighNodes]  # creating the array of neighbour' activity-status
 
-            # print("Neighs of agent " + str(idx) + " are " + str(neighNodes) + " with states " + str(neighAgents) )
             # run one simulation step for agent a
             oneStepOutput = self._stepOneAgent(a, neighAgents, neighActive)
             self._agents[idx] = oneStepOutput[0][0]
@@ -4299,25 +4849,22 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
             if len(oneStepOutput[0]) > 1:  # new particles must be created
                 for particle in oneStepOutput[0][1:]:
                     children.append((particle, tmp_positions[idx]))
-            for idx_c, neighChange in enumerate(oneStepOutput[1]):
-                if neighChange:
-                    activeAgents[neighNodes[idx_c]] = False
-                    self._agents[neighNodes[idx_c]] = neighChange
-
-        # add the new agents coming from splitting (possible only for moving-particles view)
-        for child in children:
-            self._agents.append(child[0])
-            self._positions.append(child[1])
-            self._positionHistory.append([])
-            idx = len(self._positions) - 1
-            self._positionHistory[idx].append(self._positions[idx])
-            self._positions[idx] = (self._positions[idx][0], self._positions[idx][1], np.random.rand() * np.pi * 2.0)  # set random orientation
-            # self._positions[idx][2] = np.random.rand() * np.pi * 2.0 # set random orientation
-            self._positions[idx] = self._updatePosition(self._positions[idx][0], self._positions[idx][1], self._positions[idx][2], self._particleSpeed, self._motionCorrelatedness)
+            for idx_c, neighChange in oneStepOutput[1].items():
+                activeAgents[neighNodes[idx_c]] = False
+                self._agents[neighNodes[idx_c]] = neighChange
+
+        # add the new agents coming from splitting and self birth (possible only for moving-particles view)
+        newAgents = [child[0] for child in children]
+        newPositions = []
+        if children:
+            childPositions = np.array([child[1] for child in children])
+            for position in childPositions.tolist():
+                self._positionHistory.append([position])
+            childPositions[:, 2] = np.random.rand(len(children)) * np.pi * 2.0  # set random orientation
+            newPositions.extend(self._updatePositions(childPositions))
 
         # compute self birth (possible only for moving-particles view)
-        for birth in self._mumotModel._agentProbabilities[consts.EMPTYSET_SYMBOL]:
-            birthRate = self._ratesDict[str(birth[1])] * self._timestepSize  # scale the rate
+        for birthRate, newborns in self._birthTable:
             decimal = birthRate % 1
             birthsNum = int(birthRate - decimal)
             np.random.rand()
@@ -4325,106 +4872,119 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
                 birthsNum += 1
             # print ( "Birth rate " + str(birth[1]) + " triggers " + str(birthsNum) + " newborns")
             for _ in range(birthsNum):
-                for newborn in birth[2]:
-                    self._agents.append(newborn)
-                    self._positions.append((np.random.rand() * self._arena_width, np.random.rand() * self._arena_height, np.random.rand() * np.pi * 2.0))
-                    self._positionHistory.append([])
-                    self._positionHistory[len(self._positions) - 1].append(self._positions[len(self._positions) - 1])
-
-        # Remove from lists (_agents, _positions, and _positionHistory) the 'dead' agents (possible only for moving-particles view)
-        deads = [idx for idx, a in enumerate(self._agents) if a == consts.EMPTYSET_SYMBOL]
-        # print("Dead list is " + str(deads))
-        for dead in reversed(deads):
-            del self._agents[dead]
-            del self._positions[dead]
-            del self._positionHistory[dead]
-
-        currentState = {state: self._agents.count(state) for state in self._initialState.keys()}  # if state not in self._mumotModel._constantReactants} # self._mumotModel._reactants | self._mumotModel._constantReactants}
+                for newborn in newborns:
+                    newAgents.append(newborn)
+                    newPositions.append((np.random.rand() * self._arena_width, np.random.rand() * self._arena_height, np.random.rand() * np.pi * 2.0))
+                    self._positionHistory.append([list(newPositions[-1])])
+        if newAgents:
+            self._agents = np.concatenate((self._agents, newAgents))
+            self._positions = np.concatenate((self._positions, newPositions))
+
+        # Remove from arrays (_agents, _positions, and _positionHistory) the 'dead' agents (possible only for moving-particles view)
+        alive = self._agents != self._stateCodes[consts.EMPTYSET_SYMBOL]
+        if not alive.all():
+            self._agents = self._agents[alive]
+            self._positions = self._positions[alive]
+            self._positionHistory = [history for history, isAlive in zip(self._positionHistory, alive) if isAlive]
+
+        stateCounts = np.bincount(self._agents, minlength=len(self._codeStates)).tolist()
+        currentState = {state: stateCounts[self._stateCodes[state]] for state in self._initialState.keys()}
         return (self._timestepSize, currentState)
 
     def _stepOneAgent(self, agent, neighs, activeNeighs):
-        """One timestep for one agent."""
+        """One timestep for one agent.
+
+        States are integer-coded as in ``_agents``; ``neighs`` and ``activeNeighs`` are
+        the arrays of states and activity-status of the neighbours. Returns the new
+        state(s) of the agent and a dictionary of the state changes of the neighbours
+        (by position in ``neighs``).
+
+        """
         rnd = np.random.rand()
         lastVal = 0
-        neighChanges = [None] * len(neighs)
-        # counting how many neighbours for each state (to be uses for the interaction probabilities)
-        neighCount = {x: neighs.count(x) for x in self._initialState.keys()}  # self._mumotModel._reactants | self._mumotModel._constantReactants}
-        for idx, neigh in enumerate(neighs):
-            if not activeNeighs[idx]:
-                neighCount[neigh] -= 1
-        # print("Agent " + str(agent) + " with probSet=" + str(probSets))
-        # print("nc:" + str(neighCount))
-        for reaction in self._mumotModel._agentProbabilities[agent]:
+        numNeighs = len(neighs)
+        neighChanges = {}
+        # counting how many active neighbours for each state (to be uses for the interaction probabilities)
+        neighCount = np.bincount(neighs[activeNeighs], minlength=len(self._codeStates)).tolist()
+        for rate, reagents, multiplicities, products, reagentProducts in self._reactionTables[agent]:
             popScaling = 1
-            rate = self._ratesDict[str(reaction[1])] * self._timestepSize  # scaling the rate by the timeStep size
-            if len(neighs) >= len(reaction[0]):
-                j = 0
-                for reagent in reaction[0]:
-                    popScaling *= (neighCount[reagent] / (len(neighs) - j)
-                                   if neighCount[reagent] >= reaction[0].count(reagent)
-                                   else 0)
-                    j += 1
+            if numNeighs >= len(reagents):
+                for j, reagent in enumerate(reagents):
+                    if neighCount[reagent] < multiplicities[j]:
+                        popScaling = 0
+                        break
+                    popScaling *= neighCount[reagent] / (numNeighs - j)
             else:
                 popScaling = 0
             val = popScaling * rate
-            # print(f"For reaction: {agent}+{reaction[0]} the popScaling is {popScaling}")
             if (rnd < val + lastVal):
                 # A state change happened!
-                # print(f"Reaction: {reaction[1]} by agent {agent} with agent(s) {reaction[0]} becomes {reaction[2]} &others: {reaction[3]}")
-                # print("Val was: {val} lastVal: {lastVal} and rand: {rnd}")
-
                 # Locking the other reagents involved in the reaction
-                for idx_r, reagent in enumerate(reaction[0]):
-                    for idx_n, neigh in enumerate(neighs):
-                        if neigh == reagent and activeNeighs[idx_n] and neighChanges[idx_n] is None:
-                            neighChanges[idx_n] = reaction[3][idx_r]
+                for idx_r, reagent in enumerate(reagents):
+                    for idx_n in np.flatnonzero((neighs == reagent) & activeNeighs).tolist():
+                        if idx_n not in neighChanges:
+                            neighChanges[idx_n] = reagentProducts[idx_r]
                             break
 
-                return (reaction[2], neighChanges)
+                return (products, neighChanges)
             else:
                 lastVal += val
         # No state change happened
         return ([agent], neighChanges)
 
-    def _updatePosition(self, x, y, o, speed, correlatedness):
+    def _updatePositions(self, positions):
+        """Return the positions (one row (x, y, orientation) per particle) after one movement step of all the particles."""
+        speed = self._particleSpeed
+        correlatedness = self._motionCorrelatedness
         # random component
-        rand_o = np.random.rand() * np.pi * 2.0
+        rand_o = np.random.rand(len(positions)) * np.pi * 2.0
         rand_x = speed * np.cos(rand_o) * (1 - correlatedness)
         rand_y = speed * np.sin(rand_o) * (1 - correlatedness)
         # persistance component
-        corr_x = speed * np.cos(o) * correlatedness
-        corr_y = speed * np.sin(o) * correlatedness
+        corr_x = speed * np.cos(positions[:, 2]) * correlatedness
+        corr_y = speed * np.sin(positions[:, 2]) * correlatedness
         # movement
         move_x = rand_x + corr_x
         move_y = rand_y + corr_y
+        newPositions = np.empty_like(positions)
         # new orientation
-        o = np.arctan2(move_y, move_x)
+        newPositions[:, 2] = np.arctan2(move_y, move_x)
         # new position
-        x = x + move_x
-        y = y + move_y
-
-        # Implement the periodic boundary conditions
-        x = x % self._arena_width
-        y = y % self._arena_height
-        # CODE FOR A BOUNDED ARENA
-        # if a.position.x < 0:
-        #     a.position.x = 0
-        # elif a.position.x > self.dimensions.x:
-        #     a.position.x = self.dimensions.x
-        # if a.position.y < 0:
-        #     a.position.y = 0
-        # elif a.position.y > self.dimensions.y:
-        #     a.position.x = self.dimensions.x
-        return (x, y, o)
+        newPositions[:, 0] = positions[:, 0] + move_x
+        newPositions[:, 1] = positions[:, 1] + move_y
+
+        if self._boundedArena:
+            # the walls stop the particles
+            np.clip(newPositions[:, 0], 0, self._arena_width, out=newPositions[:, 0])
+            np.clip(newPositions[:, 1], 0, self._arena_height, out=newPositions[:, 1])
+        else:
+            # Implement the periodic boundary conditions
+            newPositions[:, 0] %= self._arena_width
+            newPositions[:, 1] %= self._arena_height
+        return newPositions
 
     def _getNeighbours(self, agent, positions, distance_range):
         """Return the (index) list of neighbours of ``agent``."""
         neighbour_list = []
         for neigh in np.arange(len(positions)):
-            if (not neigh == agent) and (self._distance_on_torus(positions[agent][0], positions[agent][1], positions[neigh][0], positions[neigh][1]) < distance_range):
+            if (not neigh == agent) and (self._distance(positions[agent][0], positions[agent][1], positions[neigh][0], positions[neigh][1]) < distance_range):
                 neighbour_list.append(neigh)
         return neighbour_list
 
+    def _getNeighbourLists(self, positions, distance_range):
+        """Return the (index) lists of neighbours of all agents, computed at once with a periodic cell list (same result as :meth:`_getNeighbours` for each agent)."""
+        if len(positions) == 0:
+            return []
+        xs, ys = np.asarray(positions, dtype=float)[:, :2].T
+        return utils._toroidalNeighbourLists(xs, ys, distance_range, self._arena_width, self._arena_height,
+                                             periodic=not self._boundedArena)
+
+    def _distance(self, x_1, y_1, x_2, y_2):
+        """Returns the distance between two points in the arena (on the torus, unless the arena is bounded)."""
+        if self._boundedArena:
+            return np.sqrt((x_1 - x_2)**2 + (y_1 - y_2)**2)
+        return self._distance_on_torus(x_1, y_1, x_2, y_2)
+
     def _distance_on_torus(self, x_1, y_1, x_2, y_2):
         """Returns the minimum distance calculated on the torus given by periodic boundary conditions."""
         return np.sqrt(min(abs(x_1 - x_2), self._arena_width - abs(x_1 - x_2))**2 +
@@ -4499,6 +5059,8 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
                 self._controller._widgetsExtraParams['particleSpeed'].layout.display = 'flex'
             if self._controller._widgetsExtraParams.get('motionCorrelatedness') is not None:
                 self._controller._widgetsExtraParams['motionCorrelatedness'].layout.display = 'flex'
+            if self._controller._widgetsExtraParams.get('boundedArena') is not None:
+                self._controller._widgetsExtraParams['boundedArena'].layout.display = 'flex'
             if self._controller._widgetsPlotOnly.get('showTrace') is not None:
                 self._controller._widgetsPlotOnly['showTrace'].layout.display = 'flex'
             if self._controller._widgetsPlotOnly.get('showInteractions') is not None:
@@ -4512,6 +5074,8 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
                 self._controller._widgetsExtraParams['particleSpeed'].layout.display = 'none'
             if self._controller._widgetsExtraParams.get('motionCorrelatedness') is not None:
                 self._controller._widgetsExtraParams['motionCorrelatedness'].layout.display = 'none'
+            if self._controller._widgetsExtraParams.get('boundedArena') is not None:
+                self._controller._widgetsExtraParams['boundedArena'].layout.display = 'none'
             if self._controller._widgetsPlotOnly.get('showTrace') is not None:
                 self._controller._widgetsPlotOnly['showTrace'].layout.display = 'none'
             if self._controller._widgetsPlotOnly.get('showInteractions') is not None:
@@ -4548,14 +5112,50 @@ class MuMoTmultiagentView(MuMoTstochasticSimulationView):
 class MuMoTSSAView(MuMoTstochasticSimulationView):
     """View for computational simulations of the Gillespie algorithm to approximate the Master Equation solution."""
 
-    # A matrix form of the left-handside of the rules
+    # A matrix form of the left-handside of the rules (index in _stateList of each reagent, in the order it appears in the rule)
     _reactantsMatrix = None
-    # The effect of each rule
+    # multiplicity of each reagent in _reactantsMatrix (zero for padding entries)
+    _reactantsOccurrences = None
+    # number of reagents of each rule (constant reactants count as one)
+    _numReagents = None
+    # numerical value of the rate of each rule
+    _ratesVector = None
+    # The effect of each rule (state-change matrix with one row per rule and one column per state in _stateList)
     _ruleChanges = None
-
-    def _constructorSpecificParams(self, _) -> None:
+    # ordered list of states corresponding to the columns of _ruleChanges and the entries of _stateArray
+    _stateList = None
+    # identifier of the parameter set used to build the compiled matrices
+    _compiledRates = None
+    # current population of each state as a NumPy integer array
+    _stateArray = None
+    # simulation algorithm ('direct', 'next-reaction' or 'tau-leap')
+    _method = None
+    # error-control parameter of tau-leaping (bound on the relative change of the propensities in one leap)
+    _epsilon = None
+    # highest order of the rules in which each state appears as reagent, and its multiplicity in that rule (tau-leaping)
+    _highestOrderOfReaction = None
+    _highestOrderMultiplicity = None
+    # number of exact steps of the direct method still to be executed before attempting a leap again (tau-leaping)
+    _exactStepsLeft = 0
+    # for each rule, the array of rules whose propensity changes when it fires (next reaction method)
+    _dependencyGraph = None
+    # current propensity of each rule (next reaction method)
+    _propensities = None
+    # indexed priority queue with the putative absolute time of each rule (next reaction method)
+    _reactionTimes = None
+
+    def _constructorSpecificParams(self, SSParams) -> None:
         if self._controller is not None:
             self._generatingCommand = "SSA"
+        else:
+            self._method = SSParams.get('method', 'direct')
+            self._epsilon = SSParams.get('epsilon', 0.03)
+
+    def _update_view_specific_params(self, freeParamDict=None) -> None:
+        super()._update_view_specific_params(freeParamDict)
+        if self._controller is not None:
+            self._method = self._getWidgetParamValue('method', self._controller._widgetsExtraParams)
+            self._epsilon = self._getWidgetParamValue('epsilon', self._controller._widgetsExtraParams)
 
     def _build_bookmark(self, includeParams=True) -> str:
         log_str = "bookmark = " if not self._silent else ""
@@ -4573,6 +5173,9 @@ class MuMoTSSAView(MuMoTstochasticSimulationView):
         log_str += "initialState = " + str(initState_str)
         log_str += ", maxTime = " + str(self._maxTime)
         log_str += ", randomSeed = " + str(self._randomSeed)
+        log_str += ", method = '" + str(self._method) + "'"
+        if self._method == 'tau-leap':
+            log_str += ", epsilon = " + str(self._epsilon)
         log_str += ", visualisationType = '" + str(self._visualisationType) + "'"
         if self._visualisationType == 'final':
             # these loops are necessary to return the latex() format of the reactant
@@ -4588,6 +5191,10 @@ class MuMoTSSAView(MuMoTstochasticSimulationView):
         log_str += ", realtimePlot = " + str(self._realtimePlot)
         log_str += ", runs = " + str(self._runs)
         log_str += ", aggregateResults = " + str(self._aggregateResults)
+        if self._recordInterval is not None:
+            log_str += ", recordInterval = " + str(self._recordInterval)
+        if self._spillDir is not None:
+            log_str += ", spillDir = " + repr(self._spillDir)
         log_str += ", silent = " + str(self._silent)
         log_str += ", bookmark = False"
         # if len(self._generatingKwargs) > 0:
@@ -4609,6 +5216,8 @@ class MuMoTSSAView(MuMoTstochasticSimulationView):
                                       if state not in self._mumotModel._constantReactants}
         ssa_params["maxTime"] = self._maxTime
         ssa_params["randomSeed"] = self._randomSeed
+        ssa_params["method"] = self._method
+        ssa_params["epsilon"] = self._epsilon
         ssa_params["visualisationType"] = self._visualisationType
         if self._visualisationType == 'final':
             # this loop is necessary to return the latex() format of the reactant
@@ -4624,12 +5233,40 @@ class MuMoTSSAView(MuMoTstochasticSimulationView):
         # str( list(self._ratesDict.items()) )
         print("mumot.MuMoTSSAView(<modelName>, None, " + str(self._get_bookmarks_params().replace('\\', '\\\\')) + ", SSParams = " + str(ssa_params) + " )")
 
-    def _simulationStep(self) -> Tuple[float, object]:
-        """Update transition probabilities accounting for the current state."""
-        probabilitiesOfChange = {}
-        for reaction_id, reaction in self._mumotModel._stoichiometry.items():
-            prob = self._ratesDict[str(reaction["rate"])]
-            numReagents = 0
+    def _initSingleSimulation(self) -> None:
+        super()._initSingleSimulation()
+        self._stateList = list(self._currentState.keys())
+        self._stateArray = np.array([self._currentState[state] for state in self._stateList], dtype=np.int64)
+        self._compileReactions()
+        self._exactStepsLeft = 0
+        if self._method == 'next-reaction':
+            self._initNextReaction()
+
+    def _compileReactions(self) -> None:
+        """Build the matrix form of the rules for the current parameter set.
+
+        The propensity of each rule is computed from ``_ratesVector``,
+        ``_reactantsMatrix`` and ``_reactantsOccurrences``, and the effect of
+        each rule is stored in the state-change matrix ``_ruleChanges``.  The
+        reagents of each rule are kept in the order in which they appear in
+        ``_stoichiometry`` so that the floating-point operations (and
+        therefore the results for a given random seed) are the same as
+        evaluating the rules one by one.  The matrices are only rebuilt when
+        the rates or the list of states change.
+
+        """
+        compiledRates = (tuple(self._stateList), tuple(self._ratesDict.items()))
+        if self._compiledRates == compiledRates:
+            return
+        stateIndex = {state: idx for idx, state in enumerate(self._stateList)}
+        numRules = len(self._mumotModel._stoichiometry)
+        reagents = []
+        self._ratesVector = np.zeros(numRules, dtype=float)
+        self._numReagents = np.zeros(numRules, dtype=np.int64)
+        self._ruleChanges = np.zeros((numRules, len(self._stateList)), dtype=np.int64)
+        for ruleIdx, reaction in enumerate(self._mumotModel._stoichiometry.values()):
+            self._ratesVector[ruleIdx] = float(self._ratesDict[str(reaction["rate"])])
+            ruleReagents = []
             for reactant, re_stoch in reaction.items():
                 if reactant == 'rate':
                     continue
@@ -4637,71 +5274,222 @@ class MuMoTSSAView(MuMoTstochasticSimulationView):
                     reactantOccurencies = 1
                 else:
                     reactantOccurencies = re_stoch[0]
+                    self._ruleChanges[ruleIdx, stateIndex[reactant]] += re_stoch[1] - re_stoch[0]
                 if reactantOccurencies > 0:
-                    prob *= self._currentState[reactant] ** reactantOccurencies
-                numReagents += reactantOccurencies
-            # print("for reaction " + str(reaction) + " counted " + str(numReagents) + " reagents (prob:" + str(prob) +" ) (rate: " + str(self._ratesDict[str(reaction["rate"])]) + ")")
-            if prob > 0 and numReagents > 1:
-                prob /= sum(self._currentState.values())**(numReagents - 1)
-            probabilitiesOfChange[reaction_id] = prob
-        # for rule in self._reactantsMatrix:
-        #     prob = sum([a * b for a,b in zip(rule,currentState)])
-        #     numReagents = sum(x > 0 for x in rule)
-        #     if numReagents > 1:
-        #         prob /= sum(currentState)**( numReagents -1 )
-        #     probabilitiesOfChange.append(prob)
-        probSum = sum(probabilitiesOfChange.values())
+                    ruleReagents.append((stateIndex[reactant], reactantOccurencies))
+                self._numReagents[ruleIdx] += reactantOccurencies
+            reagents.append(ruleReagents)
+        maxReagents = max([len(ruleReagents) for ruleReagents in reagents] + [1])
+        # padding entries point to the first state with multiplicity zero, so that they multiply the propensity by one
+        self._reactantsMatrix = np.zeros((numRules, maxReagents), dtype=np.int64)
+        self._reactantsOccurrences = np.zeros((numRules, maxReagents), dtype=np.int64)
+        for ruleIdx, ruleReagents in enumerate(reagents):
+            for col, (stateIdx, reactantOccurencies) in enumerate(ruleReagents):
+                self._reactantsMatrix[ruleIdx, col] = stateIdx
+                self._reactantsOccurrences[ruleIdx, col] = reactantOccurencies
+        # the propensity of a rule changes when one of its reagents changes or, for rules with more than one reagent, when the total population changes
+        self._dependencyGraph = []
+        for ruleIdx in range(numRules):
+            changedStates = set(np.flatnonzero(self._ruleChanges[ruleIdx]))
+            affected = [otherIdx for otherIdx, ruleReagents in enumerate(reagents)
+                        if otherIdx == ruleIdx or
+                        any(stateIdx in changedStates for stateIdx, _ in ruleReagents) or
+                        (self._numReagents[otherIdx] > 1 and self._ruleChanges[ruleIdx].sum() != 0)]
+            self._dependencyGraph.append(np.array(affected, dtype=np.int64))
+        self._highestOrderOfReaction = np.zeros(len(self._stateList), dtype=np.int64)
+        self._highestOrderMultiplicity = np.zeros(len(self._stateList), dtype=np.int64)
+        for ruleIdx, ruleReagents in enumerate(reagents):
+            for stateIdx, reactantOccurencies in ruleReagents:
+                order = self._numReagents[ruleIdx]
+                if (order, reactantOccurencies) > (self._highestOrderOfReaction[stateIdx], self._highestOrderMultiplicity[stateIdx]):
+                    self._highestOrderOfReaction[stateIdx] = order
+                    self._highestOrderMultiplicity[stateIdx] = reactantOccurencies
+        self._compiledRates = compiledRates
+
+    def _computePropensities(self, rules=None):
+        """Return the propensity of the rules with indices ``rules`` (all rules if None) in the current state."""
+        if rules is None:
+            rules = slice(None)
+        probabilitiesOfChange = self._ratesVector[rules]
+        for col in range(self._reactantsMatrix.shape[1]):
+            probabilitiesOfChange = probabilitiesOfChange * self._stateArray[self._reactantsMatrix[rules, col]] ** self._reactantsOccurrences[rules, col]
+        numReagents = self._numReagents[rules]
+        multiReagents = (numReagents > 1) & (probabilitiesOfChange > 0)
+        if multiReagents.any():
+            probabilitiesOfChange[multiReagents] /= self._stateArray.sum() ** (numReagents[multiReagents] - 1)
+        return probabilitiesOfChange
+
+    def _initNextReaction(self) -> None:
+        """Draw the first putative time of each rule for the next reaction method."""
+        self._propensities = self._computePropensities()
+        times = [np.random.exponential(1 / prop) if prop > 0 else float('inf')
+                 for prop in self._propensities]
+        self._reactionTimes = utils._IndexedPriorityQueue(times)
+
+    def _runSingleSimulation(self, randomSeed, runID=''):
+        # init the random seed
+        np.random.seed(randomSeed)
+
+        self._initSingleSimulation()
+        frameLimiter = self._newFrameLimiter()
+
+        while self._t < self._maxTime:
+            timeInterval, self._stateArray = self._simulationStep()
+            # increment time
+            self._t += timeInterval
+            # log step
+            self._evo.record(self._t, self._stateArray)
+
+            # update progress bar and realtime plot (at most maxFPS times per second)
+            if frameLimiter.ready():
+                self._updateRealtimeOutput(runID)
+
+        self._currentState = dict(zip(self._stateList, self._stateArray.tolist()))
+        self._updateRealtimeOutput(runID)
+        self._completeProgressBar()
+        return self._evo.finalise(self._maxTime)
+
+    def _simulationStep(self) -> Tuple[float, object]:
+        if self._method == 'next-reaction':
+            return self._nextReactionStep()
+        if self._method == 'tau-leap':
+            return self._tauLeapStep()
+        return self._directMethodStep()
+
+    def _directMethodStep(self) -> Tuple[float, object]:
+        """Update transition probabilities accounting for the current state."""
+        probabilitiesOfChange = self._computePropensities()
+        # cumsum accumulates sequentially, hence the total is identical to summing the rules one by one
+        probSum = np.cumsum(probabilitiesOfChange)[-1]
         if probSum == 0:  # no reaction are possible (the execution terminates with this population)
             infiniteTime = self._maxTime - self._t
-            return (infiniteTime, self._currentState)
+            return (infiniteTime, self._stateArray)
         # computing when is happening next reaction
         timeInterval = np.random.exponential(1 / probSum)
 
         # Selecting the occurred reaction at random, with probability proportional to each reaction probabilities
-        bottom = 0.0
         # Get a random between [0,1) (but we don't want 0!)
         reaction = 0.0
         while reaction == 0.0:
             reaction = np.random.random_sample()
-        # Normalising probOfChange in the range [0,1]
-        #  probabilitiesOfChange = [pc / probSum for pc in probabilitiesOfChange]
-        probabilitiesOfChange = {r_id: pc / probSum
-                                 for r_id, pc in probabilitiesOfChange.items()}
-        # print("Prob of Change: " + str(probabilitiesOfChange))
-        # index = -1
-        # for i, prob in enumerate(probabilitiesOfChange):
-        #     if ( reaction >= bottom and reaction < (bottom + prob)):
-        #         index = i
-        #         break
-        #     bottom += prob
-
-        # if (index == -1):
-        #     print("ERROR! Transition not found. Error in the algorithm execution.")
-        #     sys.exit()
-        reaction_id = -1
-        for r_id, prob in probabilitiesOfChange.items():
-            if bottom <= reaction < (bottom + prob):
-                reaction_id = r_id
-                break
-            bottom += prob
+        # Normalising probOfChange in the range [0,1] and selecting the first rule whose cumulative probability exceeds the random number
+        cumulativeProbabilities = np.cumsum(probabilitiesOfChange / probSum)
+        reaction_id = np.searchsorted(cumulativeProbabilities, reaction, side='right')
 
-        if reaction_id == -1:
+        if reaction_id == len(cumulativeProbabilities):
             raise exceptions.MuMoTError("ERROR! Transition not found. Error in the algorithm execution.")
-            sys.exit()
-        # print("current state: " + str(self._currentState))
-        # print("triggered change: " + str(self._mumotModel._stoichiometry[reaction_id]))
-        # # apply the change
-        # currentState = list(np.array(self._currentState) + np.array(self._ruleChanges[index]) )
-        for reactant, re_stoch in self._mumotModel._stoichiometry[reaction_id].items():
-            if reactant == 'rate' or re_stoch == 'const':
-                continue
-            self._currentState[reactant] += re_stoch[1] - re_stoch[0]
-            if self._currentState[reactant] < 0:
-                raise exceptions.MuMoTError(f"ERROR! Population size became negative: {self._currentState}; Error in the algorithm execution.")
-                sys.exit()
-        # print(self._currentState)
+        self._applyRuleChange(reaction_id)
 
-        return (timeInterval, self._currentState)
+        return (timeInterval, self._stateArray)
+
+    def _nextReactionStep(self) -> Tuple[float, object]:
+        """Fire the rule with the earliest putative time (Gibson and Bruck next reaction method)."""
+        reaction_id, reactionTime = self._reactionTimes.top()
+        if reactionTime == float('inf'):  # no reaction are possible (the execution terminates with this population)
+            infiniteTime = self._maxTime - self._t
+            return (infiniteTime, self._stateArray)
+        self._applyRuleChange(reaction_id)
+
+        # update only the propensities (and putative times) of the rules affected by the fired one
+        affected = self._dependencyGraph[reaction_id]
+        newPropensities = self._computePropensities(affected)
+        for ruleIdx, newProp in zip(affected.tolist(), newPropensities.tolist()):
+            oldProp = self._propensities[ruleIdx]
+            if newProp <= 0:
+                newTime = float('inf')
+            elif ruleIdx != reaction_id and oldProp > 0:
+                # rescale the residual waiting time of the rule to its new propensity
+                newTime = reactionTime + (oldProp / newProp) * (self._reactionTimes.time(ruleIdx) - reactionTime)
+            else:
+                newTime = reactionTime + np.random.exponential(1 / newProp)
+            self._propensities[ruleIdx] = newProp
+            self._reactionTimes.update(ruleIdx, newTime)
+
+        return (reactionTime - self._t, self._stateArray)
+
+    def _tauLeapStep(self) -> Tuple[float, object]:
+        """Fire several rules at once (tau-leaping with the Cao, Gillespie and Petzold step-size selection).
+
+        Rules that could exhaust one of their reagents in a few firings
+        (critical rules) fire at most once per leap.  When the selected leap is
+        too small to be advantageous, a batch of exact steps of the direct
+        method is executed (one per call) before attempting a leap again.
+
+        """
+        # number of firings after which a rule is considered at risk of exhausting its reagents
+        criticalFirings = 10
+        # number of exact steps executed when a leap is rejected
+        exactSteps = 100
+        if self._exactStepsLeft > 0:
+            self._exactStepsLeft -= 1
+            return self._directMethodStep()
+        propensities = self._computePropensities()
+        totalProp = propensities.sum()
+        if totalProp == 0:  # no reaction are possible (the execution terminates with this population)
+            infiniteTime = self._maxTime - self._t
+            return (infiniteTime, self._stateArray)
+
+        consumed = np.where(self._ruleChanges < 0, -self._ruleChanges, 0)
+        maxFirings = np.where(consumed > 0, self._stateArray // np.maximum(consumed, 1), np.iinfo(np.int64).max).min(axis=1)
+        critical = (maxFirings < criticalFirings) & (propensities > 0)
+        nonCritical = ~critical
+
+        tauPrime = self._tauLeapStepSize(propensities * nonCritical)
+        if tauPrime < 10 / totalProp:
+            self._exactStepsLeft = exactSteps - 1
+            return self._directMethodStep()
+        tauPrime = min(tauPrime, self._maxTime - self._t)
+
+        criticalProp = propensities[critical].sum()
+        while True:
+            tauSecond = np.random.exponential(1 / criticalProp) if criticalProp > 0 else float('inf')
+            firings = np.zeros(len(propensities), dtype=np.int64)
+            if tauPrime < tauSecond:
+                tau = tauPrime
+            else:
+                # exactly one critical rule fires, chosen with probability proportional to its propensity
+                tau = tauSecond
+                criticalIdx = np.flatnonzero(critical)
+                firings[np.random.choice(criticalIdx, p=propensities[criticalIdx] / criticalProp)] = 1
+            firings[nonCritical] = np.random.poisson(propensities[nonCritical] * tau)
+            newState = self._stateArray + firings @ self._ruleChanges
+            if (newState >= 0).all():
+                break
+            # the leap was too large and made a population negative: retry with half the step
+            tauPrime /= 2
+
+        self._stateArray[:] = newState
+        return (tau, self._stateArray)
+
+    def _tauLeapStepSize(self, propensities) -> float:
+        """Return the largest leap that keeps the relative change of each propensity below ``_epsilon``."""
+        changing = self._highestOrderOfReaction > 0
+        populations = self._stateArray[changing].astype(float)
+        order = self._highestOrderOfReaction[changing]
+        multiplicity = self._highestOrderMultiplicity[changing]
+        # the factor g_i of Cao, Gillespie and Petzold (2006) for each state, depending on the highest order of reaction it is involved in
+        with np.errstate(divide='ignore'):
+            inv1 = np.where(populations > 1, 1 / (populations - 1), 1)
+            inv2 = np.where(populations > 2, 2 / (populations - 2), 2)
+        g = order.astype(float)
+        g = np.where((order == 2) & (multiplicity == 2), 2 + inv1, g)
+        g = np.where((order == 3) & (multiplicity == 2), 1.5 * (2 + inv1), g)
+        g = np.where((order == 3) & (multiplicity == 3), 3 + inv1 + inv2, g)
+
+        ruleChanges = self._ruleChanges[:, changing]
+        mean = np.abs(propensities @ ruleChanges)
+        variance = propensities @ ruleChanges ** 2
+        bound = np.maximum(self._epsilon * populations / g, 1)
+        with np.errstate(divide='ignore'):
+            tau = np.minimum(np.where(mean > 0, bound / mean, np.inf),
+                             np.where(variance > 0, bound ** 2 / variance, np.inf))
+        return tau.min() if tau.size > 0 else float('inf')
+
+    def _applyRuleChange(self, reaction_id: int) -> None:
+        """Apply the state change of rule ``reaction_id`` to ``_stateArray``."""
+        self._stateArray += self._ruleChanges[reaction_id]
+        if (self._stateArray < 0).any():
+            raise exceptions.MuMoTError(f"ERROR! Population size became negative: {dict(zip(self._stateList, self._stateArray.tolist()))}; Error in the algorithm execution.")
 
 
 class Arrow3D(mpatch.FancyArrowPatch):
@@ -4721,6 +5509,18 @@ class Arrow3D(mpatch.FancyArrowPatch):
         mpatch.FancyArrowPatch.draw(self, renderer)
 
 
+def _runSimulationInWorker(view, randomSeed):
+    """Execute one run of a (pickled) stochastic-simulation view in a worker process.
+
+    Returns the time evolution of the run and the final state of the view.
+
+    """
+    evo = view._runSingleSimulation(randomSeed)
+    finalState = view.__getstate__()
+    del finalState['_mumotModel']
+    return evo, finalState
+
+
 def _roundNumLogsOut(number: Union[sympy.Add, float]) -> str:
     """ Round numerical output in Logs to 3 decimal places. """
     # if number is complex
@@ -4776,7 +5576,7 @@ def _fig_formatting_3D(figure, xlab=None, ylab=None, zlab=None, ax_reformat=Fals
     """
     fig = plt.gcf()
     # fig.set_size_inches(10,8)
-    ax = fig.gca(projection='3d')
+    ax = fig.gca()
 
     if kwargs.get('showPlane', False) is True:
         # pointsMesh = np.linspace(0, 1, 11)
@@ -4879,10 +5679,7 @@ def _fig_formatting_3D(figure, xlab=None, ylab=None, zlab=None, ax_reformat=Fals
             for jj in range(len(specialPoints[0])):
                 try:
                     len(specialPoints[3][jj]) == 3
-                    lam1 = specialPoints[3][jj][0]
-                    lam2 = specialPoints[3][jj][1]
-                    lam3 = specialPoints[3][jj][2]
-                    if (sympy.re(lam1) < 0 and sympy.re(lam2) < 0 and sympy.re(lam3) < 0):
+                    if utils._classifyStability(specialPoints[3][jj]) == 'stable':
                         FPcolor = 'g'
                         FPmarker = 'o'
                     else:
@@ -5311,12 +6108,11 @@ def _fig_formatting_2D(figure=None, xdata=None, ydata=None, choose_xrange=None,
             for jj in range(len(specialPoints[0])):
                 try:
                     len(specialPoints[2][jj]) == 2
-                    lam1 = specialPoints[2][jj][0]
-                    lam2 = specialPoints[2][jj][1]
-                    if sympy.re(lam1) < 0 and sympy.re(lam2) < 0:
+                    stability = utils._classifyStability(specialPoints[2][jj])
+                    if stability == 'stable':
                         FPcolor = line_color_list[1]
                         FPfill = 'full'
-                    elif sympy.re(lam1) > 0 and sympy.re(lam2) > 0:
+                    elif stability == 'unstable':
                         FPcolor = line_color_list[2]
                         FPfill = 'none'
                     else:
@@ -5324,9 +6120,10 @@ def _fig_formatting_2D(figure=None, xdata=None, ydata=None, choose_xrange=None,
                         FPfill = 'none'
                 except:
                     print('Check input!')
+                    stability = None
                     FPcolor = line_color_list[-1]
                     FPfill = 'none'
-                if sympy.re(lam1) != 0 and sympy.re(lam2) != 0:
+                if stability != 'marginal':
                     plt.plot([specialPoints[0][jj]], [specialPoints[1][jj]], marker='o', markersize=9,
                              c=FPcolor, fillstyle=FPfill, mew=3, mec=FPcolor)
 
@@ -5444,8 +6241,8 @@ def _fig_formatting_1D(figure=None, xdata=None, choose_xrange=None,
         if not specialPoints[0] == []:
             for jj in range(len(specialPoints[0])):
                 try:
-                    lam1 = specialPoints[1][jj]
-                    if sympy.re(lam1) < 0:
+                    stability = utils._classifyStability([specialPoints[1][jj]])
+                    if stability == 'stable':
                         FPfill = 'full'
                         circleColor = 'green'
                     else:
@@ -5453,8 +6250,9 @@ def _fig_formatting_1D(figure=None, xdata=None, choose_xrange=None,
                         circleColor = 'red'
                 except:
                     print('Check input!')
+                    stability = None
                     FPfill = 'none'
-                if sympy.re(lam1) != 0:
+                if stability != 'marginal':
                     plt.plot([specialPoints[0][jj]], 0.0, marker='o', markersize=9,
                              c=circleColor, fillstyle=FPfill, mew=3)
 
@@ -5599,250 +6397,6 @@ def _plot_cov_ellipse(
     return ellip
 
 
-def _deriveODEsFromRules(reactants, rules):
-    # @todo: replace with principled derivation via Master Equation and van Kampen expansion
-    equations = {}
-    terms = []
-    for rule in rules:
-        term = None
-        for reactant in rule.lhsReactants:
-            if term is None:
-                term = reactant
-            else:
-                term = term * reactant
-        term = term * rule.rate
-        terms.append(term)
-    for reactant in reactants:
-        rhs = None
-        for rule, term in zip(rules, terms):
-            # I love Python!
-            factor = rule.rhsReactants.count(reactant) - rule.lhsReactants.count(reactant)
-            if factor != 0:
-                if rhs is None:
-                    rhs = factor * term
-                else:
-                    rhs = rhs + factor * term
-        equations[reactant] = rhs
-
-    return equations
-
-
-def _deriveMasterEquation(stoichiometry):
-    """Derive the Master equation
-
-    Returns dictionary used in :method:`MuMoTmodel.showMasterEquation`.
-    """
-    substring = None
-
-    x, y, v, w, t, m = symbols('x y v w t m')
-    E_op = Function('E_op')
-    z = Function('z')
-    P = Function('P')
-    V = Symbol(r'\overline{V}', real=True, constant=True)
-
-    stoich = stoichiometry
-    nvec = []
-    for key1 in stoich:
-        for key2 in stoich[key1]:
-            if key2 != 'rate' and stoich[key1][key2] != 'const':
-                if key2 not in nvec:
-                    nvec.append(key2)
-                if len(stoich[key1][key2]) == 3:
-                    substring = stoich[key1][key2][2]
-    nvec = sorted(nvec, key=default_sort_key)
-
-    if len(nvec) < 1 or len(nvec) > 4:
-        print("Derivation of Master Equation works for 1, 2, 3 or 4 different reactants only")
-
-        return None, None
-
-    # assert (len(nvec)==2 or len(nvec)==3 or len(nvec)==4), 'This module works for 2, 3 or 4 different reactants only'
-
-    rhs = 0
-    sol_dict_rhs = {}
-    f = lambdify(z(y, v - w), z(y, v - w), modules='sympy')
-    g = lambdify((x, y, v), (factorial(x) / factorial(x - y)) / v**y, modules='sympy')
-    for key1 in stoich:
-        prod1 = 1
-        prod2 = 1
-        rate_fact = 1
-        for key2 in stoich[key1]:
-            if key2 != 'rate' and stoich[key1][key2] != 'const':
-                prod1 *= f(E_op(key2, stoich[key1][key2][0] - stoich[key1][key2][1]))
-                prod2 *= g(key2, stoich[key1][key2][0], V)
-            if stoich[key1][key2] == 'const':
-                rate_fact *= key2 / V
-
-        if len(nvec) == 1:
-            sol_dict_rhs[key1] = (prod1, simplify(prod2 * V), P(nvec[0], t), stoich[key1]['rate'] * rate_fact)
-        elif len(nvec) == 2:
-            sol_dict_rhs[key1] = (prod1, simplify(prod2 * V), P(nvec[0], nvec[1], t), stoich[key1]['rate'] * rate_fact)
-        elif len(nvec) == 3:
-            sol_dict_rhs[key1] = (prod1, simplify(prod2 * V), P(nvec[0], nvec[1], nvec[2], t), stoich[key1]['rate'] * rate_fact)
-        else:
-            sol_dict_rhs[key1] = (prod1, simplify(prod2 * V), P(nvec[0], nvec[1], nvec[2], nvec[3], t), stoich[key1]['rate'] * rate_fact)
-
-    return sol_dict_rhs, substring
-
-
-def _doVanKampenExpansion(rhs, stoich):
-    """Return the left-hand side and right-hand side of van Kampen expansion."""
-    x, y, v, w, t, m = symbols('x y v w t m')
-    E_op = Function('E_op')
-    P = Function('P')
-    V = Symbol(r'\overline{V}', real=True, constant=True)
-    nvec = []
-    nconstvec = []
-    for key1 in stoich:
-        for key2 in stoich[key1]:
-            if key2 != 'rate' and stoich[key1][key2] != 'const':
-                if key2 not in nvec:
-                    nvec.append(key2)
-            elif key2 != 'rate' and stoich[key1][key2] == 'const':
-                if key2 not in nconstvec:
-                    nconstvec.append(key2)
-
-    nvec = sorted(nvec, key=default_sort_key)
-    if len(nvec) < 1 or len(nvec) > 4:
-        print("van Kampen expansion works for 1, 2, 3 or 4 different reactants only")
-
-        return None, None, None
-    # assert (len(nvec)==2 or len(nvec)==3 or len(nvec)==4), 'This module works for 2, 3 or 4 different reactants only'
-
-    NoiseDict = {}
-    PhiDict = {}
-    PhiConstDict = {}
-
-    for kk in range(len(nvec)):
-        NoiseDict[nvec[kk]] = Symbol(f"eta_{nvec[kk]}")
-        PhiDict[nvec[kk]] = Symbol(f"Phi_{nvec[kk]}")
-
-    for kk in range(len(nconstvec)):
-        PhiConstDict[nconstvec[kk]] = V * Symbol(f"Phi_{nconstvec[kk]}")
-
-    rhs_dict, substring = rhs(stoich)
-    rhs_vKE = 0
-
-    if len(nvec) == 1:
-        lhs_vKE = (Derivative(P(nvec[0], t), t).subs({nvec[0]: NoiseDict[nvec[0]]}) -
-                   sympy.sqrt(V) * Derivative(PhiDict[nvec[0]], t) * Derivative(P(nvec[0], t), nvec[0]).subs({nvec[0]: NoiseDict[nvec[0]]}))
-        for key in rhs_dict:
-            op = rhs_dict[key][0].subs({nvec[0]: NoiseDict[nvec[0]]})
-            func1 = rhs_dict[key][1].subs({nvec[0]: V * PhiDict[nvec[0]] + sympy.sqrt(V) * NoiseDict[nvec[0]]})
-            func2 = rhs_dict[key][2].subs({nvec[0]: NoiseDict[nvec[0]]})
-            func = func1 * func2
-            # if len(op.args[0].args) ==0:
-            term = (op * func).subs({
-                op * func: func + op.args[1] / sympy.sqrt(V) * Derivative(func, op.args[0]) + op.args[1]**2 / (2 * V) * Derivative(func, op.args[0], op.args[0])})
-            # else:
-            #     term = (op.args[1] * func).subs({op.args[1] * func: func + op.args[1].args[1] / sympy.sqrt(V) * Derivative(func, op.args[1].args[0])
-            #                            + op.args[1].args[1]**2 / (2 * V) * Derivative(func, op.args[1].args[0], op.args[1].args[0])})
-            #     term = (op.args[0] * term).subs({op.args[0] * term: term + op.args[0].args[1] / sympy.sqrt(V) * Derivative(term, op.args[0].args[0])
-            #                            + op.args[0].args[1]**2 / (2 * V) * Derivative(term, op.args[0].args[0], op.args[0].args[0])})
-            rhs_vKE += rhs_dict[key][3].subs(PhiConstDict) * (term.doit() - func)
-    elif len(nvec) == 2:
-        lhs_vKE = (Derivative(P(nvec[0], nvec[1], t), t).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]]})
-                   - sympy.sqrt(V) * Derivative(PhiDict[nvec[0]], t) * Derivative(P(nvec[0], nvec[1], t), nvec[0]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]]})
-                   - sympy.sqrt(V) * Derivative(PhiDict[nvec[1]], t) * Derivative(P(nvec[0], nvec[1], t), nvec[1]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]]}))
-
-        for key in rhs_dict:
-            op = rhs_dict[key][0].subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]]})
-            func1 = rhs_dict[key][1].subs({nvec[0]: V * PhiDict[nvec[0]] + sympy.sqrt(V) * NoiseDict[nvec[0]], nvec[1]: V * PhiDict[nvec[1]] + sympy.sqrt(V) * NoiseDict[nvec[1]]})
-            func2 = rhs_dict[key][2].subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]]})
-            func = func1 * func2
-            if len(op.args[0].args) == 0:
-                term = (op * func).subs({op * func: func + op.args[1] / sympy.sqrt(V) * Derivative(func, op.args[0]) + op.args[1]**2 / (2 * V) * Derivative(func, op.args[0], op.args[0])})
-            else:
-                term = (op.args[1] * func).subs({op.args[1] * func: func + op.args[1].args[1] / sympy.sqrt(V) * Derivative(func, op.args[1].args[0])
-                                                 + op.args[1].args[1]**2 / (2 * V) * Derivative(func, op.args[1].args[0], op.args[1].args[0])})
-                term = (op.args[0] * term).subs({op.args[0] * term: term + op.args[0].args[1] / sympy.sqrt(V) * Derivative(term, op.args[0].args[0])
-                                                 + op.args[0].args[1]**2 / (2 * V) * Derivative(term, op.args[0].args[0], op.args[0].args[0])})
-            # term_num, term_denom = term.as_numer_denom()
-            rhs_vKE += rhs_dict[key][3].subs(PhiConstDict) * (term.doit() - func)
-    elif len(nvec) == 3:
-        lhs_vKE = (Derivative(P(nvec[0], nvec[1], nvec[2], t), t).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]]})
-                   - sympy.sqrt(V) * Derivative(PhiDict[nvec[0]], t) * Derivative(P(nvec[0], nvec[1], nvec[2], t), nvec[0]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]]})
-                   - sympy.sqrt(V) * Derivative(PhiDict[nvec[1]], t) * Derivative(P(nvec[0], nvec[1], nvec[2], t), nvec[1]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]]})
-                   - sympy.sqrt(V) * Derivative(PhiDict[nvec[2]], t) * Derivative(P(nvec[0], nvec[1], nvec[2], t), nvec[2]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]]}))
-        rhs_dict, substring = rhs(stoich)
-        rhs_vKE = 0
-        for key in rhs_dict:
-            op = rhs_dict[key][0].subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]]})
-            func1 = rhs_dict[key][1].subs({nvec[0]: V * PhiDict[nvec[0]] + sympy.sqrt(V) * NoiseDict[nvec[0]], nvec[1]: V * PhiDict[nvec[1]] + sympy.sqrt(V) * NoiseDict[nvec[1]], nvec[2]: V * PhiDict[nvec[2]] + sympy.sqrt(V) * NoiseDict[nvec[2]]})
-            func2 = rhs_dict[key][2].subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]]})
-            func = func1 * func2
-            if len(op.args[0].args) == 0:
-                term = (op * func).subs({op * func: func + op.args[1] / sympy.sqrt(V) * Derivative(func, op.args[0]) + op.args[1]**2 / (2 * V) * Derivative(func, op.args[0], op.args[0])})
-
-            elif len(op.args) == 2:
-                term = (op.args[1] * func).subs({op.args[1] * func: func + op.args[1].args[1] / sympy.sqrt(V) * Derivative(func, op.args[1].args[0])
-                                                 + op.args[1].args[1]**2 / (2 * V) * Derivative(func, op.args[1].args[0], op.args[1].args[0])})
-                term = (op.args[0] * term).subs({op.args[0] * term: term + op.args[0].args[1] / sympy.sqrt(V) * Derivative(term, op.args[0].args[0])
-                                                 + op.args[0].args[1]**2 / (2 * V) * Derivative(term, op.args[0].args[0], op.args[0].args[0])})
-            elif len(op.args) == 3:
-                term = (op.args[2] * func).subs({op.args[2] * func: func + op.args[2].args[1] / sympy.sqrt(V) * Derivative(func, op.args[2].args[0])
-                                                 + op.args[2].args[1]**2 / (2 * V) * Derivative(func, op.args[2].args[0], op.args[2].args[0])})
-                term = (op.args[1] * term).subs({op.args[1] * term: term + op.args[1].args[1] / sympy.sqrt(V) * Derivative(term, op.args[1].args[0])
-                                                 + op.args[1].args[1]**2 / (2 * V) * Derivative(term, op.args[1].args[0], op.args[1].args[0])})
-                term = (op.args[0] * term).subs({op.args[0] * term: term + op.args[0].args[1] / sympy.sqrt(V) * Derivative(term, op.args[0].args[0])
-                                                 + op.args[0].args[1]**2 / (2 * V) * Derivative(term, op.args[0].args[0], op.args[0].args[0])})
-            else:
-                print('Something went wrong!')
-            rhs_vKE += rhs_dict[key][3].subs(PhiConstDict) * (term.doit() - func)
-    else:
-        lhs_vKE = (Derivative(P(nvec[0], nvec[1], nvec[2], nvec[3], t), t).subs(
-            {nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]], nvec[3]: NoiseDict[nvec[3]]})
-            - sympy.sqrt(V) * Derivative(PhiDict[nvec[0]], t) * Derivative(P(nvec[0], nvec[1], nvec[2], nvec[3], t), nvec[0]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]], nvec[3]: NoiseDict[nvec[3]]})
-            - sympy.sqrt(V) * Derivative(PhiDict[nvec[1]], t) * Derivative(P(nvec[0], nvec[1], nvec[2], nvec[3], t), nvec[1]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]], nvec[3]: NoiseDict[nvec[3]]})
-            - sympy.sqrt(V) * Derivative(PhiDict[nvec[2]], t) * Derivative(P(nvec[0], nvec[1], nvec[2], nvec[3], t), nvec[2]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]], nvec[3]: NoiseDict[nvec[3]]})
-            - sympy.sqrt(V) * Derivative(PhiDict[nvec[3]], t) * Derivative(P(nvec[0], nvec[1], nvec[2], nvec[3], t), nvec[3]).subs({nvec[0]: NoiseDict[nvec[0]], nvec[1]: NoiseDict[nvec[1]], nvec[2]: NoiseDict[nvec[2]], nvec[3]: NoiseDict[nvec[3]]}))
-        rhs_dict, substring = rhs(stoich)
-        rhs_vKE = 0
-        for key in rhs_dict:
-            op = rhs_dict[key][0].subs({nvec[0]: NoiseDict[nvec[0]],
-                                        nvec[1]: NoiseDict[nvec[1]],
-                                        nvec[2]: NoiseDict[nvec[2]],
-                                        nvec[3]: NoiseDict[nvec[3]]})
-            func1 = rhs_dict[key][1].subs({nvec[0]: V * PhiDict[nvec[0]] + sympy.sqrt(V) * NoiseDict[nvec[0]],
-                                           nvec[1]: V * PhiDict[nvec[1]] + sympy.sqrt(V) * NoiseDict[nvec[1]],
-                                           nvec[2]: V * PhiDict[nvec[2]] + sympy.sqrt(V) * NoiseDict[nvec[2]],
-                                           nvec[3]: V * PhiDict[nvec[3]] + sympy.sqrt(V) * NoiseDict[nvec[3]]})
-            func2 = rhs_dict[key][2].subs({nvec[0]: NoiseDict[nvec[0]],
-                                           nvec[1]: NoiseDict[nvec[1]],
-                                           nvec[2]: NoiseDict[nvec[2]],
-                                           nvec[3]: NoiseDict[nvec[3]]})
-            func = func1 * func2
-            if len(op.args[0].args) == 0:
-                term = (op * func).subs({op * func: func + op.args[1] / sympy.sqrt(V) * Derivative(func, op.args[0]) + op.args[1]**2 / (2 * V) * Derivative(func, op.args[0], op.args[0])})
-
-            elif len(op.args) == 2:
-                term = (op.args[1] * func).subs({op.args[1] * func: func + op.args[1].args[1] / sympy.sqrt(V) * Derivative(func, op.args[1].args[0])
-                                                 + op.args[1].args[1]**2 / (2 * V) * Derivative(func, op.args[1].args[0], op.args[1].args[0])})
-                term = (op.args[0] * term).subs({op.args[0] * term: term + op.args[0].args[1] / sympy.sqrt(V) * Derivative(term, op.args[0].args[0])
-                                                 + op.args[0].args[1]**2 / (2 * V) * Derivative(term, op.args[0].args[0], op.args[0].args[0])})
-            elif len(op.args) == 3:
-                term = (op.args[2] * func).subs({op.args[2] * func: func + op.args[2].args[1] / sympy.sqrt(V) * Derivative(func, op.args[2].args[0])
-                                                 + op.args[2].args[1]**2 / (2 * V) * Derivative(func, op.args[2].args[0], op.args[2].args[0])})
-                term = (op.args[1] * term).subs({op.args[1] * term: term + op.args[1].args[1] / sympy.sqrt(V) * Derivative(term, op.args[1].args[0])
-                                                 + op.args[1].args[1]**2 / (2 * V) * Derivative(term, op.args[1].args[0], op.args[1].args[0])})
-                term = (op.args[0] * term).subs({op.args[0] * term: term + op.args[0].args[1] / sympy.sqrt(V) * Derivative(term, op.args[0].args[0])
-                                                 + op.args[0].args[1]**2 / (2 * V) * Derivative(term, op.args[0].args[0], op.args[0].args[0])})
-            elif len(op.args) == 4:
-                term = (op.args[3] * func).subs({op.args[3] * func: func + op.args[3].args[1] / sympy.sqrt(V) * Derivative(func, op.args[3].args[0])
-                                                 + op.args[3].args[1]**2 / (2 * V) * Derivative(func, op.args[3].args[0], op.args[3].args[0])})
-                term = (op.args[2] * term).subs({op.args[2] * term: term + op.args[2].args[1] / sympy.sqrt(V) * Derivative(term, op.args[2].args[0])
-                                                 + op.args[2].args[1]**2 / (2 * V) * Derivative(term, op.args[2].args[0], op.args[2].args[0])})
-                term = (op.args[1] * term).subs({op.args[1] * term: term + op.args[1].args[1] / sympy.sqrt(V) * Derivative(term, op.args[1].args[0])
-                                                 + op.args[1].args[1]**2 / (2 * V) * Derivative(term, op.args[1].args[0], op.args[1].args[0])})
-                term = (op.args[0] * term).subs({op.args[0] * term: term + op.args[0].args[1] / sympy.sqrt(V) * Derivative(term, op.args[0].args[0])
-                                                 + op.args[0].args[1]**2 / (2 * V) * Derivative(term, op.args[0].args[0], op.args[0].args[0])})
-            else:
-                print('Something went wrong!')
-            rhs_vKE += rhs_dict[key][3].subs(PhiConstDict) * (term.doit() - func)
-
-    return rhs_vKE.expand(), lhs_vKE, substring
-
-
 def _pydstoolify(equation) -> str:
     """Utility function to mangle variable names in equations so they are accepted by PyDStool."""
     eq_str = str(equation)
@@ -1,6 +1,18 @@
 import os
+import subprocess
+import sys
 
+import networkx as nx
+import numpy as np
+import pytest
+from scipy.integrate import odeint
+import sympy
+
+from mumot import utils, views
+from mumot.defaults import MuMoTdefault
+from mumot.exceptions import MuMoTValueError
 from mumot.models import parseModel
+from mumot.views import MuMoTmultiagentView, MuMoTSSAView
 
 EXPRESSION_STRS = [
     "U -> A : g_A",
@@ -25,3 +37,506 @@ def test_parse_model_from_cell_contents():
 def test_parse_model_from_str():
     """Assert we can instantiate a MuMoTmodel from a multi-line string."""
     parseModel(os.linesep.join(EXPRESSION_STRS))
+
+
+def test_ssa_is_reproducible_for_a_given_seed():
+    """Assert that two SSA runs with the same random seed produce the same
+    trajectories and that the total population is conserved."""
+    model = parseModel(os.linesep.join(EXPRESSION_STRS))
+    params = [('g_A', 0.2), ('g_B', 0.2), ('a_A', 0.1), ('a_B', 0.1),
+              ('r_A', 1.0), ('r_B', 1.0), ('s', 0.5), ('systemSize', 50)]
+    ssaParams = {'initialState': {'U': 1.0, 'A': 0.0, 'B': 0.0},
+                 'maxTime': 2, 'randomSeed': 7, 'visualisationType': 'evo',
+                 'plotProportions': False, 'realtimePlot': False}
+    trajectories = []
+    for _ in range(2):
+        view = MuMoTSSAView(model, None, params=params, SSParams=ssaParams, silent=True)
+        trajectories.append(view._runSingleSimulation(ssaParams['randomSeed']))
+    assert trajectories[0].keys() == trajectories[1].keys()
+    assert all(np.array_equal(trajectories[0][key], trajectories[1][key]) for key in trajectories[0])
+    totals = [sum(pops) for pops in zip(*(trajectories[0][state] for state in trajectories[0] if state != 'time'))]
+    assert totals == [50] * len(totals)
+
+
+def test_headless_simulate_matches_ssa_view(capsys):
+    """Assert that the headless simulation API returns the same trajectories
+    as a stochastic-simulation view with the same seeds, as NumPy arrays,
+    without writing to standard output."""
+    model = parseModel(os.linesep.join(EXPRESSION_STRS))
+    params = [('g_A', 0.2), ('g_B', 0.2), ('a_A', 0.1), ('a_B', 0.1),
+              ('r_A', 1.0), ('r_B', 1.0), ('s', 0.5), ('systemSize', 50)]
+    initialState = {'U': 1.0, 'A': 0.0, 'B': 0.0}
+    capsys.readouterr()
+    results = model.simulate('ssa', params=params, runs=2, seed=7,
+                             initialState=initialState, maxTime=2)
+    model.simulate('multiagent', params=params, seed=7, initialState=initialState,
+                   maxTime=2, netType='erdos-renyi', netParam=0.2)
+    assert capsys.readouterr().out == ''
+    assert len(results) == 2
+    ssaParams = {'initialState': initialState, 'maxTime': 2, 'randomSeed': 7,
+                 'visualisationType': 'evo', 'plotProportions': False}
+    view = MuMoTSSAView(model, None, params=params, SSParams=ssaParams, silent=True)
+    for run, result in enumerate(results):
+        expected = view._runSingleSimulation(7 + run)
+        assert isinstance(result['time'], np.ndarray)
+        assert set(result) == {'time', 'U', 'A', 'B'}
+        for state, values in expected.items():
+            assert np.array_equal(result[state if state == 'time' else str(state)], values)
+
+
+@pytest.mark.parametrize('engine, options', [
+    ('ssa', {}),
+    ('multiagent', {'netType': 'erdos-renyi', 'netParam': 0.2}),
+    ('multiagent', {'netType': 'dynamic', 'netParam': 0.2, 'motionCorrelatedness': 0.5, 'particleSpeed': 0.1})])
+def test_parallel_runs_match_serial_runs_in_seed_order(engine, options):
+    """Assert that runs executed in worker processes return the same
+    trajectories as serial runs, each run ``r`` matching a single run seeded
+    with ``seed + r``."""
+    model = parseModel(r"U -> A : g \n A -> U : a \n A + U -> A + A : r")
+    params = [('g', 0.2), ('a', 0.1), ('r', 0.3), ('systemSize', 30)]
+    serial = model.simulate(engine, params=params, runs=3, seed=11, maxTime=3, nWorkers=1, **options)
+    parallel = model.simulate(engine, params=params, runs=3, seed=11, maxTime=3, nWorkers=2, **options)
+    assert len(serial) == len(parallel) == 3
+    assert not np.array_equal(serial[0]['A'], serial[1]['A'])
+    for run, (serialResult, parallelResult) in enumerate(zip(serial, parallel)):
+        single = model.simulate(engine, params=params, runs=1, seed=11 + run, maxTime=3, **options)[0]
+        for result in (serialResult, parallelResult):
+            assert result.keys() == single.keys()
+            assert all(np.array_equal(result[key], single[key]) for key in single)
+
+
+def test_next_reaction_method_matches_direct_method():
+    """Assert that the ensemble mean populations at a fixed time of
+    next-reaction runs agree with the direct method."""
+    model = parseModel(os.linesep.join(EXPRESSION_STRS))
+    params = [('g_A', 0.2), ('g_B', 0.3), ('a_A', 0.1), ('a_B', 0.1),
+              ('r_A', 1.0), ('r_B', 0.8), ('s', 0.5), ('systemSize', 100)]
+    runs, sampleTime = 40, 1.5
+    populations = {}
+    for method in ('direct', 'next-reaction'):
+        results = model.simulate('ssa', params=params, runs=runs, seed=3, maxTime=2, method=method,
+                                 initialState={'U': 1.0, 'A': 0.0, 'B': 0.0})
+        populations[method] = np.array([[result[state][np.searchsorted(result['time'], sampleTime, side='right') - 1]
+                                         for state in ('A', 'B')] for result in results])
+    standardError = np.sqrt((populations['direct'].var(axis=0) + populations['next-reaction'].var(axis=0)) / runs)
+    difference = np.abs(populations['direct'].mean(axis=0) - populations['next-reaction'].mean(axis=0))
+    assert np.all(difference < 4 * standardError)
+
+
+def test_indexed_priority_queue_keeps_heap_order():
+    """Assert that the indexed priority queue of the next-reaction method
+    returns the earliest reaction after random updates of reaction times."""
+    rng = np.random.RandomState(2)
+    times = rng.rand(20).tolist()
+    queue = utils._IndexedPriorityQueue(times)
+    for _ in range(500):
+        idx = rng.randint(len(times))
+        times[idx] = np.inf if rng.rand() < 0.1 else rng.rand()
+        queue.update(idx, times[idx])
+        assert queue.top() == (int(np.argmin(times)), min(times))
+        assert queue.time(idx) == times[idx]
+        for pos in range(1, len(times)):
+            assert queue._times[queue._heap[(pos - 1) // 2]] <= queue._times[queue._heap[pos]]
+            assert queue._position[queue._heap[pos]] == pos
+
+
+def test_tau_leaping_matches_direct_method_at_large_system_size():
+    """Assert that the mean final population of tau-leaping runs agrees with
+    the direct method for a large system, in fewer steps."""
+    model = parseModel(r"U -> A : g \n A -> U : a \n A + U -> A + A : r")
+    params = [('g', 0.2), ('a', 0.5), ('r', 1.0), ('systemSize', 2000)]
+    finals, steps = {}, {}
+    for method in ('direct', 'tau-leap'):
+        results = model.simulate('ssa', params=params, runs=10, seed=1, maxTime=2, method=method,
+                                 initialState={'U': 1.0, 'A': 0.0}, epsilon=0.03)
+        finals[method] = np.array([result['A'][-1] for result in results])
+        steps[method] = sum(len(result['time']) for result in results)
+    standardError = np.sqrt((finals['direct'].var() + finals['tau-leap'].var()) / 10)
+    assert abs(finals['direct'].mean() - finals['tau-leap'].mean()) < 4 * standardError
+    assert steps['tau-leap'] < steps['direct']
+
+
+def test_toroidal_neighbour_lists_match_pairwise_search():
+    """Assert that the cell-list neighbour search returns the same neighbours
+    as comparing all pairs of points on the torus."""
+    rng = np.random.RandomState(0)
+    for distanceRange, width, height in [(0.1, 1, 1), (0.45, 1, 1), (0.7, 1, 2)]:
+        xs = rng.rand(200) * width
+        ys = rng.rand(200) * height
+        neighbours = utils._toroidalNeighbourLists(xs, ys, distanceRange, width, height)
+        for i in range(len(xs)):
+            dx = np.abs(xs - xs[i])
+            dy = np.abs(ys - ys[i])
+            distances = np.sqrt(np.minimum(dx, width - dx)**2 + np.minimum(dy, height - dy)**2)
+            expected = [j for j in np.flatnonzero(distances < distanceRange) if j != i]
+            assert neighbours[i] == expected
+
+
+def test_moving_particles_stay_in_bounded_arena():
+    """Assert that with a bounded arena the particles never cross the walls
+    and interact only within the plain (non-periodic) communication range."""
+    model = parseModel(os.linesep.join(EXPRESSION_STRS))
+    MAParams = {'initialState': {'U': 1.0, 'A': 0.0, 'B': 0.0}, 'maxTime': 2,
+                'randomSeed': 3, 'visualisationType': 'evo', 'plotProportions': False,
+                'netType': 'dynamic', 'netParam': 0.2, 'motionCorrelatedness': 0.9,
+                'particleSpeed': 0.1, 'boundedArena': True}
+    params = [('g_A', 0.2), ('g_B', 0.2), ('a_A', 0.1), ('a_B', 0.1),
+              ('r_A', 1.0), ('r_B', 1.0), ('s', 0.5), ('systemSize', 100)]
+    view = MuMoTmultiagentView(model, None, MAParams, params=params, silent=True)
+    view._update_params()
+    view._runSingleSimulation(MAParams['randomSeed'])
+    positions = np.array([position for history in view._positionHistory for position in history])
+    assert positions[:, :2].min() >= 0 and positions[:, :2].max() <= 1
+    neighbourLists = view._getNeighbourLists(view._positions, view._netParam)
+    for agent, neighbours in enumerate(neighbourLists):
+        assert neighbours == view._getNeighbours(agent, view._positions, view._netParam)
+
+
+def test_fast_erdos_renyi_networks_are_valid_and_unbiased():
+    """Assert that the geometric-skip Erdos-Renyi sampler produces symmetric
+    networks without self-links where each pair is linked with probability p."""
+    np.random.seed(1)
+    numNodes, linkProbability, samples = 6, 0.3, 4000
+    linkCounts = np.zeros((numNodes, numNodes))
+    for _ in range(samples):
+        indptr, indices = utils._erdosRenyiCSR(numNodes, linkProbability)
+        for node in range(numNodes):
+            linkCounts[node, indices[indptr[node]:indptr[node + 1]]] += 1
+    assert np.array_equal(linkCounts, linkCounts.T)
+    assert np.all(np.diag(linkCounts) == 0)
+    offDiagonal = linkCounts[~np.eye(numNodes, dtype=bool)] / samples
+    assert np.allclose(offDiagonal, linkProbability, atol=0.03)
+    assert utils._isConnectedCSR(*utils._erdosRenyiCSR(50, 1.0))
+
+
+def test_parallel_erdos_renyi_runs_record_network_generation():
+    """Assert that multiagent runs on Erdos-Renyi networks can be executed in
+    worker processes and that the statistics of the network generation are
+    copied back to the view."""
+    model = parseModel(r"U -> A : g \n A -> U : a \n A + U -> A + A : r")
+    MAParams = {'initialState': {'U': 1.0, 'A': 0.0}, 'maxTime': 2, 'randomSeed': 4,
+                'visualisationType': 'evo', 'plotProportions': False, 'realtimePlot': False,
+                'netType': 'erdos-renyi', 'netParam': 0.2, 'runs': 2, 'nWorkers': 2}
+    params = [('g', 0.2), ('a', 0.1), ('r', 0.3), ('systemSize', 30)]
+    view = MuMoTmultiagentView(model, None, MAParams, params=params, silent=True)
+    view._update_params()
+    results = view._runSimulations()
+    assert len(results) == 2
+    numNodes, resamplings, seconds = view._netGenerationStats
+    assert numNodes == 30 and resamplings >= 0 and seconds >= 0
+
+
+@pytest.mark.parametrize('netType, netParam', [('full', None), ('barabasi-albert', 3)])
+def test_static_network_neighbours_match_networkx_graph(monkeypatch, netType, netParam):
+    """Assert that the neighbours of each agent on a static network are
+    those of the networkx graph, shuffled with the same random draws as
+    the shuffled networkx neighbour lists (hence giving the same
+    trajectories)."""
+    graphs = []
+    barabasiAlbertGraph = nx.barabasi_albert_graph
+
+    def recordingBarabasiAlbertGraph(*args):
+        graphs.append(barabasiAlbertGraph(*args))
+        return graphs[-1]
+    monkeypatch.setattr(views.nx, 'barabasi_albert_graph', recordingBarabasiAlbertGraph)
+    model = parseModel(r"U -> A : g \n A -> U : a \n A + U -> A + A : r")
+    MAParams = {'initialState': {'U': 1.0, 'A': 0.0}, 'maxTime': 3, 'randomSeed': 9,
+                'visualisationType': 'evo', 'plotProportions': False, 'realtimePlot': False,
+                'netType': netType, 'netParam': netParam}
+    params = [('g', 0.2), ('a', 0.1), ('r', 0.3), ('systemSize', 30)]
+    view = MuMoTmultiagentView(model, None, MAParams, params=params, silent=True)
+    view._update_params()
+    view._runSingleSimulation(MAParams['randomSeed'])
+    graph = nx.complete_graph(30) if netType == 'full' else graphs[-1]
+    for node in graph.nodes():
+        rngState = np.random.get_state()
+        expected = np.random.permutation(list(nx.all_neighbors(graph, node)))
+        expectedDraw = np.random.rand()
+        np.random.set_state(rngState)
+        assert np.array_equal(view._getNeighbourNodes(node), expected)
+        assert np.random.rand() == expectedDraw
+
+
+def test_multiagent_resumed_from_checkpoint_matches_uninterrupted_run(tmp_path):
+    """Assert that a multiagent simulation checkpointed at an intermediate
+    time and resumed to a later time reproduces the uninterrupted run."""
+    model = parseModel(r"U -> A : g \n A -> U : a \n A + U -> A + A : r")
+    params = [('g', 0.2), ('a', 0.1), ('r', 0.3), ('systemSize', 40)]
+    netOptions = {'netType': 'erdos-renyi', 'netParam': 0.2}
+    checkpoint = str(tmp_path / 'checkpoint.npz')
+    uninterrupted = model.simulate('multiagent', params=params, seed=5, maxTime=12, **netOptions)[0]
+    model.simulate('multiagent', params=params, seed=5, maxTime=5, checkpointTo=checkpoint, **netOptions)
+    resumed = model.simulate('multiagent', params=params, seed=5, maxTime=12, resumeFrom=checkpoint, **netOptions)[0]
+    for option in ('checkpointTo', 'resumeFrom'):
+        with pytest.raises(MuMoTValueError):
+            model.simulate('multiagent', params=params, runs=2, seed=5, maxTime=12, **{option: checkpoint}, **netOptions)
+    assert uninterrupted.keys() == resumed.keys()
+    for key in uninterrupted:
+        assert np.array_equal(uninterrupted[key], resumed[key])
+
+
+def test_resampled_and_spilled_records_match_event_records(tmp_path):
+    """Assert that the time evolution recorded in small chunks spilled to
+    disk equals the in-memory one, and that resampling at fixed intervals
+    gives the populations of the last event before each sampling time."""
+    model = parseModel(r"U -> A : g \n A -> U : a \n A + U -> A + A : r")
+    params = [('g', 0.2), ('a', 0.1), ('r', 0.3), ('systemSize', 100)]
+    events = model.simulate('ssa', params=params, seed=3, maxTime=5)[0]
+    chunkSize = MuMoTdefault._recordingChunkSize
+    MuMoTdefault.setRecordingDefaults(16)
+    try:
+        spilled = model.simulate('ssa', params=params, seed=3, maxTime=5, spillDir=str(tmp_path))[0]
+    finally:
+        MuMoTdefault.setRecordingDefaults(chunkSize)
+    assert all(np.array_equal(events[key], spilled[key]) for key in events)
+    sampled = model.simulate('ssa', params=params, seed=3, maxTime=5, recordInterval=0.5)[0]
+    assert np.allclose(sampled['time'], np.arange(11) * 0.5)
+    lastEvents = np.searchsorted(events['time'], sampled['time'], side='right') - 1
+    for key in events:
+        if key != 'time':
+            assert np.array_equal(sampled[key], events[key][lastEvents])
+
+
+def test_resampled_records_stop_at_max_time_for_sparse_events():
+    """Assert that resampled records end at the maximum time even when the
+    last reaction of a run happens long after it."""
+    model = parseModel(r"A -> \emptyset : a")
+    params = [('a', 0.05), ('systemSize', 2)]
+    events = model.simulate('ssa', params=params, runs=5, seed=1, maxTime=1)
+    sampled = model.simulate('ssa', params=params, runs=5, seed=1, maxTime=1, recordInterval=0.5)
+    assert max(result['time'][-1] for result in events) > 2
+    for eventResult, sampledResult in zip(events, sampled):
+        assert np.allclose(sampledResult['time'], [0, 0.5, 1])
+        lastEvents = np.searchsorted(eventResult['time'], sampledResult['time'], side='right') - 1
+        assert np.array_equal(sampledResult['A'], eventResult['A'][lastEvents])
+
+
+def test_saved_npz_results_match_latest_results(tmp_path):
+    """Assert that the results saved in the NPZ format contain, for each run,
+    the time and population arrays of the latest simulation results."""
+    model = parseModel(r"U -> A : g \n A -> U : a")
+    ssaParams = {'initialState': {'U': 1.0, 'A': 0.0}, 'maxTime': 2, 'randomSeed': 2,
+                 'visualisationType': 'evo', 'plotProportions': False, 'runs': 2}
+    view = MuMoTSSAView(model, None, params=[('g', 0.5), ('a', 0.2), ('systemSize', 30)],
+                        SSParams=ssaParams, silent=True)
+    view._update_params()
+    results = view._runSimulations()
+    view.saveResults(str(tmp_path / 'results.npz'))
+    with np.load(str(tmp_path / 'results.npz')) as saved:
+        assert sorted(saved.files) == sorted(f"run{runID}/{name}" for runID in range(2) for name in ('time', 'A', 'U'))
+        for runID, runData in enumerate(results):
+            for state, values in runData.items():
+                assert np.array_equal(saved[f"run{runID}/{state}"], values)
+
+
+def test_realtime_plot_ends_with_the_non_realtime_plot():
+    """Assert that the final figure of a throttled realtime SSA plot has the
+    same trajectories as the figure of the same simulation plotted at the end."""
+    model = parseModel(r"U -> A : g \n A -> U : a")
+    lines = []
+    for realtimePlot in (True, False):
+        ssaParams = {'initialState': {'U': 1.0, 'A': 0.0}, 'maxTime': 2, 'randomSeed': 4,
+                     'visualisationType': 'evo', 'plotProportions': False,
+                     'realtimePlot': realtimePlot, 'runs': 2, 'aggregateResults': False}
+        view = MuMoTSSAView(model, None, params=[('g', 0.5), ('a', 0.2), ('systemSize', 30)],
+                            SSParams=ssaParams)
+        lines.append(sorted((tuple(line.get_xdata()), tuple(line.get_ydata()))
+                            for line in view._figure.gca().get_lines() if len(line.get_xdata()) > 2))
+    assert lines[0] == lines[1]
+
+
+def test_numeric_fixed_points_match_symbolic_fixed_points():
+    """Assert that the multi-start Newton solver finds the same physical fixed
+    points and eigenvalues as the symbolic solver."""
+    model = parseModel(r"U -> A : g_1 \n U -> B : g_2 \n A -> U : a_1 \n B -> U : a_2 \n A + U -> A + A : r_1 \n B + U -> B + B : r_2 \n A + B -> A + U : s \n A + B -> B + U : s").substitute('U = N - A - B')
+    params = [('g_1', 0.2), ('g_2', 0.2), ('a_1', 0.5), ('a_2', 0.5), ('r_1', 2), ('r_2', 2), ('s', 3), ('N', 1), ('systemSize', 1)]
+    results = []
+    for solver in ('numeric', 'symbolic'):
+        view = model.stream('A', 'B', params=params, fixedPointSolver=solver, silent=True)._view
+        fixedPoints = []
+        for point, eigenvalues in zip(*view._get_fixedPoints2d()):
+            coordinates = [float(sympy.re(value)) for value in point.values()]
+            if min(coordinates) >= -1e-9 and sum(coordinates) <= 1 + 1e-9:
+                fixedPoints.append((tuple(np.round(coordinates, 6)),
+                                    tuple(sorted(np.round([float(sympy.re(eigenvalue)) for eigenvalue in eigenvalues], 5)))))
+        results.append(sorted(fixedPoints))
+    assert len(results[0]) > 0
+    assert results[0] == results[1]
+
+
+def test_numeric_solver_falls_back_for_conserved_systems():
+    """Assert that noise correlations of a system with a conservation law,
+    whose fixed points are not isolated, are drawn with the default solver
+    as with the symbolic solver."""
+    model = parseModel(os.linesep.join(EXPRESSION_STRS))
+    numCurves = []
+    for solver in ('numeric', 'symbolic'):
+        view = model.noiseCorrelations(maxTime=50, fixedPointSolver=solver)._view
+        numCurves.append(len(view._figure.gca().get_lines()))
+    assert numCurves[0] > 0
+    assert numCurves[0] == numCurves[1]
+
+
+def test_noise_correlation_systems_are_cached_for_recent_parameters(monkeypatch):
+    """Assert that a noise correlations view keeps the compiled correlation
+    ODE systems of the most recently used parameter values only."""
+    calls = []
+    getNoiseCorrODEsys = views.MuMoTnoiseCorrelationsView._getNoiseCorrODEsys
+
+    def recordingGetNoiseCorrODEsys(view, steadyStateDictPhi, argDict):
+        calls.append((view, steadyStateDictPhi, argDict))
+        return getNoiseCorrODEsys(view, steadyStateDictPhi, argDict)
+    monkeypatch.setattr(views.MuMoTnoiseCorrelationsView, '_getNoiseCorrODEsys', recordingGetNoiseCorrODEsys)
+    model = parseModel(r"U -> A : g \n A -> U : a \n A + U -> A + A : r")
+    model.noiseCorrelations(params=[('g', 0.2), ('a', 0.5), ('r', 1.0), ('systemSize', 1)], maxTime=5)
+    view, steadyStateDictPhi, argDict = calls[0]
+    rate = sympy.Symbol('a')
+    cacheSize = MuMoTdefault._fixedPointCacheSize
+    MuMoTdefault.setFixedPointDefaults(2, MuMoTdefault._parametricSolveTimeout)
+    try:
+        systems = [getNoiseCorrODEsys(view, steadyStateDictPhi, {**argDict, rate: value}) for value in (0.3, 0.4, 0.5)]
+        assert len(view._noiseCorrODEsysCache) == 2
+        assert getNoiseCorrODEsys(view, steadyStateDictPhi, {**argDict, rate: 0.5}) is systems[2]
+        assert getNoiseCorrODEsys(view, steadyStateDictPhi, {**argDict, rate: 0.3}) is not systems[0]
+    finally:
+        MuMoTdefault.setFixedPointDefaults(cacheSize, MuMoTdefault._parametricSolveTimeout)
+
+
+def test_views_share_compiled_jacobian_and_classify_stability():
+    """Assert that stream and vector views of a model reuse one compiled
+    Jacobian and that the fixed points of a bistable system are classified
+    as two stable nodes separated by a saddle."""
+    model = parseModel(r"U -> A : g_1 \n U -> B : g_2 \n A -> U : a_1 \n B -> U : a_2 \n A + U -> A + A : r_1 \n B + U -> B + B : r_2 \n A + B -> A + U : s \n A + B -> B + U : s").substitute('U = N - A - B')
+    params = [('g_1', 0.2), ('g_2', 0.2), ('a_1', 0.5), ('a_2', 0.5), ('r_1', 2), ('r_2', 2), ('s', 3), ('N', 1), ('systemSize', 1)]
+    views = [model.stream('A', 'B', params=params, silent=True)._view, model.vector('A', 'B', params=params, silent=True)._view]
+    stateVariables = [views[0]._stateVariable1, views[0]._stateVariable2]
+    compiled = model._getJacobianFuncs(stateVariables)
+    fixedPoints = [view._get_fixedPoints2d()[0] for view in views]
+    assert list(model._jacobianFuncs) == [tuple(stateVariables)]
+    assert model._getJacobianFuncs(stateVariables) is compiled
+    _, stability = model._getLinearStability(stateVariables, fixedPoints[1], views[1]._get_argDict())
+    assert sorted(stability) == ['saddle', 'stable', 'stable']
+
+
+def _rounded_fixed_points(fixedPoints):
+    """Return fixed points and real parts of their eigenvalues as sorted rounded tuples."""
+    return sorted((tuple(np.round([float(sympy.re(value)) for value in point.values()], 6)),
+                   tuple(sorted(np.round([float(sympy.re(eigenvalue)) for eigenvalue in eigenvalues], 5))))
+                  for point, eigenvalues in zip(*fixedPoints))
+
+
+def test_parametric_fixed_points_follow_parameter_changes():
+    """Assert that closed-form fixed points evaluated for new parameter values
+    match the symbolic solver, and that recent parameter values are cached."""
+    model = parseModel(r"U -> A : g \n A -> U : a \n U -> B : h \n B -> U : b \n A + U -> A + A : r").substitute('U = N - A - B')
+    params = [('g', 0.2), ('a', 0.5), ('h', 0.3), ('b', 0.4), ('r', 2), ('N', 1), ('systemSize', 1)]
+    views = [model.stream('A', 'B', params=params, fixedPointSolver=solver, silent=True)._view
+             for solver in ('parametric', 'symbolic')]
+    cached = views[0]._get_fixedPoints2d()
+    for rate in (1.5, 2):
+        for view in views:
+            view._fixedParams[next(symbol for symbol in view._fixedParams if str(symbol) == 'r')] = rate
+        parametric, symbolic = (view._get_fixedPoints2d() for view in views)
+        assert _rounded_fixed_points(parametric) == _rounded_fixed_points(symbolic)
+    assert parametric[0] is cached[0]
+
+
+def test_batched_3d_streams_match_individually_integrated_streams():
+    """Assert that 3D streams integrated together as one system start inside
+    the simplex and follow the trajectories integrated one by one."""
+    model = parseModel(r"U -> X : b \n U -> Y : b \n U -> Z : b \n X -> Y : e \n Y -> Z : f \n X -> U : d \n Y -> U : d \n Z -> U : d \n X + U -> X + X : r").substitute('U = N - X - Y - Z')
+    params = [('b', 0.2), ('e', 0.3), ('f', 0.5), ('d', 0.4), ('r', 1.5), ('N', 1), ('systemSize', 1)]
+    view = model.stream('X', 'Y', 'Z', params=params, setNumPoints=40)._view
+    stateVariables = [view._stateVariable1, view._stateVariable2, view._stateVariable3]
+    parameters, equationsFunc, _ = model._getJacobianFuncs(stateVariables)
+    paramValues = [view._get_argDict()[parameter] for parameter in parameters]
+    streams = [np.array(line.get_data_3d()).T for line in view._figure.gca().get_lines()[:40]]
+    assert len(streams) == 40
+    for stream in streams:
+        assert np.all(stream[0] >= 0) and stream[0].sum() <= 1
+        expected = odeint(lambda y, _: equationsFunc(y.reshape(3, 1), paramValues)[:, 0], stream[0], np.linspace(0, 1.0, 20))
+        assert np.allclose(stream, expected, atol=1e-5)
+
+
+def test_adaptive_vector_field_concentrates_points_near_fixed_points():
+    """Assert that the adaptive mesh of a vector plot uses the point budget of
+    the regular mesh, evaluates the field correctly and places more points
+    close to the fixed points."""
+    model = parseModel(r"U -> A : g_1 \n U -> B : g_2 \n A -> U : a_1 \n B -> U : a_2 \n A + U -> A + A : r_1 \n B + U -> B + B : r_2 \n A + B -> A + U : s \n A + B -> B + U : s").substitute('U = N - A - B')
+    params = [('g_1', 0.2), ('g_2', 0.2), ('a_1', 0.5), ('a_2', 0.5), ('r_1', 2), ('r_2', 2), ('s', 3), ('N', 1), ('systemSize', 1)]
+    nearFixedPoints = []
+    for meshRefinement in ('uniform', 'adaptive'):
+        view = model.vector('A', 'B', params=params, meshRefinement=meshRefinement)._view
+        points = np.stack([np.ravel(np.ma.getdata(view._X)), np.ravel(np.ma.getdata(view._Y))], axis=1)
+        assert len(points) == 100
+        stateVariables = [view._stateVariable1, view._stateVariable2]
+        parameters, equationsFunc, _ = model._getJacobianFuncs(stateVariables)
+        expected = equationsFunc(points.T, [view._get_argDict()[parameter] for parameter in parameters])
+        assert np.allclose(np.ravel(np.ma.getdata(view._Xdot)), expected[0])
+        assert np.array_equal(np.ravel(np.ma.getmaskarray(view._Xdot)), points.sum(axis=1) > 1 + 1e-9)
+        fixedPoints = np.array([[float(value) for value in point.values()] for point in view._get_fixedPoints2d()[0]])
+        distances = np.linalg.norm(points[:, None, :] - fixedPoints[None, :, :], axis=2).min(axis=1)
+        nearFixedPoints.append(np.sum(distances < 0.15))
+    assert nearFixedPoints[1] > 2 * nearFixedPoints[0]
+
+
+def test_integrate_ensemble_matches_analytic_solution():
+    """Assert that a batched integration over a parameter grid reproduces the
+    analytic solution of exponential decay for every parameter set."""
+    model = parseModel(r"A -> \emptyset : k")
+    rates = [0.5, 1.0, 2.0]
+    results = model.integrateEnsemble({'k': rates}, [{'A': 1.0}, {'A': 0.5}], maxTime=2, tstep=0.1)
+    assert results['solution'].shape == (3, 2, 21, 1)
+    for idx, rate in enumerate(rates):
+        for jdx, initialValue in enumerate([1.0, 0.5]):
+            expected = initialValue * np.exp(-rate * results['time'])
+            assert np.allclose(results['solution'][idx, jdx, :, 0], expected, atol=1e-6)
+
+
+def test_integrate_ensemble_validates_parameter_grid():
+    """Assert that an empty parameter grid integrates models without free
+    parameters, and that missing parameters or empty sequences of values
+    raise a MuMoTValueError."""
+    results = parseModel(r"A -> \emptyset : 2").integrateEnsemble({}, {'A': 1.0}, maxTime=1, tstep=0.5)
+    assert np.allclose(results['solution'][0, 0, :, 0], np.exp(-2 * results['time']), atol=1e-6)
+    model = parseModel(r"U -> A : g \n A -> U : a")
+    for paramGrid in ({}, {'g': [], 'a': 0.1}):
+        with pytest.raises(MuMoTValueError):
+            model.integrateEnsemble(paramGrid, {'U': 1.0, 'A': 0.0})
+
+
+def test_symbolic_results_are_cached_on_disk(tmp_path):
+    """Assert that derived symbolic results are written to the on-disk cache
+    once it is enabled, that cached results equal freshly computed ones and
+    that cache entries cannot run arbitrary code."""
+    cacheDir, maxBytes = MuMoTdefault._cacheDir, MuMoTdefault._cacheMaxBytes
+    MuMoTdefault.setCacheDefaults(str(tmp_path), maxBytes)
+    try:
+        model = parseModel(os.linesep.join(EXPRESSION_STRS))
+        computed = model.getFokkerPlanckEquation()
+        assert len(list(tmp_path.glob('*.json'))) > 0
+        assert parseModel(os.linesep.join(EXPRESSION_STRS)).getFokkerPlanckEquation() == computed
+        for malicious in ["__import__('os').getcwd()",
+                          "Symbol.__mro__[-1].__subclasses__()",
+                          "sin(\"__import__('os').getcwd()\")"]:
+            with pytest.raises(ValueError):
+                utils._decodeSymbolic(['sympy', malicious])
+    finally:
+        MuMoTdefault.setCacheDefaults(cacheDir, maxBytes)
+
+
+def _modules_loaded_in_subprocess(statement):
+    """Run ``statement`` in a fresh interpreter and return the names of the
+    heavy optional modules it loaded."""
+    code = (f"{statement}\n"
+            "import sys\n"
+            "print(','.join(name for name in ('PyDSTool', 'notebook', 'matplotlib', 'ipywidgets', 'IPython') if name in sys.modules))\n")
+    output = subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return [name for name in output.strip().split(',') if name]
+
+
+def test_headless_import_is_lazy():
+    """Assert that importing MuMoT and parsing a model in a fresh interpreter
+    loads none of the plotting, widget, notebook and bifurcation libraries."""
+    assert _modules_loaded_in_subprocess("import mumot\nmumot.parseModel('A -> B : k')") == []
+    assert 'matplotlib' in _modules_loaded_in_subprocess("import mumot\nmumot.MuMoTview")